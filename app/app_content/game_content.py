@@ -5,6 +5,7 @@ from random import sample
 from tkinter import StringVar
 import customtkinter as ctk
 from . import custom_widgets as cw
+from . import tk_bindings as tb
 import set_components as sc
 import card_draw as cd
 from .app_options import Options, Modes
@@ -15,6 +16,8 @@ class GamePanel(ctk.CTkFrame):
     content_panel: ctk.CTkFrame = None
     info_panel: ctk.CTkFrame = None
     game: sc.SETDeck
+    hint_engine: sc.HintEngine = None
+    hint_job: str = None
     set_painter: cd.SETStructureDraw
     # Content variables
     content_rows: int
@@ -46,6 +49,12 @@ class GamePanel(ctk.CTkFrame):
         self.generate_info_panel()
         self.start_game()
 
+    def destroy(self):
+        self.cancel_hint()
+        if self.hint_engine is not None:
+            self.hint_engine.shutdown()
+        super().destroy()
+
     def select_card(self, card: Tuple[int]):
         if self.timer.is_end.get():
             return
@@ -67,6 +76,35 @@ class GamePanel(ctk.CTkFrame):
             self.set_button.configure(state="disabled")
         return True
 
+    def show_hint(self):
+        """
+        Selects the next card of a valid move on the table, from the analysis of the hint engine. While the
+        analysis is running the main loop is not blocked: the hint is checked again every HINT_POLL_MS.
+        """
+        if self.timer.is_end.get() or self.game.is_game_end() or self.hint_job:
+            return
+        if not self.hint_engine.ready():
+            self.game_label.text.set(THINKING)
+            self.hint_job = self.after(HINT_POLL_MS, self._retry_hint)
+            return
+        move = self.hint_engine.hint(self.selected_cards, timeout=0)
+        if move is None or not self.selected_cards <= move:
+            return
+        hint_cards = sorted(move - self.selected_cards)
+        if hint_cards:
+            self.content_cards[hint_cards[0]][1].select_card(None)
+
+    def _retry_hint(self):
+        self.hint_job = None
+        self.game_label.text.set(self.game.game_state)
+        self.show_hint()
+
+    def cancel_hint(self):
+        """Cancels the pending check of a hint"""
+        if self.hint_job is not None:
+            self.after_cancel(self.hint_job)
+            self.hint_job = None
+
     def destroy_cards(self, card_ids: Tuple[int]):
         available_pos = []
         for card_id in card_ids:
@@ -100,17 +138,22 @@ class GamePanel(ctk.CTkFrame):
             card = cards[idx]
             self.content_cards[card[0]] = (pos, card[1])
             card[1].grid(row=pos[0], column=pos[1], padx=PADX, pady=PADY, sticky="nsew")
+        self.hint_engine.refresh()
         if self.game.is_game_end():
             if self.game_id == Modes.END_GAME and self.game.hold_card_remaining():
+                self.game.modify_game_state(message=GUESS_CARD)
                 found_card = False
                 card = None
-                self.game.modify_game_state(message=GUESS_CARD)
                 while not found_card:
                     picker_window = self.set_painter.generate_picker_window(
                         self, self.game.n_attributes
                     )
                     card = picker_window.show()[0]
-                    found_card = card is not None and self.game.guess_hold_card(card)
+                    if card is None:
+                        # Closing the picker gives up the guess and reveals the card
+                        card = self.game.reveal_hold_card()
+                        break
+                    found_card = self.game.guess_hold_card(card)
                 card_id, card_image = self.set_painter.generate_cards(
                         self.content_panel, (card,), card_function=self.select_card
                     )[0]
@@ -158,12 +201,19 @@ class GamePanel(ctk.CTkFrame):
 
     def start_game(self):
         # Start the set game
-        self.game.set_score_tracker(self.score_meter.actual_value)
-        self.game.set_game_state(self.game_label.text)
+        tb.bind_game_variables(
+            self.game, self.score_meter.actual_value, self.game_label.text
+        )
         self.timer.reset()
+        self.cancel_hint()
         if self.content_cards:
             self.destroy_cards(list(self.content_cards.keys()))
         self.game.start_game()
+        if self.hint_engine is None or self.hint_engine.game is not self.game:
+            if self.hint_engine is not None:
+                self.hint_engine.shutdown()
+            self.hint_engine = sc.HintEngine(self.game)
+        self.hint_engine.refresh()
         # Create the available card positions
         self.content_cards = {}
         card_positions = (
@@ -219,7 +269,7 @@ class GamePanel(ctk.CTkFrame):
         )
         # For the SetPlanetComet gamemode
         if self.game_id == Modes.SPC_GAME:
-            self.game.set_spc_button(self.set_button)
+            tb.bind_selection_button(self.game, self.set_button)
         self.set_button.grid(
             row=self.content_rows - 1,
             column=0,
@@ -246,7 +296,7 @@ class GamePanel(ctk.CTkFrame):
         )  # , border_width=2, border_color=ACCENT_COLOR)
         self.info_panel.columnconfigure(0, uniform="a", weight=1)
         self.info_panel.rowconfigure((0, 1, 2), uniform="a", weight=2)
-        self.info_panel.rowconfigure((3, 4, 5), uniform="a", weight=1)
+        self.info_panel.rowconfigure((3, 4, 5, 6), uniform="a", weight=1)
         # Fonts
         label_font = ctk.CTkFont(
             family=OUTPUT_FONT, size=OUTPUT_TEXT_SIZE, weight="bold"
@@ -307,6 +357,9 @@ class GamePanel(ctk.CTkFrame):
             font=button_font,
             command=self.option_panel.move,
         )
+        hint = cw.custom_button(
+            self.info_panel, text=HINT, font=button_font, command=self.show_hint
+        )
         # Place the widgets
         self.score_meter.grid(row=0, sticky="nsew", padx=PADX, pady=PADY)
         self.timer.grid(row=1, sticky="nsew", padx=PADX, pady=PADY)
@@ -314,6 +367,7 @@ class GamePanel(ctk.CTkFrame):
         how_to_play.grid(row=3, sticky="nsew", padx=PADX, pady=PADY)
         restart_game.grid(row=4, sticky="nsew", padx=PADX, pady=PADY)
         game_config.grid(row=5, sticky="nsew", padx=PADX, pady=PADY)
+        hint.grid(row=6, sticky="nsew", padx=PADX, pady=PADY)
         self.info_panel.place(
             relx=1 - self.info_panel_rel_width,
             rely=0,
@@ -0,0 +1,23 @@
+"""
+    Adapters that bind the events of a headless game of set_components to Tk variables and widgets.
+"""
+from tkinter import IntVar, StringVar
+
+import set_components as sc
+from set_components.game_settings import SCORE_EVENT, STATE_EVENT, SELECTION_EVENT
+
+
+def bind_game_variables(game: sc.SETDeck, score: IntVar, game_state: StringVar):
+    """Bind the score and state of the game to Tk variables, replacing any previous binding"""
+    game.clear_listeners(SCORE_EVENT)
+    game.clear_listeners(STATE_EVENT)
+    game.subscribe(SCORE_EVENT, score.set)
+    game.subscribe(STATE_EVENT, game_state.set)
+    score.set(game.score)
+    game_state.set(game.game_state)
+
+
+def bind_selection_button(game: sc.SETDeck, button):
+    """Bind the text of a button to the kind of selection of the game (SET, Planet or Comet)"""
+    game.clear_listeners(SELECTION_EVENT)
+    game.subscribe(SELECTION_EVENT, lambda text: button.configure(text=text))
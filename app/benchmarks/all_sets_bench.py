@@ -0,0 +1,49 @@
+"""
+    Benchmark of SETDeck.all_sets against the original search: combinations(cards, m) with the unpacked is_set
+    (a game with packed=False), which is the baseline of both the unpacked and the packed pair completion.
+    Run from the app folder: python -m benchmarks.all_sets_bench
+"""
+from itertools import combinations
+from random import Random
+from timeit import timeit
+
+from set_components import SETGame
+from set_components.game_settings import N_ATTRIBUTES, N_ATTRIBUTE_VALUES
+
+
+def combinations_all_sets(game: SETGame, cards):
+    """Original implementation of all_sets, checking every combination of m cards (with an unpacked game)"""
+    card_combinations = combinations(cards, game.n_attribute_values)
+    return tuple(cards for cards in card_combinations if game.is_set(cards))
+
+
+def bench_all_sets(n_tables: int = 20, repeat: int = 3, seed: int = 0):
+    rng = Random(seed)
+    print(
+        f"{'n':>2} {'m':>2} {'table':>5} {'packed':>6} {'baseline':>12} {'pair hash':>12} {'speedup':>8}"
+    )
+    for n in N_ATTRIBUTES:
+        for m in N_ATTRIBUTE_VALUES:
+            baseline = SETGame(n, m, packed=False)
+            deck = sorted(baseline.deck_cards)
+            tables = [rng.sample(deck, baseline.table_size) for _ in range(n_tables)]
+            t_old = timeit(
+                lambda: [combinations_all_sets(baseline, t) for t in tables], number=repeat
+            ) / (repeat * n_tables)
+            for packed in (False, True):
+                game = SETGame(n, m, packed=packed)
+                for table in tables:
+                    assert frozenset(map(frozenset, game.all_sets(table))) == frozenset(
+                        map(frozenset, combinations_all_sets(baseline, table))
+                    )
+                t_new = timeit(
+                    lambda: [game.all_sets(t) for t in tables], number=repeat
+                ) / (repeat * n_tables)
+                print(
+                    f"{n:>2} {m:>2} {game.table_size:>5} {str(packed):>6} "
+                    f"{t_old * 1e3:>10.3f}ms {t_new * 1e3:>10.3f}ms {t_old / t_new:>7.1f}x"
+                )
+
+
+if __name__ == "__main__":
+    bench_all_sets()
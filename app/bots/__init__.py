@@ -0,0 +1,12 @@
+from .strategies import first_move, random_move, greedy_score, lookahead, move_gain
+from .driver import BotReport, run_bot
+
+__all__ = [
+    "first_move",
+    "random_move",
+    "greedy_score",
+    "lookahead",
+    "move_gain",
+    "BotReport",
+    "run_bot",
+]
@@ -0,0 +1,29 @@
+"""
+    Throughput report of every bot strategy on every game mode.
+    Run from the app folder: python -m bots
+"""
+from set_components import SETGame, EndGame, IntersetGame, SETPlanetComet
+from .driver import run_bot
+from .strategies import first_move, random_move, greedy_score, lookahead
+
+
+def bench_bots(n_games: int = 20, seed: int = 0):
+    games = (
+        SETGame(4, 3, seed=seed),
+        EndGame(4, 3, set_score=300, seed=seed),
+        IntersetGame(4, 3, seed=seed),
+        SETPlanetComet(3, 3, seed=seed),
+        SETGame(4, 5, seed=seed),
+    )
+    strategies = (first_move, random_move, greedy_score, lookahead)
+    for game in games:
+        for strategy in strategies:
+            report = run_bot(game, strategy, n_games)
+            print(
+                f"{type(game).__name__:>14} {game.n_attributes}x{game.n_attribute_values} "
+                f"{strategy.__name__:>13}: {report.summary()}"
+            )
+
+
+if __name__ == "__main__":
+    bench_bots()
@@ -0,0 +1,73 @@
+"""
+    Headless driver of the bot players, which plays complete games of any SETDeck subclass and reports the
+    throughput of the engine.
+"""
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, List
+
+from set_components import SETDeck
+from simulation.simulator import play_game
+from .strategies import first_move
+
+
+@dataclass
+class BotReport:
+    """
+    Throughput of a bot over a group of games.
+        - games: Number of games played.
+        - moves: Number of moves played.
+        - elapsed: Seconds spent playing, including the start of each game.
+        - latencies: Seconds of every move, from the search of the valid moves to the end of the round.
+        - scores: Final score of every game.
+    """
+
+    games: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+    scores: List[int] = field(default_factory=list)
+
+    @property
+    def moves_per_sec(self):
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def games_per_sec(self):
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def latency_percentile(self, p: float):
+        """Nearest rank percentile p (0 to 100) of the move latencies, in seconds"""
+        if not self.latencies:
+            return 0.0
+        ranked = sorted(self.latencies)
+        idx = min(len(ranked) - 1, max(0, round(p / 100 * len(ranked)) - 1))
+        return ranked[idx]
+
+    def summary(self):
+        p50, p90, p99 = (self.latency_percentile(p) for p in (50, 90, 99))
+        mean_score = sum(self.scores) / max(self.games, 1)
+        return (
+            f"{self.games} games, {self.moves} moves in {self.elapsed:.3f}s: "
+            f"{self.games_per_sec:.1f} games/s, {self.moves_per_sec:.1f} moves/s, "
+            f"latency p50 {p50 * 1e3:.3f}ms p90 {p90 * 1e3:.3f}ms p99 {p99 * 1e3:.3f}ms, "
+            f"mean score {mean_score:.1f}"
+        )
+
+
+def run_bot(
+    game: SETDeck,
+    strategy: Callable = first_move,
+    n_games: int = 1,
+    max_moves: int = 10_000,
+):
+    """Plays n_games complete games of the game with the strategy passed and reports its throughput (play_game)"""
+    report = BotReport()
+    start = perf_counter()
+    for _ in range(n_games):
+        result = play_game(game, strategy, max_moves, on_round=report.latencies.append)
+        report.moves += result.refills
+        report.games += 1
+        report.scores.append(game.score)
+    report.elapsed = perf_counter() - start
+    return report
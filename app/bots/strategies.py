@@ -0,0 +1,52 @@
+"""
+    Strategies of the bot players. A strategy is a policy of the simulation package: it receives the game and its
+    valid moves on the table (game.table_moves()) and returns the selection of cards to play, or None to stop
+    playing. The simplest bots are the policies first_move and random_move. Strategies with parameters are module
+    level functions, to be bound with functools.partial and still be sent to worker processes.
+"""
+from typing import FrozenSet, Tuple
+
+from set_components import SETDeck
+from simulation.policies import first_move, random_move
+
+
+def move_gain(game: SETDeck, move: FrozenSet[Tuple[int]]):
+    """Score gained by playing the move, played on a clone of the game. Result: (gain, game after the move)"""
+    child = game.clone()
+    score = child.score
+    child.play_round(move)
+    return child.score - score, child
+
+
+def greedy_score(game: SETDeck, moves: Tuple[FrozenSet[Tuple[int]]]):
+    """Plays the valid move with the highest immediate score"""
+    if not moves:
+        return None
+    return max(moves, key=lambda move: move_gain(game, move)[0])
+
+
+def _lookahead_value(game: SETDeck, depth: int):
+    """Best score that can be gained in the next depth moves of the game"""
+    if depth == 0:
+        return 0
+    best = 0
+    for move in game.table_moves():
+        gain, child = move_gain(game, move)
+        best = max(best, gain + _lookahead_value(child, depth - 1))
+    return best
+
+
+def lookahead(game: SETDeck, moves: Tuple[FrozenSet[Tuple[int]]], depth: int = 2):
+    """
+    Plays the valid move with the highest score over the next depth moves. The cards dealt after each move are
+    the ones dealt by a clone of the game, so the lookahead only sees one of the possible deals.
+    Cost: O(b^depth) clones of the game, with b valid moves per table.
+    """
+    if not moves:
+        return None
+
+    def value(move: FrozenSet[Tuple[int]]):
+        gain, child = move_gain(game, move)
+        return gain + _lookahead_value(child, depth - 1)
+
+    return max(moves, key=value)
@@ -0,0 +1,12 @@
+from .game_server import GameServer, run_server
+from .rooms import Room, RoomShard
+from .load_test import Connection, run_load_test
+
+__all__ = [
+    "GameServer",
+    "run_server",
+    "Room",
+    "RoomShard",
+    "Connection",
+    "run_load_test",
+]
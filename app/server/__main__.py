@@ -0,0 +1,48 @@
+"""
+    Game server and its load test. Run from the app folder:
+        python -m server serve --port 8765 --shards 4
+        python -m server load --port 8765 --rooms 1000
+    Without --port, load starts its own server in the same process, with the shards passed.
+"""
+import argparse
+import asyncio
+
+from .game_server import GameServer, run_server
+from .load_test import run_load_test
+
+
+async def load(args: argparse.Namespace):
+    server, port = None, args.port
+    if port is None:
+        server = await GameServer(args.host, 0, args.shards).start()
+        port = server.port
+    report = await run_load_test(
+        args.host, port, args.rooms, args.connections, args.moves, args.n, args.m
+    )
+    if server is None:
+        print(f"{args.rooms} rooms: {report.summary()}")
+    else:
+        print(f"{args.rooms} rooms, {args.shards} shards: {report.summary()}")
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m server")
+    parser.add_argument("command", choices=("serve", "load"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--shards", type=int, default=0)
+    parser.add_argument("--rooms", type=int, default=1_000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--moves", type=int, default=20)
+    parser.add_argument("-n", type=int, default=4)
+    parser.add_argument("-m", type=int, default=3)
+    args = parser.parse_args()
+    if args.command == "serve":
+        asyncio.run(run_server(args.host, args.port or 8765, args.shards))
+    else:
+        asyncio.run(load(args))
+
+
+if __name__ == "__main__":
+    main()
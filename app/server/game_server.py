@@ -0,0 +1,155 @@
+"""
+    Asyncio server that hosts many rooms from one process. The connections are served by the event loop, and the
+    rooms are sharded by id over RoomShards: in the event loop itself, or over worker processes (one process per
+    shard) when the validation of the moves is CPU bound.
+"""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import count
+from typing import Dict, List, Set
+
+from .protocol import *
+from .rooms import RoomShard, init_shard, handle_in_shard
+
+
+class GameServer:
+    """
+    GameServer accepts connections of the protocol and routes each request to the shard of its room, sending the
+    deltas of a room to every connection subscribed to it. The requests for a process shard are sent in batches,
+    with every request queued while the previous batch was handled, to amortize the cost of the IPC. When the
+    worker process of a shard dies, the requests of its batch are answered with an error and the shard restarts
+    empty, as its rooms were lost with the process.
+        - host, port: Address of the server, port 0 to take a free port (port holds the bound one after start).
+        - shards: Number of worker processes, 0 to keep every room in the event loop.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, shards: int = 0):
+        self.host = host
+        self.port = port
+        self.n_shards = shards
+        self._executors: List[ProcessPoolExecutor] = []
+        self._queues: List[asyncio.Queue] = []
+        self._batchers: List[asyncio.Task] = []
+        self._local_shard = RoomShard() if shards == 0 else None
+        self._room_ids = count()
+        self._subscribers: Dict[int, Set[asyncio.StreamWriter]] = {}
+        self._connections: Set[asyncio.Task] = set()
+        self._server: asyncio.AbstractServer = None
+
+    async def start(self):
+        self._executors = [self._new_executor() for _ in range(self.n_shards)]
+        self._queues = [asyncio.Queue() for _ in range(self.n_shards)]
+        self._batchers = [
+            asyncio.create_task(self._send_batches(shard)) for shard in range(self.n_shards)
+        ]
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def serve_forever(self):
+        await self._server.serve_forever()
+
+    async def stop(self):
+        self._server.close()
+        for connection in self._connections:
+            connection.cancel()
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self._server.wait_closed()
+        for batcher in self._batchers:
+            batcher.cancel()
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _new_executor():
+        return ProcessPoolExecutor(max_workers=1, initializer=init_shard)
+
+    async def _send_batches(self, shard: int):
+        """
+        Sends the queued (request, future) pairs of a process shard as a batch, one batch at a time, so the
+        requests keep their order. If the worker process dies, the batch is answered with errors and the shard
+        gets a new process.
+        """
+        queue = self._queues[shard]
+        while True:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            requests = [request for request, _ in batch]
+            try:
+                responses = await asyncio.wrap_future(
+                    self._executors[shard].submit(handle_in_shard, requests)
+                )
+            except BrokenProcessPool:
+                self._executors[shard].shutdown(wait=False, cancel_futures=True)
+                self._executors[shard] = self._new_executor()
+                responses = []
+                for request in requests:
+                    response = {"op": ERROR, "error": f"Shard {shard} died, its rooms were lost"}
+                    if "id" in request:
+                        response["id"] = request["id"]
+                    responses.append(response)
+            for (_, future), response in zip(batch, responses):
+                if not future.done():
+                    future.set_result(response)
+
+    async def _dispatch(self, request: Dict):
+        """Response of the shard of the room. A shard handles its requests in the order they are received."""
+        if self._local_shard is not None:
+            return self._local_shard.handle(request)
+        room_id = request.get("room")
+        if not isinstance(room_id, int):
+            response = {"op": ERROR, "error": f"Unknown room: {room_id}"}
+            if "id" in request:
+                response["id"] = request["id"]
+            return response
+        future = asyncio.get_running_loop().create_future()
+        self._queues[room_id % self.n_shards].put_nowait((request, future))
+        return await future
+
+    async def _request(self, request: Dict, writer: asyncio.StreamWriter):
+        if request["op"] == CREATE:
+            request["room"] = next(self._room_ids)
+        response = await self._dispatch(request)
+        room_id = response.get("room")
+        if response["op"] == STATE:
+            self._subscribers.setdefault(room_id, set()).add(writer)
+        elif response["op"] == CLOSED:
+            self._subscribers.pop(room_id, None)
+        writer.write(encode_message(response))
+        if response["op"] == DELTA and response["valid"]:
+            event = encode_message({k: v for k, v in response.items() if k != "id"})
+            for subscriber in self._subscribers.get(room_id, ()):
+                if subscriber is not writer:
+                    subscriber.write(event)
+        await writer.drain()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = decode_message(line)
+                except ValueError as error:
+                    writer.write(encode_message({"op": ERROR, "error": str(error)}))
+                    continue
+                # Requests are served concurrently, so one slow room does not stall the connection
+                task = asyncio.create_task(self._request(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(connection)
+            for subscribers in self._subscribers.values():
+                subscribers.discard(writer)
+            writer.close()
+
+
+async def run_server(host: str = "127.0.0.1", port: int = 8765, shards: int = 0):
+    server = await GameServer(host, port, shards).start()
+    print(f"Serving on {server.host}:{server.port} with {shards} shard processes")
+    await server.serve_forever()
@@ -0,0 +1,114 @@
+"""
+    Load test client of the game server: plays many concurrent rooms, multiplexed over a few connections, and
+    reports the latency of the moves.
+"""
+import asyncio
+from itertools import count
+from time import perf_counter
+from typing import Dict
+
+from bots import BotReport
+from set_components.line_index import line_index
+from .protocol import *
+
+
+class Connection:
+    """
+    Connection to the game server that pipelines requests and matches the responses by their id.
+        - reader, writer: Streams of the socket.
+        - events: Queue of the deltas of the joined rooms played by other connections.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self._ids = count()
+        self._pending: Dict[int, asyncio.Future] = {}
+        self.events: asyncio.Queue = asyncio.Queue()
+        self._reader_task = asyncio.create_task(self._read())
+
+    @classmethod
+    async def open(cls, host: str, port: int):
+        return cls(*await asyncio.open_connection(host, port, limit=1 << 20))
+
+    async def _read(self):
+        while line := await self.reader.readline():
+            message = decode_message(line)
+            # Deltas of other connections have no id
+            if "id" in message:
+                self._pending.pop(message["id"]).set_result(message)
+            else:
+                self.events.put_nowait(message)
+
+    async def request(self, message: Dict):
+        message["id"] = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message["id"]] = future
+        self.writer.write(encode_message(message))
+        await self.writer.drain()
+        return await future
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+        await self._reader_task
+
+
+def find_set(table: set, n: int, m: int):
+    """Card ids of a SET of the table, or None"""
+    lines = line_index(n, m)
+    ordered = sorted(table)
+    for idx, a in enumerate(ordered):
+        for b in ordered[idx + 1 :]:
+            line = lines.cards_of(lines.line_of(a, b))
+            if table.issuperset(line):
+                return line
+    return None
+
+
+async def play_room(
+    connection: Connection, report: BotReport, n: int, m: int, max_moves: int, seed: int
+):
+    """Plays a room of SET until it has no SET or max_moves moves"""
+    state = await connection.request({"op": CREATE, "mode": "set_game", "n": n, "m": m, "seed": seed})
+    room, table, score = state["room"], set(state["table"]), state["score"]
+    for _ in range(max_moves):
+        cards = find_set(table, n, m)
+        if cards is None:
+            break
+        start = perf_counter()
+        delta = await connection.request({"op": PLAY, "room": room, "cards": cards})
+        report.latencies.append(perf_counter() - start)
+        report.moves += 1
+        table.difference_update(delta["removed"])
+        table.update(delta["added"])
+        score = delta["score"]
+    await connection.request({"op": CLOSE, "room": room})
+    report.games += 1
+    report.scores.append(score)
+
+
+async def run_load_test(
+    host: str = "127.0.0.1",
+    port: int = 8765,
+    n_rooms: int = 1_000,
+    n_connections: int = 50,
+    max_moves: int = 20,
+    n: int = 4,
+    m: int = 3,
+):
+    """Plays n_rooms concurrent rooms of SET over n_connections connections and reports the move latencies"""
+    line_index(n, m)
+    connections = [await Connection.open(host, port) for _ in range(n_connections)]
+    report = BotReport()
+    start = perf_counter()
+    await asyncio.gather(
+        *(
+            play_room(connections[room % n_connections], report, n, m, max_moves, room)
+            for room in range(n_rooms)
+        )
+    )
+    report.elapsed = perf_counter() - start
+    for connection in connections:
+        await connection.close()
+    return report
@@ -0,0 +1,60 @@
+"""
+    Protocol of the game server: one JSON message per line over a TCP socket. Cards are sent as packed card ids
+    (little-endian base m), and every request may carry an "id" that the server echoes in its response, so a
+    connection can pipeline requests of many rooms.
+    Requests:
+        - create: mode, n, m (within N_ATTRIBUTES and N_ATTRIBUTE_VALUES), seed (optional) and the keyword
+            arguments of the game (options, among the MODE_OPTIONS of the mode). Answered with state.
+        - join: room. Subscribes the connection to the deltas of the room. Answered with state.
+        - play: room, cards. Answered with a delta, which is also sent to the other connections of the room.
+        - guess: room, card. Guess of the hold card of an EndGame, answered with a delta.
+        - close: room. Answered with closed.
+    Responses:
+        - state: room, mode, n, m, table, score, state, deck (cards left), end.
+        - delta: room, valid, removed, added, score, state, end.
+        - closed: room.
+        - error: error message.
+"""
+import json
+from typing import Dict
+
+from set_components import SETGame, EndGame, IntersetGame, SETPlanetComet
+from set_components.game_settings import N_ATTRIBUTES, N_ATTRIBUTE_VALUES
+
+# Requests
+CREATE = "create"
+JOIN = "join"
+PLAY = "play"
+GUESS = "guess"
+CLOSE = "close"
+# Responses
+STATE = "state"
+DELTA = "delta"
+CLOSED = "closed"
+ERROR = "error"
+
+# Game modes, with the ids of the app modes
+MODES = {
+    "set_game": SETGame,
+    "end_game": EndGame,
+    "interset_game": IntersetGame,
+    "set-planet-comet": SETPlanetComet,
+}
+# Keyword arguments of each game mode that a create request may set
+MODE_OPTIONS = {
+    "set_game": ("set_score", "refill_policy", "refill_sets"),
+    "end_game": ("set_score", "end_guess_score", "refill_policy", "refill_sets"),
+    "interset_game": ("interset_score",),
+    "set-planet-comet": ("set_score", "planet_score", "comet_score"),
+}
+
+
+def encode_message(message: Dict):
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+
+def decode_message(line: bytes):
+    message = json.loads(line)
+    if not isinstance(message, dict) or "op" not in message:
+        raise ValueError("Messages are JSON objects with an op")
+    return message
@@ -0,0 +1,157 @@
+"""
+    Rooms of the game server. Every room is owned by a single RoomShard, which handles the requests of its rooms
+    one at a time, so the moves are validated without any lock. A shard runs in the event loop of the server or in
+    a worker process of its own.
+"""
+from typing import Dict, FrozenSet, Iterable, List
+
+from set_components import SETDeck, EndGame
+from set_components.replay_log import pack_card, unpack_card
+from .protocol import *
+
+
+class Room:
+    """
+    Room holds the headless game of a room.
+        - room_id: Id of the room.
+        - mode: Id of the game mode (a key of MODES).
+        - game: The game engine.
+    """
+
+    def __init__(self, room_id: int, mode: str, game: SETDeck):
+        self.room_id = room_id
+        self.mode = mode
+        self.game = game
+
+    def pack_all(self, cards: Iterable):
+        m = self.game.n_attribute_values
+        return sorted(pack_card(card, m) for card in cards)
+
+    def unpack_all(self, card_ids: Iterable[int]):
+        n, m = self.game.n_attributes, self.game.n_attribute_values
+        card_ids = tuple(card_ids)
+        for card_id in card_ids:
+            # unpack_card would wrap an id out of range around to a valid card
+            if type(card_id) is not int or not 0 <= card_id < m**n:
+                raise ValueError(f"Invalid card id for AG({n}, {m}): {card_id}")
+        return frozenset(unpack_card(card_id, n, m) for card_id in card_ids)
+
+    def state(self):
+        game = self.game
+        return {
+            "op": STATE,
+            "room": self.room_id,
+            "mode": self.mode,
+            "n": game.n_attributes,
+            "m": game.n_attribute_values,
+            "table": self.pack_all(game.table_cards),
+            "score": game.score,
+            "state": game.game_state,
+            "deck": len(game.deck),
+            "end": game.is_game_end(),
+        }
+
+    def delta(self, valid: bool, before: FrozenSet):
+        game, after = self.game, self.game.table_cards
+        return {
+            "op": DELTA,
+            "room": self.room_id,
+            "valid": valid,
+            "removed": self.pack_all(before - after),
+            "added": self.pack_all(after - before),
+            "score": game.score,
+            "state": game.game_state,
+            "end": game.is_game_end(),
+        }
+
+
+class RoomShard:
+    """
+    RoomShard owns a group of rooms and answers their requests.
+        - rooms: Rooms of the shard by id.
+    """
+
+    def __init__(self):
+        self.rooms: Dict[int, Room] = {}
+
+    def _room(self, request: Dict):
+        room = self.rooms.get(request.get("room"))
+        if room is None:
+            raise ValueError(f"Unknown room: {request.get('room')}")
+        return room
+
+    def create(self, request: Dict):
+        mode = request.get("mode", "set_game")
+        if mode not in MODES:
+            raise ValueError(f"Invalid game mode: {mode}")
+        n, m = request.get("n", 4), request.get("m", 3)
+        if type(n) is not int or type(m) is not int:
+            raise ValueError(f"Invalid geometry: AG({n}, {m})")
+        if n not in N_ATTRIBUTES or m not in N_ATTRIBUTE_VALUES:
+            raise ValueError(f"Invalid geometry: AG({n}, {m})")
+        options = request.get("options", {})
+        if not isinstance(options, dict):
+            raise ValueError("The options are a JSON object")
+        invalid = [key for key in options if key not in MODE_OPTIONS[mode]]
+        if invalid:
+            raise ValueError(f"Invalid options for {mode}: {', '.join(sorted(invalid))}")
+        game = MODES[mode](n, m, seed=request.get("seed"), **options)
+        game.start_game()
+        room = Room(request["room"], mode, game)
+        self.rooms[room.room_id] = room
+        return room.state()
+
+    def play(self, request: Dict):
+        room = self._room(request)
+        before = room.game.table_cards
+        cards = room.unpack_all(request.get("cards", ()))
+        valid = room.game.is_valid_selection(len(cards))
+        valid = valid and room.game.play_round(tuple(cards)) is not None
+        return room.delta(valid, before)
+
+    def guess(self, request: Dict):
+        room = self._room(request)
+        if not isinstance(room.game, EndGame):
+            raise ValueError(f"Mode {room.mode} has no hold card")
+        before = room.game.table_cards
+        (card,) = room.unpack_all((request["card"],))
+        return room.delta(room.game.guess_hold_card(card), before)
+
+    def close(self, request: Dict):
+        room = self.rooms.pop(self._room(request).room_id)
+        return {"op": CLOSED, "room": room.room_id}
+
+    def handle(self, request: Dict):
+        """Response to a request, with the id of the request. Invalid requests are answered with an error."""
+        handlers = {
+            CREATE: self.create,
+            JOIN: lambda request: self._room(request).state(),
+            PLAY: self.play,
+            GUESS: self.guess,
+            CLOSE: self.close,
+        }
+        try:
+            handler = handlers.get(request["op"])
+            if handler is None:
+                raise ValueError(f"Invalid op: {request['op']}")
+            response = handler(request)
+        except Exception as error:
+            # Any failure of a request is answered, so a malformed request never takes down the shard
+            response = {"op": ERROR, "error": f"{type(error).__name__}: {error}"}
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+
+# Shard of a worker process
+_shard: RoomShard = None
+
+
+def init_shard():
+    global _shard
+    _shard = RoomShard()
+
+
+def handle_in_shard(requests: List[Dict]):
+    """Responses of the shard of the worker process to a batch of requests, in order"""
+    return [_shard.handle(request) for request in requests]
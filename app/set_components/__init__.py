@@ -3,5 +3,25 @@ from .set_game import SETGame
 from .end_game import EndGame
 from .interset_game import IntersetGame
 from .set_planet_comet import SETPlanetComet
+from .hint_engine import HintEngine
+from .replay_log import GameRecorder, GameReplay, read_games
+from .table_analysis import TableAnalysis, analysis_cache
+from .deal_pool import DealPool, BucketStats, generate_deal, count_structures
 
-__all__ = ["SETDeck", "SETGame", "EndGame", "IntersetGame", "SETPlanetComet"]
+__all__ = [
+    "SETDeck",
+    "SETGame",
+    "EndGame",
+    "IntersetGame",
+    "SETPlanetComet",
+    "HintEngine",
+    "GameRecorder",
+    "GameReplay",
+    "read_games",
+    "TableAnalysis",
+    "analysis_cache",
+    "DealPool",
+    "BucketStats",
+    "generate_deal",
+    "count_structures",
+]
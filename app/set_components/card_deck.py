@@ -0,0 +1,80 @@
+"""
+    Module for the array backed pile of cards remaining in the deck of a game.
+"""
+from random import Random
+from typing import Dict, FrozenSet, Hashable, Iterable, List
+
+
+class CardDeck:
+    """
+    CardDeck keeps the remaining cards in an array, with the position of each card, so drawing k random cards or
+    removing k given cards costs O(k) swap-removes. Draws are reproducible from the state of the rng.
+        - rng: Random generator used for the draws.
+    """
+
+    def __init__(self, cards: Iterable[Hashable] = (), rng: Random = None):
+        self.rng = rng if rng is not None else Random()
+        self._cards: List[Hashable] = []
+        self._positions: Dict[Hashable, int] = {}
+        self._frozen: FrozenSet[Hashable] = None
+        self.reset(cards)
+
+    def reset(self, cards: Iterable[Hashable]):
+        """Refill the deck with the cards passed, in a deterministic order"""
+        self._cards = sorted(cards)
+        self._positions = {card: idx for idx, card in enumerate(self._cards)}
+        self._frozen = None
+
+    def copy(self, rng: Random = None):
+        """Copy of the deck, drawing with the rng passed (or with the same rng)"""
+        deck = CardDeck.__new__(CardDeck)
+        deck.rng = rng if rng is not None else self.rng
+        deck._cards = self._cards.copy()
+        deck._positions = self._positions.copy()
+        deck._frozen = self._frozen
+        return deck
+
+    def __len__(self):
+        return len(self._cards)
+
+    def __contains__(self, card: Hashable):
+        return card in self._positions
+
+    def __iter__(self):
+        return iter(self._cards)
+
+    def _pop(self, idx: int):
+        """Swap-remove the card at the position idx"""
+        cards, positions = self._cards, self._positions
+        card = cards[idx]
+        last = cards.pop()
+        if last != card:
+            cards[idx] = last
+            positions[last] = idx
+        del positions[card]
+        return card
+
+    def draw(self, k: int):
+        """Draw k random cards (or every remaining card if there are less than k)"""
+        k = min(k, len(self._cards))
+        self._frozen = None
+        randrange = self.rng.randrange
+        return tuple(self._pop(randrange(len(self._cards))) for _ in range(k))
+
+    def sample(self, k: int):
+        """k random cards of the deck, without removing them"""
+        return self.rng.sample(self._cards, min(k, len(self._cards)))
+
+    def remove(self, cards: Iterable[Hashable]):
+        """Remove the cards passed that are in the deck"""
+        self._frozen = None
+        for card in cards:
+            idx = self._positions.get(card)
+            if idx is not None:
+                self._pop(idx)
+
+    def cards(self):
+        """Frozenset view of the remaining cards, built lazily once per change of the deck"""
+        if self._frozen is None:
+            self._frozen = frozenset(self._cards)
+        return self._frozen
@@ -0,0 +1,115 @@
+"""
+    Module for the integer packed representation of the cards of a SET deck.
+    Each card of AG(n, m) is represented as a single base m integer (0..m^n - 1), where the attribute k is the
+    k-th digit of the integer. The arithmetic of the affine space is then precomputed in lookup tables.
+"""
+from array import array
+from functools import lru_cache
+from typing import Tuple, Iterable, Dict
+import numpy as np
+
+from . import mod_vector as mv
+
+
+def _table_typecode(size: int):
+    """Smallest unsigned array typecode able to hold a card id"""
+    return "H" if size <= 1 << 16 else "I"
+
+
+class CardEncoding:
+    """
+    CardEncoding holds the packed representation of the cards of AG(n, m) and the lookup tables for its arithmetic.
+        - n_attributes: Number of attributes of each card.
+        - n_attribute_values: Number of attribute values (prime number).
+        - size: Number of cards of the deck (m^n).
+        - cards: The card tuple of every card id.
+        - ids: The card id of every card tuple.
+        - add_table: Flat table with the id of a + b, indexed by a * size + b.
+        - neg_table: Table with the id of -a.
+        - mul_table: Flat table with the id of k * a, indexed by k * size + a.
+    """
+
+    def __init__(self, n_attributes: int, n_attribute_values: int):
+        self.n_attributes = n_attributes
+        self.n_attribute_values = n_attribute_values
+        self.size = n_attribute_values**n_attributes
+        digits = mv.simple_affine_space_gen_batch(n_attributes, n_attribute_values)
+        self.cards: Tuple[Tuple[int]] = tuple(map(tuple, digits.tolist()))
+        self.ids: Dict[Tuple[int], int] = {
+            card: card_id for card_id, card in enumerate(self.cards)
+        }
+        self._generate_tables(digits)
+
+    def _generate_tables(self, digits: np.ndarray):
+        """Precompute the addition, negation and scalar product tables from the (size, n) array of card digits"""
+        m, size = self.n_attribute_values, self.size
+        powers = m ** np.arange(self.n_attributes, dtype=np.int64)
+        typecode = _table_typecode(size)
+        add = mv.mod_addition_batch(digits[:, None, :], digits[None, :, :], m) @ powers
+        mul = np.stack([mv.mod_product_batch(digits, k, m) for k in range(m)]) @ powers
+        self.add_table = array(typecode, add.ravel().tolist())
+        self.mul_table = array(typecode, mul.ravel().tolist())
+        self.neg_table = self.mul_table[(m - 1) * size : m * size]
+
+    def __reduce__(self):
+        """Pickled as a reference to the shared CardEncoding of the receiving process"""
+        return card_encoding, (self.n_attributes, self.n_attribute_values)
+
+    def encode(self, card: Tuple[int]):
+        """Card id of a card tuple"""
+        return self.ids[card]
+
+    def decode(self, card_id: int):
+        """Card tuple of a card id"""
+        return self.cards[card_id]
+
+    def encode_all(self, cards: Iterable[Tuple[int]]):
+        return tuple(self.ids[card] for card in cards)
+
+    def decode_all(self, card_ids: Iterable[int]):
+        return tuple(self.cards[card_id] for card_id in card_ids)
+
+    def add(self, a: int, b: int):
+        """Id of the card a + b"""
+        return self.add_table[a * self.size + b]
+
+    def sub(self, a: int, b: int):
+        """Id of the card a - b"""
+        return self.add_table[a * self.size + self.neg_table[b]]
+
+    def mul(self, a: int, k: int):
+        """Id of the card k * a"""
+        return self.mul_table[(k % self.n_attribute_values) * self.size + a]
+
+    def mult_add(self, card_ids: Iterable[int]):
+        """Id of the sum of multiple cards"""
+        add_table, size = self.add_table, self.size
+        total = 0
+        for card_id in card_ids:
+            total = add_table[total * size + card_id]
+        return total
+
+    def complete_line(self, a: int, b: int):
+        """Ids of the remaining cards of the line (SET) that goes through the cards a and b"""
+        add_table, mul_table, size = self.add_table, self.mul_table, self.size
+        v = add_table[b * size + self.neg_table[a]]
+        return tuple(
+            add_table[b * size + mul_table[k * size + v]]
+            for k in range(1, self.n_attribute_values - 1)
+        )
+
+    def is_line(self, card_ids: Iterable[int]):
+        """Checks if the card ids passed are a line (SET) of the affine space"""
+        card_ids = tuple(card_ids)
+        if len(card_ids) != self.n_attribute_values or self.mult_add(card_ids) != 0:
+            return False
+        a, b = card_ids[0:2]
+        if a == b:
+            return False
+        return frozenset(self.complete_line(a, b)).union((a, b)) == frozenset(card_ids)
+
+
+@lru_cache(maxsize=None)
+def card_encoding(n_attributes: int, n_attribute_values: int):
+    """Shared CardEncoding for AG(n, m), built once per process"""
+    return CardEncoding(n_attributes, n_attribute_values)
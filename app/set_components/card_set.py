@@ -0,0 +1,86 @@
+"""
+    Module for the bitmask representation of a set of packed card ids.
+"""
+from typing import Iterable
+
+
+class CardSet:
+    """
+    CardSet is an immutable set of card ids stored as the bits of a Python int, so union, intersection, difference,
+    subset checks and the number of cards are single big int operations.
+        - mask: Bitmask of the set, the bit k is set if the card id k is in the set.
+    """
+
+    __slots__ = ("mask",)
+
+    def __init__(self, mask: int = 0):
+        self.mask = mask
+
+    @classmethod
+    def from_ids(cls, card_ids: Iterable[int]):
+        mask = 0
+        for card_id in card_ids:
+            mask |= 1 << card_id
+        return cls(mask)
+
+    def __or__(self, other: "CardSet"):
+        return CardSet(self.mask | other.mask)
+
+    def __and__(self, other: "CardSet"):
+        return CardSet(self.mask & other.mask)
+
+    def __sub__(self, other: "CardSet"):
+        return CardSet(self.mask & ~other.mask)
+
+    def __xor__(self, other: "CardSet"):
+        return CardSet(self.mask ^ other.mask)
+
+    def __le__(self, other: "CardSet"):
+        return self.mask & ~other.mask == 0
+
+    def __lt__(self, other: "CardSet"):
+        return self.mask != other.mask and self <= other
+
+    def __ge__(self, other: "CardSet"):
+        return other <= self
+
+    def __gt__(self, other: "CardSet"):
+        return other < self
+
+    def __eq__(self, other):
+        return isinstance(other, CardSet) and self.mask == other.mask
+
+    def __hash__(self):
+        return hash(self.mask)
+
+    def __len__(self):
+        return self.mask.bit_count()
+
+    def __bool__(self):
+        return self.mask != 0
+
+    def __contains__(self, card_id: int):
+        return (self.mask >> card_id) & 1 == 1
+
+    def __iter__(self):
+        """Iterates the card ids in increasing order"""
+        mask = self.mask
+        while mask:
+            low_bit = mask & -mask
+            yield low_bit.bit_length() - 1
+            mask ^= low_bit
+
+    def __repr__(self):
+        return f"CardSet({list(self)})"
+
+    def add(self, card_id: int):
+        return CardSet(self.mask | (1 << card_id))
+
+    def discard(self, card_id: int):
+        return CardSet(self.mask & ~(1 << card_id))
+
+    def isdisjoint(self, other: "CardSet"):
+        return self.mask & other.mask == 0
+
+    def issubset(self, other: "CardSet"):
+        return self <= other
@@ -0,0 +1,273 @@
+"""
+    Module for the starting tables graded by difficulty: the number of SETs, intersets or planets they hold.
+    Graded deals are searched by a local search over the table, and a DealPool pre-generates them in the
+    background for every (mode, n, m, difficulty) bucket, so a game can start from a graded deal in O(1).
+"""
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from random import Random
+from threading import Condition, Thread
+from time import perf_counter
+from typing import Deque, Dict, FrozenSet, Set, Tuple, Type
+
+from .set_deck import SETDeck
+from .game_settings import SETS_GRADE, INTERSETS_GRADE, PLANETS_GRADE
+
+# Bucket of the deal pool: (game mode, n, m, difficulty)
+BucketKey = Tuple[Type[SETDeck], int, int, int]
+# Searches after which a bucket without any deal found is no longer filled
+_GIVE_UP_ATTEMPTS = 64
+# Failed batches after which a bucket is no longer filled
+_GIVE_UP_FAILURES = 3
+
+
+def count_structures(game: SETDeck, cards: FrozenSet[Tuple[int]], structure: str):
+    """Number of SETs, intersets or planets (planes with at least 2 * (m - 1) cards) within cards"""
+    if structure == SETS_GRADE:
+        return len(game.all_sets(cards))
+    if structure == INTERSETS_GRADE:
+        return len(game.all_intersets(cards))
+    if structure == PLANETS_GRADE:
+        return sum(1 for _ in game.all_planets(cards))
+    raise ValueError(f"Invalid deal structure: {structure}")
+
+
+def generate_deal(
+    game: SETDeck,
+    difficulty: int,
+    rng: Random = None,
+    structure: str = None,
+    max_steps: int = 2_000,
+):
+    """
+    Starting table of the game with exactly difficulty structures (of the structure of the game mode by default).
+    A random table is improved by swapping one of its cards with one of the deck while the distance to the
+    difficulty does not grow, with a worse swap accepted one time in ten to leave the plateaus.
+    Result: (the table, or None if it was not found in max_steps swaps, number of swaps tried).
+    """
+    rng = rng if rng is not None else Random()
+    structure = structure or game.deal_structure
+    deck = game.deck_cards if game.streaming else sorted(game.deck_cards)
+    table = rng.sample(deck, game.table_size)
+    table_set = frozenset(table)
+    distance = abs(count_structures(game, table_set, structure) - difficulty)
+    for step in range(max_steps):
+        if distance == 0:
+            return table_set, step
+        card = rng.choice(deck)
+        if card in table_set:
+            continue
+        idx = rng.randrange(len(table))
+        new_table = table_set.difference((table[idx],)).union((card,))
+        new_distance = abs(count_structures(game, new_table, structure) - difficulty)
+        if new_distance <= distance or rng.random() < 0.1:
+            table[idx], table_set, distance = card, new_table, new_distance
+    return (table_set if distance == 0 else None), max_steps
+
+
+def _generate_batch(args):
+    """Graded deals of a bucket, generated with a new game of the mode. Result: (deals, swaps, seconds)"""
+    (game_class, n_attributes, n_attribute_values, difficulty), n_deals, seed = args
+    game = game_class(n_attributes, n_attribute_values)
+    rng = Random(seed)
+    start = perf_counter()
+    deals, steps = [], 0
+    for _ in range(n_deals):
+        deal, deal_steps = generate_deal(game, difficulty, rng)
+        steps += deal_steps
+        if deal is not None:
+            deals.append(deal)
+    return deals, steps, perf_counter() - start
+
+
+@dataclass
+class BucketStats:
+    """
+    Statistics of a bucket of the deal pool.
+        - requests: Number of deals requested by the games.
+        - hits: Number of requests served with a pre-generated deal.
+        - generated: Number of deals generated.
+        - attempts: Number of deals searched, found or not.
+        - swaps: Number of swaps of the local search.
+        - generation_time: Seconds spent generating deals.
+        - failures: Number of batches that raised an exception.
+        - last_error: Message of the last exception of a batch.
+    """
+
+    requests: int = 0
+    hits: int = 0
+    generated: int = 0
+    attempts: int = 0
+    swaps: int = 0
+    generation_time: float = 0.0
+    failures: int = 0
+    last_error: str = None
+
+    @property
+    def hit_rate(self):
+        return self.hits / max(self.requests, 1)
+
+    @property
+    def success_rate(self):
+        """Ratio of the searches that found a deal, low for difficulties that are rare or impossible"""
+        return self.generated / max(self.attempts, 1)
+
+    @property
+    def deals_per_sec(self):
+        return self.generated / self.generation_time if self.generation_time else 0.0
+
+
+class DealPool:
+    """
+    DealPool keeps a queue of graded deals per bucket, (mode, n, m, difficulty), refilled in the background.
+    A bucket is created on the first request (or with reserve) and a filler thread generates batches of deals
+    for the buckets that are not full, in the thread itself or over a pool of processes. The buckets take turns
+    of one batch each, so an expensive bucket never starves the cheap ones, and the buckets of difficulties that
+    are never found, or whose batches keep failing, are given up.
+        - capacity: Max number of deals kept per bucket.
+        - batch_size: Number of deals searched per batch.
+        - workers: Number of processes of the pool, 0 to generate in the filler thread.
+        - seed: Seed of the seeds of the batches.
+    """
+
+    def __init__(
+        self, capacity: int = 16, batch_size: int = 4, workers: int = 0, seed: int = None
+    ):
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.workers = workers
+        self.rng = Random(seed)
+        self.buckets: Dict[BucketKey, Deque[FrozenSet[Tuple[int]]]] = {}
+        self.stats: Dict[BucketKey, BucketStats] = {}
+        self._in_flight: Set[BucketKey] = set()
+        self._turn = 0
+        self._condition = Condition()
+        self._closed = False
+        self._executor = ProcessPoolExecutor(workers) if workers > 0 else None
+        self._thread = Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def bucket_key(game: SETDeck, difficulty: int) -> BucketKey:
+        return (type(game), game.n_attributes, game.n_attribute_values, difficulty)
+
+    def reserve(self, game: SETDeck, difficulty: int):
+        """Creates the bucket of the game mode and difficulty, so it is filled before the first request"""
+        key = self.bucket_key(game, difficulty)
+        with self._condition:
+            if key not in self.buckets:
+                self.buckets[key] = deque()
+                self.stats[key] = BucketStats()
+                self._condition.notify()
+        return key
+
+    def pop(self, game: SETDeck, difficulty: int):
+        """A pre-generated deal of the bucket, O(1), or None if the bucket is empty"""
+        key = self.reserve(game, difficulty)
+        with self._condition:
+            stats, bucket = self.stats[key], self.buckets[key]
+            stats.requests += 1
+            self._condition.notify()
+            if not bucket:
+                return None
+            stats.hits += 1
+            return bucket.popleft()
+
+    def _needs_deals(self, key: BucketKey):
+        stats = self.stats[key]
+        if stats.generated == 0 and stats.attempts >= _GIVE_UP_ATTEMPTS:
+            return False
+        if stats.failures >= _GIVE_UP_FAILURES:
+            return False
+        return key not in self._in_flight and len(self.buckets[key]) < self.capacity
+
+    def _next_batch(self):
+        """Batch of the next bucket in turn that is not full, or None"""
+        keys = list(self.buckets)
+        for offset in range(len(keys)):
+            key = keys[(self._turn + offset) % len(keys)]
+            if self._needs_deals(key):
+                self._turn = (self._turn + offset + 1) % len(keys)
+                self._in_flight.add(key)
+                return (key, self.batch_size, self.rng.getrandbits(32))
+        return None
+
+    def _add_batch(self, key: BucketKey, deals, steps: int, elapsed: float):
+        with self._condition:
+            self._in_flight.discard(key)
+            bucket, stats = self.buckets[key], self.stats[key]
+            bucket.extend(deals[: self.capacity - len(bucket)])
+            stats.generated += len(deals)
+            stats.attempts += self.batch_size
+            stats.swaps += steps
+            stats.generation_time += elapsed
+
+    def _fail_batch(self, key: BucketKey, error: Exception):
+        with self._condition:
+            self._in_flight.discard(key)
+            stats = self.stats[key]
+            stats.failures += 1
+            stats.last_error = f"{type(error).__name__}: {error}"
+
+    def _run_batch(self, batch):
+        try:
+            result = _generate_batch(batch)
+        except Exception as error:
+            self._fail_batch(batch[0], error)
+        else:
+            self._add_batch(batch[0], *result)
+
+    def _fill(self):
+        running: Dict[Future, BucketKey] = {}
+        while True:
+            with self._condition:
+                if self._closed:
+                    return
+                n_slots = max(self.workers, 1) - len(running)
+                batches = [self._next_batch() for _ in range(n_slots)]
+                batches = [batch for batch in batches if batch is not None]
+                if not batches and not running:
+                    self._condition.wait()
+                    continue
+            if self._executor is None:
+                for batch in batches:
+                    self._run_batch(batch)
+                continue
+            for batch in batches:
+                running[self._executor.submit(_generate_batch, batch)] = batch[0]
+            finished, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as error:
+                    # A failed batch (or a broken pool) is recorded, the rest of the buckets keep filling
+                    self._fail_batch(key, error)
+                else:
+                    self._add_batch(key, *result)
+
+    def report(self):
+        """One line per bucket with its hit rate and generation throughput"""
+        with self._condition:
+            lines = []
+            for (game_class, n, m, difficulty), stats in self.stats.items():
+                bucket = self.buckets[(game_class, n, m, difficulty)]
+                line = (
+                    f"{game_class.__name__} AG({n},{m}) difficulty {difficulty}: "
+                    f"{len(bucket)}/{self.capacity} deals, hit rate {stats.hit_rate:.0%} "
+                    f"({stats.hits}/{stats.requests}), {stats.deals_per_sec:.1f} deals/s, "
+                    f"success rate {stats.success_rate:.0%}"
+                )
+                if stats.failures:
+                    line += f", {stats.failures} failed batches ({stats.last_error})"
+                lines.append(line)
+            return "\n".join(lines)
+
+    def close(self):
+        """Stops the filler thread and the processes, without waiting for the pending batches"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
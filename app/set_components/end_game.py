@@ -1,5 +1,6 @@
-from typing import Tuple
+from typing import FrozenSet, Tuple
 from .set_game import SETGame
+from . import mod_vector as mv
 
 from .game_settings import *
 
@@ -8,7 +9,9 @@ class EndGame(SETGame):
     """
     SETGame implements the logic for a solitary game of SET.
     - end_guess_score: The score gained if the hold card is guessed.
-    - hold_card
+    - hold_card: The card held out of the deck, to be guessed at the end of the game.
+    - table_sum: Running sum of the cards on the table. Every SET played sums to zero and so do all the cards, so
+        once the deck is exhausted the hold card is minus the sum of the table.
     """
     def __init__(
         self,
@@ -16,10 +19,23 @@ class EndGame(SETGame):
         n_attribute_values: int,
         set_score: int = 300,
         end_guess_score: int = 500,
+        packed: bool = True,
+        seed: int = None,
+        refill_policy: str = REFILL_AT_LEAST,
+        refill_sets: int = 1,
     ):
-        super().__init__(n_attributes, n_attribute_values, set_score)
+        super().__init__(
+            n_attributes,
+            n_attribute_values,
+            set_score,
+            packed,
+            seed,
+            refill_policy,
+            refill_sets,
+        )
         self.end_guess_score = end_guess_score
         self.hold_card = None
+        self.table_sum = (0,) * n_attributes
 
     @property
     def max_score(self):
@@ -28,23 +44,46 @@ class EndGame(SETGame):
     def start_game(self):
         """Start the game of SET and hold one card"""
         super().start_game()
-        self.hold_card = next(card for card in self.rem_cards)
-        self.rem_cards = self.rem_cards.difference((self.hold_card,))
+        self.hold_card = self.deck.draw(1)[0]
         self.modify_game_state()
 
+    def _table_changed(
+        self, removed: FrozenSet[Tuple[int]], added: FrozenSet[Tuple[int]]
+    ):
+        m = self.n_attribute_values
+        for card in removed:
+            self.table_sum = mv.mod_substraction(self.table_sum, card, m)
+        for card in added:
+            self.table_sum = mv.mod_addition(self.table_sum, card, m)
+
     def hold_card_remaining(self):
         return self.hold_card is not None
 
+    def deduce_hold_card(self):
+        """The hold card, deduced in O(n) from the table once the deck is exhausted, else None"""
+        if len(self.deck) or not self.hold_card_remaining():
+            return None
+        return mv.mod_product(self.table_sum, -1, self.n_attribute_values)
+
+    def _place_hold_card(self):
+        """Moves the hold card to the table and returns it"""
+        hold_card = self.hold_card
+        self.table_cards = self.table_cards.union((hold_card,))
+        self.hold_card = None
+        return hold_card
+
+    def reveal_hold_card(self):
+        """Places the hold card on the table without scoring it, and returns it"""
+        return self._place_hold_card()
+
     def guess_hold_card(self, card_guess: Tuple[int]):
         if (
-            not super().is_game_end() or card_guess != self.hold_card
+            not super().is_game_end() or card_guess != self.deduce_hold_card()
         ):  # Check its the game end state from the game of SET
             self.add_score(-int(self.end_guess_score / 2))
             self.modify_game_state(message=NOT_HOLD)
             return False
         self.modify_game_state(message=IS_HOLD)
         self.add_score(self.end_guess_score)
-        hold_card = self.hold_card
-        self.table_cards = self.table_cards.union((hold_card,))
-        self.hold_card = None
+        self._place_hold_card()
         return True
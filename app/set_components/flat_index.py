@@ -0,0 +1,211 @@
+"""
+    Module for the enumeration and index of the k-flats of AG(n, m) (lines, planes, hyperplanes...).
+    Each k-flat is p + W, where W is a k-dimensional subspace. W is identified by its reduced row echelon basis and p
+    by its reduction over that basis, which is zero at the pivot columns, so every flat has a canonical id:
+    direction_id * m^(n - k) + coset_id, where direction_id is the position of W in reduced_bases and coset_id is the
+    base m number formed by the non pivot coordinates of the reduced point p.
+"""
+from functools import lru_cache
+from itertools import combinations, product
+from typing import Dict, FrozenSet, Iterable, List, Tuple
+import numpy as np
+
+from . import mod_vector as mv
+from .card_encoding import CardEncoding, card_encoding
+
+
+def gaussian_binomial(n: int, k: int, q: int):
+    """Gaussian binomial coefficient [n, k]_q, the number of k-dimensional subspaces of (Zq)^n"""
+    if k < 0 or k > n:
+        return 0
+    numerator, denominator = 1, 1
+    for i in range(k):
+        numerator *= q ** (n - i) - 1
+        denominator *= q ** (i + 1) - 1
+    return numerator // denominator
+
+
+def count_flats(n: int, m: int, k: int):
+    """Number of k-flats of AG(n, m), without enumerating them"""
+    return m ** (n - k) * gaussian_binomial(n, k, m)
+
+
+def count_flats_through_point(n: int, m: int, k: int):
+    """Number of k-flats of AG(n, m) that go through a given point"""
+    return gaussian_binomial(n, k, m)
+
+
+def reduced_bases(n: int, m: int, k: int):
+    """Yields the reduced row echelon basis of every k-dimensional subspace of (Zm)^n, in canonical order"""
+    for pivots in combinations(range(n), k):
+        free_columns = [
+            [j for j in range(pivot + 1, n) if j not in pivots] for pivot in pivots
+        ]
+        n_free = sum(len(columns) for columns in free_columns)
+        for values in product(range(m), repeat=n_free):
+            values = iter(values)
+            rows = []
+            for pivot, columns in zip(pivots, free_columns):
+                row = [0] * n
+                row[pivot] = 1
+                for j in columns:
+                    row[j] = next(values)
+                rows.append(tuple(row))
+            yield tuple(rows)
+
+
+def _pivots(direction: Tuple[Tuple[int]]):
+    return [row.index(1) for row in direction]
+
+
+def coset_id(point: Iterable[int], direction: Tuple[Tuple[int]], m: int):
+    """Coset id of the flat parallel to direction that contains the point"""
+    point = list(point)
+    pivots = _pivots(direction)
+    for row, pivot in zip(direction, pivots):
+        c = point[pivot]
+        if c:
+            point = [(pi - c * ri) % m for pi, ri in zip(point, row)]
+    coset = 0
+    for j in reversed([j for j in range(len(point)) if j not in pivots]):
+        coset = coset * m + point[j]
+    return coset
+
+
+def coset_point(coset: int, direction: Tuple[Tuple[int]], n: int, m: int):
+    """Reduced base point of the flat parallel to direction with the coset id passed"""
+    point = [0] * n
+    pivots = _pivots(direction)
+    for j in (j for j in range(n) if j not in pivots):
+        coset, point[j] = divmod(coset, m)
+    return tuple(point)
+
+
+def flat_points(direction: Tuple[Tuple[int]], point: Iterable[int], m: int):
+    """Points of the flat point + span(direction), as an array with shape (m^k, n)"""
+    return mv.generate_mod_affine_space_batch(point, direction, m)
+
+
+def iter_flats(n: int, m: int, k: int):
+    """
+    Lazily yields every k-flat of AG(n, m) in canonical order. No point set is built, the points of a flat can be
+    obtained with flat_points.
+    Result: (flat_id, direction, reduced base point)
+    """
+    n_cosets = m ** (n - k)
+    for direction_id, direction in enumerate(reduced_bases(n, m, k)):
+        for coset in range(n_cosets):
+            yield direction_id * n_cosets + coset, direction, coset_point(
+                coset, direction, n, m
+            )
+
+
+def iter_flats_meeting(n: int, m: int, k: int, cards: Iterable[Tuple[int]]):
+    """
+    Lazily yields every k-flat of AG(n, m) that contains at least one of the cards. For each direction, the cards
+    are reduced over its basis all at once, and grouped by their coset id.
+    Result: (flat_id, cards of the flat), in canonical flat order.
+    """
+    cards = list(cards)
+    if not cards:
+        return
+    points = np.asarray(cards, dtype=np.int64).reshape(len(cards), n)
+    n_cosets = m ** (n - k)
+    for direction_id, direction in enumerate(reduced_bases(n, m, k)):
+        pivots = _pivots(direction)
+        reduced = points
+        for row, pivot in zip(direction, pivots):
+            reduced = mv.mod_substraction_batch(
+                reduced, reduced[:, pivot, None] * np.asarray(row), m
+            )
+        non_pivots = [j for j in range(n) if j not in pivots]
+        cosets = reduced[:, non_pivots] @ (m ** np.arange(len(non_pivots)))
+        flats: Dict[int, List[Tuple[int]]] = {}
+        for coset, card in zip(cosets.tolist(), cards):
+            flats.setdefault(coset, []).append(card)
+        for coset in sorted(flats):
+            yield direction_id * n_cosets + coset, tuple(flats[coset])
+
+
+class FlatIndex:
+    """
+    FlatIndex holds the canonical ids of the k-flats of AG(n, m) over the packed card ids of CardEncoding.
+        - encoding: The CardEncoding of the cards.
+        - k: Dimension of the flats.
+        - directions: Reduced basis of every direction subspace W.
+        - n_cosets: Number of flats parallel to each direction, m^(n - k).
+        - n_flats: Number of k-flats of the affine space.
+    """
+
+    def __init__(self, encoding: CardEncoding, k: int):
+        self.encoding = encoding
+        self.k = k
+        self.n_attributes = encoding.n_attributes
+        self.n_attribute_values = encoding.n_attribute_values
+        self.directions: List[Tuple[Tuple[int]]] = list(
+            reduced_bases(self.n_attributes, self.n_attribute_values, k)
+        )
+        self.direction_ids: Dict[Tuple[Tuple[int]], int] = {
+            direction: idx for idx, direction in enumerate(self.directions)
+        }
+        self.n_cosets = self.n_attribute_values ** (self.n_attributes - k)
+        self.n_flats = count_flats(self.n_attributes, self.n_attribute_values, k)
+        self._flat_cards: Dict[int, FrozenSet[int]] = {}
+        # Memoized flat_of, meant to be keyed by the first k + 1 affinely independent cards of a selection
+        self.lookup = lru_cache(maxsize=1 << 16)(self.flat_of)
+
+    def __reduce__(self):
+        """Pickled as a reference to the shared FlatIndex of the receiving process"""
+        return flat_index, (self.n_attributes, self.n_attribute_values, self.k)
+
+    def flat_of(self, card_ids: Iterable[int]):
+        """
+        Id of the flat spanned by the cards. Returns None if the cards span a flat of a different dimension.
+        Only the first k + 1 affinely independent cards are used to find the flat.
+        """
+        card_ids = tuple(card_ids)
+        if not card_ids:
+            return None
+        cards, m = self.encoding.cards, self.n_attribute_values
+        p0 = cards[card_ids[0]]
+        echelon = mv.ModEchelonBasis(self.n_attributes, m)
+        for card_id in card_ids[1:]:
+            echelon.add(mv.mod_substraction(cards[card_id], p0, m))
+            if echelon.rank == self.k:
+                break
+        if echelon.rank != self.k:
+            return None
+        direction = echelon.reduced_basis()
+        return self.direction_ids[direction] * self.n_cosets + coset_id(p0, direction, m)
+
+    def cards_of(self, flat_id: int):
+        """Card ids of a flat. The cards are generated on the first request and then kept."""
+        if flat_id not in self._flat_cards:
+            direction_id, coset = divmod(flat_id, self.n_cosets)
+            direction = self.directions[direction_id]
+            n, m = self.n_attributes, self.n_attribute_values
+            points = flat_points(direction, coset_point(coset, direction, n, m), m)
+            powers = self.n_attribute_values ** np.arange(self.n_attributes)
+            self._flat_cards[flat_id] = frozenset((points @ powers).tolist())
+        return self._flat_cards[flat_id]
+
+    def contains(self, flat_id: int, card_ids: Iterable[int]):
+        """Checks if all the cards belong to the flat"""
+        return self.cards_of(flat_id).issuperset(card_ids)
+
+    def flats_meeting(self, card_ids: Iterable[int]):
+        """
+        Lazily yields every flat that contains at least one of the cards.
+        Result: (flat_id, card ids of the flat)
+        """
+        encode_all, decode_all = self.encoding.encode_all, self.encoding.decode_all
+        for flat_id, cards in iter_flats_meeting(
+            self.n_attributes, self.n_attribute_values, self.k, decode_all(card_ids)
+        ):
+            yield flat_id, encode_all(cards)
+
+
+@lru_cache(maxsize=None)
+def flat_index(n_attributes: int, n_attribute_values: int, k: int):
+    """Shared FlatIndex of the k-flats of AG(n, m), built once per process"""
+    return FlatIndex(card_encoding(n_attributes, n_attribute_values), k)
@@ -11,10 +11,37 @@ IS_HOLD = "Correct guess!\n"
 IS_COMET = "Comet found!\n"
 IS_PLANET = "Planet found!\n"
 
+# Game events
+SCORE_EVENT = "score"
+STATE_EVENT = "game_state"
+SELECTION_EVENT = "selection"
+TABLE_EVENT = "table"
+
+# Card structures
+NO_STRUCTURE = "none"
+LINE_STRUCTURE = "line"
+PLANE_SUBSET = "plane_subset"
+PLANE_STRUCTURE = "plane"
+FLAT_STRUCTURE = "flat"
+
+# Structures that grade the difficulty of a deal
+SETS_GRADE = "sets"
+INTERSETS_GRADE = "intersets"
+PLANETS_GRADE = "planets"
+
 # Button States
 SET = "SET!"
 PLANET = "PLANET!"
 COMET = "COMET!"
+# Refill policies
+REFILL_UNIFORM = "uniform"
+REFILL_AT_LEAST = "at_least"
+REFILL_EXACTLY = "exactly"
+REFILL_POLICIES = (REFILL_UNIFORM, REFILL_AT_LEAST, REFILL_EXACTLY)
+
 # Game Attributes
 N_ATTRIBUTES = (2, 3, 4)
 N_ATTRIBUTE_VALUES = (3, 5)
+# Large geometries, played with a StreamingDeck
+STREAM_ATTRIBUTES = (2, 3, 4, 5, 6, 7, 8)
+STREAM_ATTRIBUTE_VALUES = (3, 5, 7, 11)
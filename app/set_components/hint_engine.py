@@ -0,0 +1,64 @@
+"""
+    Module for the background analysis of the table of a game, so hints can be answered without blocking the
+    thread of the interface.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import FrozenSet, Iterable, Tuple
+
+from .set_deck import SETDeck
+from .table_analysis import TableAnalysis
+
+
+class HintEngine:
+    """
+    HintEngine computes the valid moves of the table of a game in a worker thread, each time the table is
+    refreshed. The moves are read from the shared TableAnalysis of the table, so a table already analysed by
+    another consumer is free, and otherwise they are updated from the previous table (SETDeck.update_moves).
+        - game: The game whose table is analysed.
+    """
+
+    def __init__(self, game: SETDeck):
+        self.game = game
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._table: FrozenSet[Tuple[int]] = None
+        self._future: Future = None
+        # Last analysis, only used from the worker thread
+        self._analysis: TableAnalysis = None
+
+    def _analyse(self, analysis: TableAnalysis):
+        if self._analysis is None:
+            moves = analysis.moves
+        else:
+            moves = analysis.moves_from(self._analysis)
+        self._analysis = analysis
+        return moves
+
+    def refresh(self):
+        """Starts the analysis of the current table of the game, if it changed since the last refresh"""
+        table = self.game.table_cards
+        if table == self._table:
+            return
+        self._table = table
+        self._future = self._executor.submit(self._analyse, self.game.analysis())
+
+    def ready(self):
+        """Checks if the analysis of the last refreshed table has finished"""
+        return self._future is not None and self._future.done()
+
+    def moves(self, timeout: float = None):
+        """Valid moves of the last refreshed table, waiting for up to timeout seconds for the analysis"""
+        if self._future is None:
+            self.refresh()
+        return self._future.result(timeout)
+
+    def hint(self, selected: Iterable[Tuple[int]] = (), timeout: float = None):
+        """A valid move that contains the selected cards if there is one, else any valid move, or None"""
+        moves = self.moves(timeout)
+        selected = frozenset(selected)
+        matching = [move for move in moves if selected <= move]
+        candidates = matching or moves
+        return min(candidates, key=sorted) if candidates else None
+
+    def shutdown(self):
+        """Stops the worker thread, without waiting for the pending analysis"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
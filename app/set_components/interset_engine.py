@@ -0,0 +1,53 @@
+"""
+    Module for the search of intersets over the packed card ids. An interset is a group of at least two SETs
+    that meet at a single card, the intersection card, which is not within the cards while the rest of the cards
+    of each SET are.
+"""
+from typing import Dict, Iterable, List
+
+from .line_index import LineIndex
+
+
+def _partial_lines(lines: LineIndex, card_ids: Iterable[int]):
+    """
+    Yields once every line with exactly m - 1 of its cards within card_ids, together with its missing card.
+    Result: (missing card id, line id)
+    """
+    card_ids = sorted(frozenset(card_ids))
+    card_lookup = frozenset(card_ids)
+    pair_lines, size = lines.pair_lines, lines.size
+    seen_lines = set()
+    for idx, c1 in enumerate(card_ids):
+        for c2 in card_ids[idx + 1 :]:
+            line_id = pair_lines[c1 * size + c2]
+            if line_id in seen_lines:
+                continue
+            seen_lines.add(line_id)
+            missing = [c for c in lines.cards_of(line_id) if c not in card_lookup]
+            if len(missing) == 1:
+                yield missing[0], line_id
+
+
+def all_intersets(lines: LineIndex, card_ids: Iterable[int]):
+    """
+    Obtains all the intersets contained within card_ids.
+    Result: ((intersection card id, (line id, ...)), ...), where each line is one of the SETs of the interset.
+    """
+    intersets: Dict[int, List[int]] = {}
+    for int_card, line_id in _partial_lines(lines, card_ids):
+        intersets.setdefault(int_card, []).append(line_id)
+    return tuple(
+        (int_card, tuple(line_ids))
+        for int_card, line_ids in intersets.items()
+        if len(line_ids) > 1
+    )
+
+
+def has_interset(lines: LineIndex, card_ids: Iterable[int]):
+    """Checks if there is at least one interset within card_ids, stopping at the first one found"""
+    int_cards = set()
+    for int_card, _ in _partial_lines(lines, card_ids):
+        if int_card in int_cards:
+            return True
+        int_cards.add(int_card)
+    return False
@@ -1,15 +1,21 @@
-from random import sample
-from typing import Tuple
+from typing import Iterable, Tuple
 
 from .set_deck import SETDeck
 from .game_settings import *
 
 
 class IntersetGame(SETDeck):
+    deal_structure = INTERSETS_GRADE
+
     def __init__(
-        self, n_attributes: int, n_attribute_values: int, interset_score: int = 400
+        self,
+        n_attributes: int,
+        n_attribute_values: int,
+        interset_score: int = 400,
+        packed: bool = True,
+        seed: int = None,
     ):
-        super().__init__(n_attributes, n_attribute_values)
+        super().__init__(n_attributes, n_attribute_values, packed, seed)
         self.interset_score = interset_score
 
     @property
@@ -22,7 +28,7 @@ class IntersetGame(SETDeck):
     def check_table(self):
         """Checks the table for intersets, returns True if there is at least one"""
         return (
-            len(self.table_cards) == 0 or len(self.all_intersets(self.table_cards)) >= 1
+            len(self.table_cards) == 0 or self.has_interset(self.table_cards)
         )
 
     def is_valid_selection(self, num_cards: int):
@@ -33,10 +39,10 @@ class IntersetGame(SETDeck):
 
     def start_game(self):
         """Start the game of Interset"""
-        self.table_cards = frozenset(sample(tuple(self.deck_cards), self.table_size))
-        self.rem_cards = self.deck_cards - self.table_cards
-        if self.score:
-            self.score.set(0)
+        self.deck.reset(self.deck_cards)
+        if not self._deal_from_pool():
+            self.table_cards = self.deck.draw(self.table_size)
+        self.update_score(0)
         self.modify_game_state()
 
     def play_round(self, cards: Tuple[int]):
@@ -44,19 +50,25 @@ class IntersetGame(SETDeck):
         Play a round of the Game of interset, where the cards must be either a single interset,
         or a double or a triple, with the same intersection card.
         """
-        intersets = self.all_intersets(cards) if cards <= self.table_cards else None
+        intersets = self.all_intersets(cards) if self.on_table(cards) else None
         if intersets is None or len(intersets) != 1:
             self.modify_game_state(message=NOT_INTERSET)
             self.add_score(-int(self.interset_score / 2))
             return None
         interset = intersets[0]
         self.add_score(len(interset[1]) * self.interset_score)
-        refill_cards = min(len(self.rem_cards), len(cards))
-        new_cards = frozenset(sample(tuple(self.rem_cards), refill_cards))
-        self.rem_cards = self.rem_cards - new_cards
+        new_cards = frozenset(self.deck.draw(len(cards)))
         self.table_cards = self.table_cards.difference(cards) | new_cards
         self.modify_game_state(message=IS_INTERSET)
         return new_cards
 
+    def moves(self, cards: Iterable[Tuple[int]]):
+        """Each move joins all the SETs of an interset, if they do not form a second interset"""
+        moves = (
+            frozenset().union(*interset_l)
+            for _, interset_l in self.all_intersets(cards)
+        )
+        return tuple(move for move in moves if len(self.all_intersets(move)) == 1)
+
     def is_game_end(self):
-        return len(self.rem_cards) == 0 and not self.check_table()
+        return len(self.deck) == 0 and not self.check_table()
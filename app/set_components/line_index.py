@@ -0,0 +1,104 @@
+"""
+    Module for the precomputed index of all the lines (SETs) of AG(n, m).
+    The index is built lazily once per (n, m) and shared by every game of the process.
+"""
+from array import array
+from functools import lru_cache
+from typing import Iterable
+
+from .card_encoding import CardEncoding, card_encoding
+from .card_set import CardSet
+
+
+class LineIndex:
+    """
+    LineIndex holds every line of AG(n, m) over the packed card ids of CardEncoding. Lines are numbered in
+    lexicographic order of their sorted card ids.
+        - encoding: The CardEncoding of the cards.
+        - n_lines: Number of lines of the affine space.
+        - lines_per_card: Number of lines that go through each card, (m^n - 1) / (m - 1).
+        - pair_lines: Flat table with the line id of every pair of different cards, indexed by a * size + b.
+        - line_cards: Flat table with the sorted card ids of every line, indexed by line * m.
+        - card_lines: Flat table with the line ids through every card, indexed by card * lines_per_card.
+        - line_masks: Bitmask of the cards of every line, built on first use.
+    """
+
+    def __init__(self, encoding: CardEncoding):
+        self.encoding = encoding
+        self.size = encoding.size
+        self.n_attribute_values = encoding.n_attribute_values
+        self.lines_per_card = (self.size - 1) // (self.n_attribute_values - 1)
+        self.n_lines = self.size * self.lines_per_card // self.n_attribute_values
+        self._line_masks = None
+        self._generate_index()
+
+    def _generate_index(self):
+        """Obtains every line from the first pair of cards of the line that has not been indexed yet"""
+        size, m = self.size, self.n_attribute_values
+        typecode = "H" if self.n_lines < 1 << 16 else "I"
+        no_line = self.n_lines
+        pair_lines = array(typecode, [no_line]) * (size * size)
+        line_cards = array(typecode)
+        card_lines = [[] for _ in range(size)]
+        for a in range(size):
+            for b in range(a + 1, size):
+                if pair_lines[a * size + b] != no_line:
+                    continue
+                line_id = len(line_cards) // m
+                line = sorted((a, b, *self.encoding.complete_line(a, b)))
+                line_cards.extend(line)
+                for c1 in line:
+                    card_lines[c1].append(line_id)
+                    for c2 in line:
+                        if c1 != c2:
+                            pair_lines[c1 * size + c2] = line_id
+        self.pair_lines = pair_lines
+        self.line_cards = line_cards
+        self.card_lines = array(
+            typecode, (line_id for lines in card_lines for line_id in lines)
+        )
+
+    def __reduce__(self):
+        """Pickled as a reference to the shared LineIndex of the receiving process"""
+        return line_index, (self.encoding.n_attributes, self.n_attribute_values)
+
+    @property
+    def line_masks(self):
+        if self._line_masks is None:
+            self._line_masks = tuple(
+                CardSet.from_ids(self.cards_of(line_id)).mask
+                for line_id in range(self.n_lines)
+            )
+        return self._line_masks
+
+    def line_of(self, a: int, b: int):
+        """Line id of the line through the different cards a and b"""
+        return self.pair_lines[a * self.size + b]
+
+    def cards_of(self, line_id: int):
+        """Sorted card ids of a line"""
+        m = self.n_attribute_values
+        return tuple(self.line_cards[line_id * m : (line_id + 1) * m])
+
+    def lines_through(self, card_id: int):
+        """Line ids of every line through a card"""
+        r = self.lines_per_card
+        return tuple(self.card_lines[card_id * r : (card_id + 1) * r])
+
+    def complete_line(self, a: int, b: int):
+        """Card ids of the remaining cards of the line through the cards a and b"""
+        return tuple(c for c in self.cards_of(self.line_of(a, b)) if c != a and c != b)
+
+    def is_line(self, card_ids: Iterable[int]):
+        """Checks if the card ids passed are a line of the affine space"""
+        card_ids = frozenset(card_ids)
+        if len(card_ids) != self.n_attribute_values:
+            return False
+        a, b = tuple(card_ids)[0:2]
+        return card_ids.issuperset(self.cards_of(self.line_of(a, b)))
+
+
+@lru_cache(maxsize=None)
+def line_index(n_attributes: int, n_attribute_values: int):
+    """Shared LineIndex for AG(n, m), built once per process"""
+    return LineIndex(card_encoding(n_attributes, n_attribute_values))
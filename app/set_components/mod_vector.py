@@ -3,7 +3,6 @@
 """
 from typing import Tuple, Iterable, List
 import numpy as np
-import sympy as sm
 
 
 def mod_addition(x: Tuple[int], y: Tuple[int], m: int):
@@ -29,16 +28,107 @@ def mod_product(x: Tuple[int], k: int, m: int):
     return tuple((k * xi) % m for xi in x)
 
 
+def mod_addition_batch(x: np.ndarray, y: np.ndarray, m: int):
+    """Modular addition of two arrays of vectors, with shape (N, n) or broadcastable to it"""
+    return np.mod(np.add(x, y), m)
+
+
+def mod_substraction_batch(x: np.ndarray, y: np.ndarray, m: int):
+    """Modular substraction of two arrays of vectors, with shape (N, n) or broadcastable to it"""
+    return np.mod(np.subtract(x, y), m)
+
+
+def mod_product_batch(x: np.ndarray, k, m: int):
+    """
+    Modular scalar product of an array of vectors, x, with shape (N, n). k can either be a single value or an array
+    of N values, one per vector.
+    """
+    k = np.asarray(k)
+    if k.ndim == 1:
+        k = k[:, None]
+    return np.mod(k * np.asarray(x), m)
+
+
+def mod_mult_addition_batch(x: np.ndarray, m: int, axis: int = -2):
+    """Modular addition of multiple vectors, summing over the axis of the vectors"""
+    return np.mod(np.sum(x, axis=axis), m)
+
+
+def is_zero_batch(x: np.ndarray):
+    """Checks which vectors of the array, x, with shape (N, n) are zero"""
+    return ~np.any(x, axis=-1)
+
+
 def is_zero(x: Tuple[int]):
     """Checks if the vector x is zero."""
     return all(xi == 0 for xi in x)
 
 
-def is_linear_indepent(v: Iterable):
-    """Checks that the list of vectors, v, passed is linearly independent"""
-    matrix = np.matrix(v)
-    _, inds = sm.Matrix(matrix).T.rref()
-    return len(inds) == len(v)
+class ModEchelonBasis:
+    """
+    Incremental row echelon basis over the field Zm (m prime). The rows are kept in reduced row echelon form, so
+    adding a vector costs O(r * n) integer operations, where r is the current rank.
+        - n: Dimension of the vectors.
+        - m: Order of the field (prime number).
+        - rows: Rows of the basis in reduced row echelon form, with their pivot value equal to 1.
+        - pivots: Pivot column of each row.
+    """
+
+    def __init__(self, n: int, m: int):
+        self.n = n
+        self.m = m
+        self.rows: List[List[int]] = []
+        self.pivots: List[int] = []
+
+    @property
+    def rank(self):
+        return len(self.rows)
+
+    def reduce(self, v: Iterable[int]):
+        """Reduces the vector v by the rows of the basis. The result is zero if v is in the span of the basis."""
+        m = self.m
+        v = [int(vi) % m for vi in v]
+        for row, pivot in zip(self.rows, self.pivots):
+            c = v[pivot]
+            if c:
+                v = [(vi - c * ri) % m for vi, ri in zip(v, row)]
+        return v
+
+    def contains(self, v: Iterable[int]):
+        """Checks if the vector v is in the span of the basis"""
+        return is_zero(self.reduce(v))
+
+    def add(self, v: Iterable[int]):
+        """Adds the vector v to the basis. Returns False if v was linearly dependent of the basis."""
+        m = self.m
+        v = self.reduce(v)
+        pivot = next((k for k, vi in enumerate(v) if vi), None)
+        if pivot is None:
+            return False
+        inv = pow(v[pivot], -1, m)
+        v = [(vi * inv) % m for vi in v]
+        # Eliminate the new pivot column from the rest of the rows
+        for idx, row in enumerate(self.rows):
+            c = row[pivot]
+            if c:
+                self.rows[idx] = [(ri - c * vi) % m for ri, vi in zip(row, v)]
+        pos = next((k for k, p in enumerate(self.pivots) if p > pivot), self.rank)
+        self.rows.insert(pos, v)
+        self.pivots.insert(pos, pivot)
+        return True
+
+    def reduced_basis(self):
+        """Canonical representation of the subspace spanned by the basis"""
+        return tuple(tuple(row) for row in self.rows)
+
+
+def is_linear_indepent(v: Iterable, m: int):
+    """Checks that the list of vectors, v, passed is linearly independent in (Zm)^n"""
+    v = tuple(v)
+    if not v:
+        return True
+    basis = ModEchelonBasis(len(v[0]), m)
+    return all(basis.add(vi) for vi in v)
 
 
 def cartesian_reference(n: int):
@@ -55,17 +145,31 @@ def cartesian_reference(n: int):
         point[k] = 0
     return reference[0], reference[1:]
 
+def generate_mod_affine_space_batch(p0, base: Iterable, m: int):
+    """
+    Generate all the points in an affine finite space of order m, centered at p0 and the group of vectors, base.
+    Result: Array with shape (m^k, n), where k is the number of vectors in the base.
+    """
+    points = np.asarray(p0, dtype=np.int64).reshape(1, -1)
+    k_values = np.arange(m, dtype=np.int64)[:, None]
+    # Add m - 1 new copies of the points every iteration, by adding the multiples of the vector v_k from the base
+    for ei in base:
+        vk = mod_product_batch(np.asarray(ei, dtype=np.int64)[None, :], k_values, m)
+        points = mod_addition_batch(vk[:, None, :], points[None, :, :], m).reshape(
+            -1, points.shape[1]
+        )
+    return points
+
+
 def generate_mod_affine_space(p0, base: Iterable, m: int):
     """Generate all the points in an affine finite space of order m, centered at p0 and the group of vectors, base"""
-    affine_space = [tuple(p0)]
-    new_points = []
-    # Add new points every iteration, by adding the vector v_k from the vector base
-    for ei in base:
-        for vk in (mod_product(ei, k, m) for k in range(1, m)):
-            new_points.extend((mod_addition(p, vk, m) for p in affine_space))
-        affine_space.extend(new_points)
-        new_points = []
-    return affine_space
+    return [tuple(p) for p in generate_mod_affine_space_batch(p0, base, m).tolist()]
+
+def simple_affine_space_gen_batch(n: int, m: int):
+    """Generate all the points for an affine finite space AG(n, m) as an array with shape (m^n, n)"""
+    p0, base = cartesian_reference(n)
+    return generate_mod_affine_space_batch(p0, base, m)
+
 
 def simple_affine_space_gen(n: int, m: int):
     """Generate all the points for an affine finite space AG(n, m)"""
@@ -76,15 +180,14 @@ def simple_affine_space_gen(n: int, m: int):
 def affine_to_cartesian(affine_reference: List[Tuple[int]], m: int):
     """Transforms an affine reference of points into a cartesian reference."""
     p0 = affine_reference[0]
-    vector = (mod_substraction(p, p0, m) for p in affine_reference[1:])
-    vector = [v for v in vector if not is_zero(v)]
-    if not vector:
-        return p0, []
-    base = [vector[0]]
-    for vi in vector[1:]:
-        new_base = base + [vi]
-        if is_linear_indepent(new_base):
-            base = new_base
+    echelon = ModEchelonBasis(len(p0), m)
+    base = []
+    for p in affine_reference[1:]:
+        vi = mod_substraction(p, p0, m)
+        if echelon.add(vi):
+            base.append(vi)
+            if echelon.rank == echelon.n:
+                break
     return p0, base
 
 
@@ -103,7 +206,11 @@ def generate_affine_space_structure(affine_reference: Iterable[Tuple[int]], m: i
     """
     Generates an affine finite space from the reference provided with the structure defined in lines, planes, hyperplanes.
     """
-    p0, base = affine_to_cartesian(tuple(affine_reference), m)
+    return affine_space_structure(*affine_to_cartesian(tuple(affine_reference), m), m)
+
+
+def affine_space_structure(p0: Tuple[int], base: Iterable[Tuple[int]], m: int):
+    """Points of the affine space p0 + <base>, nested in lines, planes, hyperplanes... one level per base vector"""
     points = p0
     if not base:
         return points
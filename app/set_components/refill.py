@@ -0,0 +1,102 @@
+"""
+    Module for the refill of the table from the deck, over the packed card ids and the shared LineIndex.
+    With t cards on the table, r = (m^n - 1) / (m - 1) lines through each card and d cards in the deck:
+        - find_completing_line: O(t * r) bitmask operations to complete a line through the table, usually max_tries.
+        - find_deck_line: O(d) plus O(r) bitmask operations per deck card tried, for a line made only of deck cards
+            (bounded by max_tries).
+        - Both of them can only take exclusive lines, whose cards complete no other SET with the table, which
+            costs O(m * r) bitmask operations per line checked.
+        - creates_set: O(t), from the pair counts of TableLines.
+"""
+from random import Random
+
+from .card_set import CardSet
+from .line_index import LineIndex
+from .table_lines import TableLines
+
+
+def is_exclusive(lines: LineIndex, table_mask: int, line_mask: int):
+    """Checks that adding the cards of the line to the table completes no SET but the line itself"""
+    line_masks = lines.line_masks
+    new_table = table_mask | line_mask
+    for card_id in CardSet(line_mask & ~table_mask):
+        for line_id in lines.lines_through(card_id):
+            other_mask = line_masks[line_id]
+            if other_mask != line_mask and other_mask & ~new_table == 0:
+                return False
+    return True
+
+
+def find_completing_line(
+    lines: LineIndex,
+    table_mask: int,
+    available_mask: int,
+    free_slots: int,
+    rng: Random,
+    max_tries: int = 32,
+    exclusive: bool = False,
+):
+    """
+    Finds a random line through the table cards, not yet complete on the table, whose missing cards are all
+    available (in the deck) and fit in the free slots of the table. Cards are passed as CardSet bitmasks.
+    With exclusive, the missing cards must not complete any other SET with the table.
+    Result: The card ids to add to the table, or None if there is no such line.
+    """
+    line_masks = lines.line_masks
+    line_ids = set()
+    for card_id in CardSet(table_mask):
+        line_ids.update(lines.lines_through(card_id))
+    if not line_ids:
+        return None
+    line_ids = sorted(line_ids)
+
+    def completion(line_id: int):
+        missing = line_masks[line_id] & ~table_mask
+        if missing and missing & ~available_mask == 0 and missing.bit_count() <= free_slots:
+            if not exclusive or is_exclusive(lines, table_mask, line_masks[line_id]):
+                return missing
+        return 0
+
+    # Rejection sampling is uniform among the valid lines, the full scan only runs when they are scarce
+    for _ in range(max_tries):
+        missing = completion(rng.choice(line_ids))
+        if missing:
+            return tuple(CardSet(missing))
+    candidates = [missing for missing in map(completion, line_ids) if missing]
+    return tuple(CardSet(rng.choice(candidates))) if candidates else None
+
+
+def find_deck_line(
+    lines: LineIndex,
+    deck_mask: int,
+    rng: Random,
+    max_tries: int = 64,
+    table_mask: int = None,
+):
+    """
+    Finds a random line with all its cards in the deck, through up to max_tries random cards of the deck.
+    If the table is passed, the line must not complete any other SET with it.
+    Result: The card ids of the line, or None if no line was found.
+    """
+    line_masks = lines.line_masks
+    deck_ids = list(CardSet(deck_mask))
+    for card_id in rng.sample(deck_ids, min(max_tries, len(deck_ids))):
+        deck_lines = [
+            line_id
+            for line_id in lines.lines_through(card_id)
+            if line_masks[line_id] & ~deck_mask == 0
+            and (table_mask is None or is_exclusive(lines, table_mask, line_masks[line_id]))
+        ]
+        if deck_lines:
+            return lines.cards_of(rng.choice(deck_lines))
+    return None
+
+
+def creates_set(lines: LineIndex, table: TableLines, card_id: int):
+    """Checks if adding the card to the table would complete a new SET"""
+    pair_lines, size = lines.pair_lines, lines.size
+    full_cards = lines.n_attribute_values - 1
+    return any(
+        table.cards_on_line(pair_lines[card_id * size + other_id]) == full_cards
+        for other_id in table.cards
+    )
@@ -0,0 +1,277 @@
+"""
+    Module for the compact binary log of games and their replay.
+    A log is a stream of games, each one a header followed by records. Every record is a tag byte, the
+    milliseconds since the previous record of the game and a payload, with the numbers written as LEB128 varints
+    and the cards as packed card ids (little-endian base m), sorted and delta encoded:
+        - HEADER: n, m, flags (packed, has seed), seed, options as JSON.
+        - TABLE: Cards removed from and added to the table, one step of the game.
+        - SCORE: New score of the game.
+        - SNAPSHOT: Step and every card of the table, written every snapshot_every steps.
+        - END: End of the game.
+    The log is append-only, so many games can be archived in the same file.
+"""
+import json
+from bisect import bisect_right
+from time import monotonic
+from typing import BinaryIO, Dict, FrozenSet, Iterable, List, Tuple
+
+from .set_deck import SETDeck
+from .game_settings import SCORE_EVENT, TABLE_EVENT
+
+HEADER = 0x48
+TABLE = 0x54
+SCORE = 0x43
+SNAPSHOT = 0x53
+END = 0x45
+
+_PACKED = 0x01
+_HAS_SEED = 0x02
+
+
+def write_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(data: bytes, pos: int):
+    """Result: (value, position after the varint)"""
+    value, shift = 0, 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def zigzag(value: int):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value: int):
+    return value >> 1 if value % 2 == 0 else -(value >> 1) - 1
+
+
+def pack_card(card: Tuple[int], m: int):
+    """Packed id of a card, sum of c[i] * m^i"""
+    card_id = 0
+    for value in reversed(card):
+        card_id = card_id * m + value
+    return card_id
+
+
+def unpack_card(card_id: int, n: int, m: int):
+    card = []
+    for _ in range(n):
+        card_id, value = divmod(card_id, m)
+        card.append(value)
+    return tuple(card)
+
+
+def write_ids(out: bytearray, card_ids: Iterable[int]):
+    card_ids = sorted(card_ids)
+    write_varint(out, len(card_ids))
+    prev = 0
+    for card_id in card_ids:
+        write_varint(out, card_id - prev)
+        prev = card_id
+
+
+def read_ids(data: bytes, pos: int):
+    """Result: (card ids, position after the ids)"""
+    count, pos = read_varint(data, pos)
+    card_ids, prev = [], 0
+    for _ in range(count):
+        delta, pos = read_varint(data, pos)
+        prev += delta
+        card_ids.append(prev)
+    return card_ids, pos
+
+
+class GameRecorder:
+    """
+    GameRecorder writes the games played on a game to a binary stream, from the game events. Each game is
+    recorded between begin() and end().
+        - game: The recorded game.
+        - stream: Binary stream where the log is appended.
+        - options: Options of the game written in the header (the game keyword arguments, for example).
+        - snapshot_every: Number of steps between snapshots of the table.
+    """
+
+    def __init__(
+        self,
+        game: SETDeck,
+        stream: BinaryIO,
+        options: Dict = None,
+        snapshot_every: int = 16,
+    ):
+        self.game = game
+        self.stream = stream
+        self.options = options or {}
+        self.snapshot_every = snapshot_every
+        self._buffer = bytearray()
+        self._table: FrozenSet[int] = frozenset()
+        self._steps = 0
+        self._last_time = 0.0
+
+    def _record(self, tag: int):
+        now = monotonic()
+        self._buffer.append(tag)
+        write_varint(self._buffer, int((now - self._last_time) * 1000))
+        self._last_time = now
+
+    def _pack_all(self, cards: Iterable[Tuple[int]]):
+        m = self.game.n_attribute_values
+        return frozenset(pack_card(card, m) for card in cards)
+
+    def _on_table(self, change: Tuple[FrozenSet[Tuple[int]], FrozenSet[Tuple[int]]]):
+        removed, added = self._pack_all(change[0]), self._pack_all(change[1])
+        self._record(TABLE)
+        write_ids(self._buffer, removed)
+        write_ids(self._buffer, added)
+        self._table = (self._table - removed) | added
+        self._steps += 1
+        if self._steps % self.snapshot_every == 0:
+            self._record(SNAPSHOT)
+            write_varint(self._buffer, self._steps)
+            write_ids(self._buffer, self._table)
+
+    def _on_score(self, score: int):
+        self._record(SCORE)
+        write_varint(self._buffer, zigzag(score))
+
+    def begin(self):
+        """Writes the header of a new game and starts recording the events of the game"""
+        game = self.game
+        self._table = self._pack_all(game.table_cards)
+        self._steps = 0
+        self._last_time = monotonic()
+        self._buffer.append(HEADER)
+        write_varint(self._buffer, 0)
+        write_varint(self._buffer, game.n_attributes)
+        write_varint(self._buffer, game.n_attribute_values)
+        flags = (_PACKED if game.packed else 0) | (
+            _HAS_SEED if game.seed is not None else 0
+        )
+        self._buffer.append(flags)
+        if game.seed is not None:
+            write_varint(self._buffer, zigzag(game.seed))
+        options = json.dumps(
+            {"mode": type(game).__name__, **self.options}, separators=(",", ":")
+        ).encode()
+        write_varint(self._buffer, len(options))
+        self._buffer.extend(options)
+        # The table before the first step
+        self._buffer.append(SNAPSHOT)
+        write_varint(self._buffer, 0)
+        write_varint(self._buffer, 0)
+        write_ids(self._buffer, self._table)
+        game.subscribe(TABLE_EVENT, self._on_table)
+        game.subscribe(SCORE_EVENT, self._on_score)
+
+    def end(self):
+        """Stops recording and appends the game to the stream"""
+        self.game.unsubscribe(TABLE_EVENT, self._on_table)
+        self.game.unsubscribe(SCORE_EVENT, self._on_score)
+        self._record(END)
+        self.stream.write(self._buffer)
+        self._buffer = bytearray()
+
+
+class GameReplay:
+    """
+    GameReplay indexes a recorded game of a log, to rebuild the table at any step from the nearest snapshot.
+        - n_attributes, n_attribute_values, packed, seed, options: Header of the game.
+        - n_steps: Number of changes of the table in the game.
+        - step_times: Milliseconds since the start of the game of every step.
+        - scores: (milliseconds since the start of the game, score) of every change of the score.
+        - end: Position of the log after the game.
+    """
+
+    def __init__(self, data: bytes, pos: int = 0):
+        self.data = data
+        if data[pos] != HEADER:
+            raise ValueError(f"No game header at position {pos}")
+        _, pos = read_varint(data, pos + 1)
+        self.n_attributes, pos = read_varint(data, pos)
+        self.n_attribute_values, pos = read_varint(data, pos)
+        flags = data[pos]
+        pos += 1
+        self.packed = bool(flags & _PACKED)
+        self.seed = None
+        if flags & _HAS_SEED:
+            seed, pos = read_varint(data, pos)
+            self.seed = unzigzag(seed)
+        length, pos = read_varint(data, pos)
+        self.options = json.loads(data[pos : pos + length])
+        pos += length
+        self._index(pos)
+
+    def _index(self, pos: int):
+        """Positions of every step and snapshot of the game"""
+        data = self.data
+        self._steps: List[int] = []
+        self._snapshot_steps: List[int] = []
+        self._snapshots: List[int] = []
+        self.step_times: List[int] = []
+        self.scores: List[Tuple[int, int]] = []
+        elapsed = 0
+        while True:
+            tag = data[pos]
+            dt, body = read_varint(data, pos + 1)
+            elapsed += dt
+            if tag == TABLE:
+                self._steps.append(body)
+                self.step_times.append(elapsed)
+                _, body = read_ids(data, body)
+                _, pos = read_ids(data, body)
+            elif tag == SNAPSHOT:
+                step, body = read_varint(data, body)
+                self._snapshot_steps.append(step)
+                self._snapshots.append(body)
+                _, pos = read_ids(data, body)
+            elif tag == SCORE:
+                score, pos = read_varint(data, body)
+                self.scores.append((elapsed, unzigzag(score)))
+            elif tag == END:
+                self.end = body
+                return
+            else:
+                raise ValueError(f"Invalid record tag {tag} at position {pos}")
+
+    @property
+    def n_steps(self):
+        return len(self._steps)
+
+    def table_ids_at(self, step: int):
+        """Packed card ids of the table after step changes of the table"""
+        if not 0 <= step <= self.n_steps:
+            raise IndexError(f"Step {step} out of range [0, {self.n_steps}]")
+        snapshot = bisect_right(self._snapshot_steps, step) - 1
+        table_ids, _ = read_ids(self.data, self._snapshots[snapshot])
+        table = set(table_ids)
+        for step_pos in self._steps[self._snapshot_steps[snapshot] : step]:
+            removed, step_pos = read_ids(self.data, step_pos)
+            added, _ = read_ids(self.data, step_pos)
+            table.difference_update(removed)
+            table.update(added)
+        return frozenset(table)
+
+    def table_at(self, step: int):
+        """Cards of the table after step changes of the table"""
+        n, m = self.n_attributes, self.n_attribute_values
+        return frozenset(
+            unpack_card(card_id, n, m) for card_id in self.table_ids_at(step)
+        )
+
+
+def read_games(data: bytes):
+    """Yields the GameReplay of every game of a log"""
+    pos = 0
+    while pos < len(data):
+        replay = GameReplay(data, pos)
+        yield replay
+        pos = replay.end
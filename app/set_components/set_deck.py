@@ -1,13 +1,28 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import FrozenSet, Tuple, Iterable
+from typing import Callable, Dict, FrozenSet, List, Tuple, Iterable
+from copy import copy
 from itertools import combinations
-from random import sample
+from random import Random
 
-from tkinter import IntVar, StringVar
+import numpy as np
 
 from .game_settings import *
 from . import mod_vector as mv
+from .card_encoding import CardEncoding, card_encoding
+from .line_index import LineIndex, line_index
+from .table_lines import TableLines
+from .card_deck import CardDeck
+from .streaming_deck import CardSpace, StreamingDeck
+from .card_set import CardSet
+from . import interset_engine as ie
+from . import flat_index as fx
+from .structure_classifier import structure_classifier
+from .table_analysis import analysis_cache, card_key, table_hash
+
+# Largest number of cards whose planets are looked up in the FlatIndex (the tables of m = 3). The lookups grow with
+# the triples of cards, so on larger tables the vectorized pass of iter_flats_meeting over the directions is faster.
+_PLANET_LOOKUP_CARDS = 12
 
 
 def in_constraint(p, p_min, p_max, include_min=True, include_max=True):
@@ -28,41 +43,136 @@ class SETDeck(ABC):
     """
     SETDeck is a deck of cards for a game of SET. Each SET is represented via a vector, such that each dimension
     is one attribute and their value is the number, color, shade and shape of the card.
-        - n_attributes: Number of attributes of each card (1 <= n <= 4)
-        - n_attribute_values: Number of attribute values, can only be prime numbers (3, 5 are the only ones implemented)
+        - n_attributes: Number of attributes of each card (2 <= n <= 4, or up to 8 streaming)
+        - n_attribute_values: Number of attribute values, can only be prime numbers (3, 5, or 7, 11 streaming)
+        - streaming: If the geometry is outside N_ATTRIBUTES and N_ATTRIBUTE_VALUES, the deck is never
+            materialized: deck_cards is a lazy CardSpace, deck a StreamingDeck and the cards are not packed.
         - deck_cards: The whole SET deck.
-        - table_cards: The cards currently on the table.
-        - rem_cards: The cards remaining in the deck.
+        - table_cards: The cards currently on the table. With packed cards, assigning it updates table_lines.
+        - rem_cards: Frozenset view of the cards remaining in the deck.
+        - deck: The cards remaining in the deck, as an array backed CardDeck.
         - table_size: Max number of cards in the table.
         - score: Current game score.
         - game_state: Current state of the game (Game Start, SET found, Not a SET or Game End).
+        - listeners: Callbacks subscribed to each game event (SCORE_EVENT, STATE_EVENT...), called with the new value.
+        - packed: If True, the SET arithmetic is done with the integer packed cards and lookup tables of CardEncoding,
+            and the SETs are read from the LineIndex shared by every game of the same (n, m).
+        - table_lines: Live count of the SETs on the table (only with packed cards).
+        - table_set: The card ids on the table as a CardSet bitmask (only with packed cards).
+        - seed: Seed of the random generator of the game, rng, used for every draw.
+        - deal_pool: DealPool the starting tables are taken from, with difficulty structures of deal_structure
+            (SETs, intersets or planets, by game mode). Without it, or when its bucket is empty, the table is dealt
+            by the game as usual.
+        - table_hash: Zobrist hash of table_cards, updated with every change of the table, which keys the shared
+            TableAnalysis of the table.
     """
 
     n_attributes: int
     n_attribute_values: int
+    packed: bool = True
+    seed: int = None
     # Game attributes
+    streaming: bool = field(init=False)
     deck_cards: FrozenSet[Tuple[int]] = field(init=False)
-    table_cards: FrozenSet[Tuple[int]] = field(init=False)
-    rem_cards: FrozenSet[Tuple[int]] = field(init=False)
+    deck: CardDeck = field(init=False)
+    rng: Random = field(init=False)
+    encoding: CardEncoding = field(init=False)
+    lines: LineIndex = field(init=False)
+    table_lines: TableLines = field(init=False)
+    table_set: CardSet = field(init=False)
+    table_hash: int = field(init=False)
+    deal_pool: object = field(init=False)
+    difficulty: int = field(init=False)
     # Game state
-    score: IntVar = field(init=False)
-    game_state: StringVar = field(init=False)
+    score: int = field(init=False)
+    game_state: str = field(init=False)
+    listeners: Dict[str, List[Callable]] = field(init=False)
 
     def __post_init__(self):
-        if (
+        self.streaming = (
             self.n_attributes not in N_ATTRIBUTES
             or self.n_attribute_values not in N_ATTRIBUTE_VALUES
+        )
+        if self.streaming and (
+            self.n_attributes not in STREAM_ATTRIBUTES
+            or self.n_attribute_values not in STREAM_ATTRIBUTE_VALUES
         ):
             raise ValueError(
                 f"Attribute number, {self.n_attributes}, or Attribute posible values, {self.n_attribute_values} not in possible ranges"
             )
+        self.encoding = None
+        self.lines = None
+        self.table_lines = None
+        self.table_set = None
+        if self.streaming:
+            self.packed = False
+        if self.packed:
+            self.encoding = card_encoding(self.n_attributes, self.n_attribute_values)
+            self.lines = line_index(self.n_attributes, self.n_attribute_values)
+            self.table_lines = TableLines(self.lines)
+            self.table_set = CardSet()
         # Deck variables init
         self.deck_cards = self.generate_deck()
-        self.table_cards = frozenset()
-        self.rem_cards = frozenset()
+        self._table_cards = frozenset()
+        self.table_hash = 0
+        self.deal_pool = None
+        self.difficulty = None
+        self.rng = Random(self.seed)
+        if self.streaming:
+            self.deck = StreamingDeck(self.deck_cards, rng=self.rng)
+        else:
+            self.deck = CardDeck(rng=self.rng)
         # Game state variables
-        self.score = None
-        self.game_state = None
+        self.score = 0
+        self.game_state = ""
+        self.listeners = {}
+
+    @property
+    def table_cards(self) -> FrozenSet[Tuple[int]]:
+        return self._table_cards
+
+    @table_cards.setter
+    def table_cards(self, cards: Iterable[Tuple[int]]):
+        cards = frozenset(cards)
+        removed, added = self._table_cards - cards, cards - self._table_cards
+        if self.table_lines is not None:
+            encode_all = self.encoding.encode_all
+            added_ids, removed_ids = encode_all(added), encode_all(removed)
+            self.table_lines.update(added=added_ids, removed=removed_ids)
+            self.table_set = (self.table_set - CardSet.from_ids(removed_ids)) | (
+                CardSet.from_ids(added_ids)
+            )
+        m = self.n_attribute_values
+        for card in removed | added:
+            self.table_hash ^= card_key(card, m)
+        self._table_cards = cards
+        self._table_changed(removed, added)
+        if TABLE_EVENT in self.listeners:
+            self.publish(TABLE_EVENT, (removed, added))
+
+    def _table_changed(
+        self, removed: FrozenSet[Tuple[int]], added: FrozenSet[Tuple[int]]
+    ):
+        """Called after every change of the table with the cards removed and added"""
+
+    def card_set(self, cards: Iterable[Tuple[int]]):
+        """CardSet bitmask of the cards passed (only with packed cards)"""
+        return CardSet.from_ids(self.encoding.encode_all(cards))
+
+    def on_table(self, cards: Iterable[Tuple[int]]):
+        """Checks if all the cards are on the table"""
+        if self.table_set is not None:
+            return self.card_set(cards) <= self.table_set
+        return frozenset(cards) <= self.table_cards
+
+    @property
+    def rem_cards(self) -> FrozenSet[Tuple[int]]:
+        return self.deck.cards()
+
+    @property
+    def planes(self):
+        """Shared FlatIndex of the planes of the deck (only with packed cards)"""
+        return fx.flat_index(self.n_attributes, self.n_attribute_values, 2)
 
     @property
     def table_size(self):
@@ -73,33 +183,94 @@ class SETDeck(ABC):
     def table_state_n_cards(self):
         """Represents the number of cards remaining on the table and the deck."""
         total_cards = len(self.deck_cards)
-        return (total_cards - len(self.rem_cards | self.table_cards), total_cards)
+        return (
+            total_cards - len(self.deck) - len(self.table_cards),
+            total_cards,
+        )
 
-    def set_score_tracker(self, score: IntVar):
-        self.score = score
+    def subscribe(self, event: str, callback: Callable):
+        """Subscribe a callback to a game event. The callback is called with the new value of the event."""
+        self.listeners.setdefault(event, []).append(callback)
+
+    def unsubscribe(self, event: str, callback: Callable):
+        """Remove a callback subscribed to a game event"""
+        callbacks = self.listeners.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def clear_listeners(self, event: str = None):
+        """Remove the callbacks of an event, or of every event if none is passed"""
+        if event is None:
+            self.listeners = {}
+        else:
+            self.listeners.pop(event, None)
+
+    def publish(self, event: str, value):
+        for callback in self.listeners.get(event, ()):
+            callback(value)
+
+    def __getstate__(self):
+        """The listeners are bound to the process that subscribed them, so they are not pickled"""
+        state = self.__dict__.copy()
+        state["listeners"] = {}
+        return state
+
+    def clone(self):
+        """
+        Copy of the game that can be played independently, without listeners. The deck, the table lines and the
+        random generator are copied, while the cards and the shared indexes are immutable and reused.
+        """
+        game = copy(self)
+        game.rng = Random()
+        game.rng.setstate(self.rng.getstate())
+        game.deck = self.deck.copy(game.rng)
+        if self.table_lines is not None:
+            game.table_lines = self.table_lines.copy()
+        return game
+
+    def use_deal_pool(self, deal_pool, difficulty: int):
+        """Start the next games from the graded deals of the pool, reserving their bucket (None to stop)"""
+        self.deal_pool, self.difficulty = deal_pool, difficulty
+        if deal_pool is not None:
+            deal_pool.reserve(self, difficulty)
+
+    def _deal_from_pool(self):
+        """Deals the table from the deal pool, after the reset of the deck. Returns False if there was no deal."""
+        if self.deal_pool is None:
+            return False
+        deal = self.deal_pool.pop(self, self.difficulty)
+        if deal is None:
+            return False
+        self.deck.remove(deal)
+        self.table_cards = deal
+        return True
 
-    def set_game_state(self, game_state: StringVar):
-        self.game_state = game_state
+    def update_score(self, score: int):
+        """Set the current score and publish it to the SCORE_EVENT listeners"""
+        self.score = score
+        self.publish(SCORE_EVENT, score)
 
     def add_score(self, score_to_add: int):
         """Add the new score value to the current score"""
-        if self.score:
-            self.score.set(self.score.get() + score_to_add)
+        self.update_score(self.score + score_to_add)
 
     def modify_game_state(self, message: str = None, timer_end: bool = False):
         """
         Modify the current game state with the passed message and taking into consideration if the game has ended.
         """
-        if not self.game_state:
-            return
         if timer_end:
-            self.game_state.set(WIN_GAME if self.is_game_end() else LOSE_GAME)
-            return
-        message_out = message + CARDS_REMAINING if message else CARDS_REMAINING
-        self.game_state.set(message_out % self.table_state_n_cards)
+            self.game_state = WIN_GAME if self.is_game_end() else LOSE_GAME
+        else:
+            message_out = message + CARDS_REMAINING if message else CARDS_REMAINING
+            self.game_state = message_out % self.table_state_n_cards
+        self.publish(STATE_EVENT, self.game_state)
 
     def generate_deck(self):
         """Generate the whole deck of cards"""
+        if self.streaming:
+            return CardSpace(self.n_attributes, self.n_attribute_values)
+        if self.encoding:
+            return frozenset(self.encoding.cards)
         all_points = mv.simple_affine_space_gen(
             self.n_attributes, self.n_attribute_values
         )
@@ -107,6 +278,11 @@ class SETDeck(ABC):
 
     def complete_set(self, c1: Tuple[int], c2: Tuple[int]):
         """Function to obtain the remaining cards to complete a SET from 2 cards"""
+        if self.encoding:
+            ids = self.encoding.ids
+            return frozenset(
+                self.encoding.decode_all(self.lines.complete_line(ids[c1], ids[c2]))
+            )
         v = mv.mod_substraction(c2, c1, self.n_attribute_values)
         vk = (
             mv.mod_product(v, k, self.n_attribute_values)
@@ -116,18 +292,43 @@ class SETDeck(ABC):
 
     def random_set(self):
         """Obtains a random SET from the deck"""
-        c1, c2 = sample(tuple(self.deck_cards), 2)
+        cards = self.deck_cards if self.streaming else sorted(self.deck_cards)
+        c1, c2 = self.rng.sample(cards, 2)
         return self.complete_set(c1, c2).union((c1, c2))
 
+    @property
+    def classifier(self):
+        """Shared StructureClassifier of the deck"""
+        return structure_classifier(self.n_attributes, self.n_attribute_values)
+
+    def classify(self, cards: Iterable[Tuple[int]]):
+        """Structure of a selection of cards (line, plane subset, plane, higher flat or none), cached"""
+        return self.classifier.classify(cards)
+
     def is_set(self, cards: Iterable[Tuple[int]]):
         """Checks if a list of cards is a SET"""
+        if self.encoding:
+            return self.lines.is_line(self.encoding.encode_all(cards))
         if len(cards) != self.n_attribute_values or not mv.is_zero(
             mv.mod_mult_addition(cards, self.n_attribute_values)
         ):
             return False
-        c1, c2 = tuple(cards)[0:2]
-        check_cards = self.complete_set(c1, c2).union((c1, c2))
-        return check_cards == frozenset(cards)
+        return self.classify(cards).kind == LINE_STRUCTURE
+
+    def _plane_of(self, card_ids: Iterable[int]):
+        """
+        Id of the plane that contains the first non-collinear triple of the cards.
+        Returns None if all the cards are collinear.
+        """
+        card_ids = tuple(card_ids)
+        if len(card_ids) < 3:
+            return None
+        c1, c2 = card_ids[0:2]
+        line = self.lines.cards_of(self.lines.line_of(c1, c2))
+        c3 = next((c for c in card_ids[2:] if c not in line), None)
+        if c3 is None:
+            return None
+        return self.planes.lookup((c1, c2, c3))
 
     def is_planet(self, cards: Iterable[Tuple[int]]):
         """
@@ -136,30 +337,89 @@ class SETDeck(ABC):
         """
         if len(cards) != 2 * (self.n_attribute_values - 1):
             return False
-        p0, base = mv.affine_to_cartesian(tuple(cards), self.n_attribute_values)
-        if len(base) != 2:
-            return False
-        plane = frozenset(
-            mv.generate_mod_affine_space(p0, base, self.n_attribute_values)
-        )
-        return frozenset(cards) < plane
+        if self.lines:
+            card_ids = frozenset(self.encoding.encode_all(cards))
+            plane_id = self._plane_of(card_ids)
+            return plane_id is not None and self.planes.contains(plane_id, card_ids)
+        return self.classify(cards).kind == PLANE_SUBSET
 
     def is_comet(self, cards: Iterable[Tuple[int]]):
         """Checks if a list of cards is a comet. A comet in SET is a plane / magic square in SET."""
         if len(cards) != self.table_size:
             return False
-        p0, base = mv.affine_to_cartesian(tuple(cards), self.n_attribute_values)
-        if len(base) != 2:
-            return False
-        plane = frozenset(
-            mv.generate_mod_affine_space(p0, base, self.n_attribute_values)
-        )
-        return frozenset(cards) == plane
+        if self.lines:
+            card_ids = frozenset(self.encoding.encode_all(cards))
+            plane_id = self._plane_of(card_ids)
+            return plane_id is not None and self.planes.cards_of(plane_id) == card_ids
+        return self.classify(cards).kind == PLANE_STRUCTURE
+
+    def _iter_sets(self, cards: Iterable[Tuple[int]]):
+        """
+        Yields every SET contained within cards exactly once. Each SET is determined by any two of its cards, so
+        each pair of cards is completed and the rest of the SET is looked up in the cards. A SET is only yielded
+        from the pair of its two smallest cards, which acts as its canonical key.
+        """
+        if self.lines:
+            yield from self._iter_indexed_sets(cards)
+            return
+        sorted_cards = sorted(frozenset(cards))
+        card_lookup = frozenset(sorted_cards)
+        m = self.n_attribute_values
+        for idx, c1 in enumerate(sorted_cards):
+            for c2 in sorted_cards[idx + 1 :]:
+                # Reject the pair from the next card of the line before completing it
+                if tuple((2 * y - x) % m for x, y in zip(c1, c2)) not in card_lookup:
+                    continue
+                rest = self.complete_set(c1, c2)
+                if all(c > c2 and c in card_lookup for c in rest):
+                    yield (c1, c2, *sorted(rest))
+
+    def _iter_indexed_sets(self, cards: Iterable[Tuple[int]]):
+        """Variation of _iter_sets that reads the SETs from the shared LineIndex"""
+        card_ids = sorted(frozenset(self.encoding.encode_all(cards)))
+        card_lookup = frozenset(card_ids)
+        pair_lines, line_cards = self.lines.pair_lines, self.lines.line_cards
+        size, m = self.lines.size, self.n_attribute_values
+        for idx, c1 in enumerate(card_ids):
+            for c2 in card_ids[idx + 1 :]:
+                line_start = pair_lines[c1 * size + c2] * m
+                line = line_cards[line_start : line_start + m]
+                # The line is only yielded from its two smallest cards
+                if line[0] == c1 and line[1] == c2 and card_lookup.issuperset(line[2:]):
+                    yield self.encoding.decode_all(line)
 
     def all_sets(self, cards: Iterable[Tuple[int]]):
         """Obtains all the SETs contained within cards"""
-        card_combinations = combinations(cards, self.n_attribute_values)
-        return tuple(cards for cards in card_combinations if self.is_set(cards))
+        return tuple(self._iter_sets(cards))
+
+    def has_set(self, cards: Iterable[Tuple[int]]):
+        """Checks if there is at least one SET within cards"""
+        return any(True for _ in self._iter_sets(cards))
+
+    def sets_with(self, cards: Iterable[Tuple[int]], new_cards: Iterable[Tuple[int]]):
+        """Obtains the SETs contained within cards that contain at least one of new_cards"""
+        cards = frozenset(cards)
+        found = set()
+        for c1 in new_cards:
+            for c2 in cards:
+                if c1 == c2:
+                    continue
+                card_set = self.complete_set(c1, c2).union((c1, c2))
+                if card_set <= cards:
+                    found.add(card_set)
+        return tuple(found)
+
+    def table_set_count(self):
+        """Number of SETs on the table. O(1) with packed cards."""
+        if self.table_lines is not None:
+            return self.table_lines.n_sets
+        return len(self.all_sets(self.table_cards))
+
+    def table_has_set(self):
+        """Checks if there is at least one SET on the table. O(1) with packed cards."""
+        if self.table_lines is not None:
+            return self.table_lines.has_set()
+        return self.has_set(self.table_cards)
 
     def _possible_intersets(self, cards: Iterable[Tuple[int]]):
         """
@@ -167,14 +427,37 @@ class SETDeck(ABC):
         card is not within cards and the rest of the cards of the SET is within cards.
         """
         cards = frozenset(cards)
+        seen_sets = set()
         for card_comb in combinations(cards, 2):
             card_set = self.complete_set(*card_comb).union(card_comb)
+            if card_set in seen_sets:
+                continue
+            seen_sets.add(card_set)
             card_interset = cards & card_set
             if len(card_interset) == self.n_attribute_values - 1:
                 yield (card_set - card_interset, card_interset)
 
     def all_intersets(self, cards: Iterable[Tuple[int]]):
-        """Obtains all the intersets contained within cards"""
+        """
+        Obtains all the intersets contained within cards.
+        Result: ((intersection card, [SET without the intersection card, ...]), ...), with frozensets of cards.
+        """
+        if self.lines:
+            decode = self.encoding.decode
+            return tuple(
+                (
+                    frozenset((decode(int_card),)),
+                    [
+                        frozenset(
+                            decode(c) for c in self.lines.cards_of(line_id) if c != int_card
+                        )
+                        for line_id in line_ids
+                    ],
+                )
+                for int_card, line_ids in ie.all_intersets(
+                    self.lines, self.encoding.encode_all(cards)
+                )
+            )
         intersets = {}
         for int_card, interset in self._possible_intersets(cards):
             if int_card not in intersets:
@@ -187,12 +470,104 @@ class SETDeck(ABC):
             if len(interset_l) > 1
         )
 
+    def has_interset(self, cards: Iterable[Tuple[int]]):
+        """Checks if there is at least one interset within cards"""
+        if self.lines:
+            return ie.has_interset(self.lines, self.encoding.encode_all(cards))
+        return len(self.all_intersets(cards)) >= 1
+
+    def all_planes(self, cards: Iterable[Tuple[int]], min_cards: int = 3):
+        """
+        Yields the cards within cards of every plane that contains at least min_cards of them. On streaming
+        geometries only the planes spanned by the cards (with three non-collinear cards) are yielded, as a pass
+        over every direction of AG(n, m) is out of reach.
+        """
+        if self.streaming:
+            yield from self._spanned_planes(cards, min_cards)
+            return
+        for _, plane_cards in fx.iter_flats_meeting(
+            self.n_attributes, self.n_attribute_values, 2, cards
+        ):
+            if len(plane_cards) >= min_cards:
+                yield frozenset(plane_cards)
+
+    def _spanned_planes(self, cards: Iterable[Tuple[int]], min_cards: int = 3):
+        """
+        Yields the cards within cards of every plane spanned by three of them with at least min_cards cards, with
+        O(t^2) batch operations over the t cards. The triples (c1, c2, c3) of a pair are grouped by the plane they
+        span: the difference c3 - c1 reduced by the direction of the line (c1, c2) and scaled to a leading 1. Each
+        plane through the line is then found in a single pass, and yielded from the pair of its two smallest cards.
+        """
+        m = self.n_attribute_values
+        cards = sorted(frozenset(cards))
+        if len(cards) < max(min_cards, 3):
+            return
+        inverse = np.array([0] + [pow(value, -1, m) for value in range(1, m)])
+        powers = m ** np.arange(self.n_attributes, dtype=np.int64)
+        points = np.asarray(cards, dtype=np.int64)
+        for i in range(len(cards) - max(min_cards, 3) + 1):
+            vectors = mv.mod_substraction_batch(points, points[i], m)
+            for j in range(i + 1, len(cards)):
+                d = vectors[j]
+                pivot = int(np.flatnonzero(d)[0])
+                d = mv.mod_product_batch(d[None, :], inverse[d[pivot]], m)[0]
+                reduced = mv.mod_substraction_batch(vectors, vectors[:, pivot, None] * d, m)
+                nonzero = reduced != 0
+                leads = reduced[np.arange(len(cards)), nonzero.argmax(axis=1)]
+                keys = mv.mod_product_batch(reduced, inverse[leads], m) @ powers
+                on_line = np.flatnonzero(~nonzero.any(axis=1))
+                # Planes with a card below c2 other than c1 are yielded from another pair
+                if on_line[0] != i or on_line[1] != j:
+                    continue
+                in_planes = np.flatnonzero(nonzero.any(axis=1))
+                plane_keys, first, counts = np.unique(
+                    keys[in_planes], return_index=True, return_counts=True
+                )
+                for key, idx, count in zip(plane_keys, first, counts):
+                    if in_planes[idx] < j or len(on_line) + count < min_cards:
+                        continue
+                    members = in_planes[keys[in_planes] == key]
+                    yield frozenset(cards[k] for k in (*on_line, *members))
+
+    def all_planets(self, cards: Iterable[Tuple[int]]):
+        """
+        Yields the cards within cards of every plane that contains at least 2 * (m - 1) of them. As 2 * (m - 1) > m,
+        those cards are never collinear, so with packed cards and up to _PLANET_LOOKUP_CARDS cards each plane is
+        looked up in the FlatIndex from a non-collinear triple of cards, instead of a pass over every direction.
+        """
+        n_planet = 2 * (self.n_attribute_values - 1)
+        cards = frozenset(cards)
+        if not self.lines or len(cards) > _PLANET_LOOKUP_CARDS:
+            yield from self.all_planes(cards, n_planet)
+            return
+        card_ids = sorted(self.encoding.encode_all(cards))
+        table_ids = frozenset(card_ids)
+        lines, planes = self.lines, self.planes
+        # Every plane is yielded from its smallest card, c1, and looked up once: the cards of the planes found
+        # through c1 are skipped when they meet the line of the pair (c1, c2)
+        for i, c1 in enumerate(card_ids[: len(card_ids) - n_planet + 1]):
+            found = {}
+            for c2 in card_ids[i + 1 :]:
+                skip = set(lines.cards_of(lines.line_of(c1, c2)))
+                for plane_ids in found.get(c2, ()):
+                    skip.update(plane_ids)
+                for c3 in card_ids[i + 1 :]:
+                    if c3 in skip:
+                        continue
+                    plane_ids = planes.cards_of(planes.lookup((c1, c2, c3))) & table_ids
+                    skip.update(plane_ids)
+                    for card_id in plane_ids:
+                        found.setdefault(card_id, []).append(plane_ids)
+                    if len(plane_ids) >= n_planet and min(plane_ids) == c1:
+                        yield frozenset(self.encoding.decode_all(plane_ids))
+
     def card_structure(self, cards: Iterable[Tuple[int]]):
         """
         Returns the subyacent card structure in a list of cards (cards in this case is an affine reference).
         This function is meant to be used with the package card_draw, to draw set structures.
         """
-        return mv.generate_affine_space_structure(cards, self.n_attribute_values)
+        p0, base = self.classifier.span(cards)
+        return mv.affine_space_structure(p0, base, self.n_attribute_values)
 
     @abstractmethod
     def is_valid_selection(self, num_cards: int):
@@ -209,6 +584,37 @@ class SETDeck(ABC):
         else returns an empty set
         """
 
+    @abstractmethod
+    def moves(self, cards: Iterable[Tuple[int]]):
+        """Returns the valid selections within cards for a round of the game"""
+
+    def analysis(self, cards: Iterable[Tuple[int]] = None):
+        """
+        Shared TableAnalysis of the cards (of the table if none are passed), computed once for every game of the
+        same mode and geometry while it stays in the cache.
+        """
+        if cards is None:
+            return analysis_cache.get(self, self.table_cards, self.table_hash)
+        cards = frozenset(cards)
+        return analysis_cache.get(self, cards, table_hash(cards, self.n_attribute_values))
+
+    def table_moves(self):
+        """Returns the valid selections of cards on the table for a round of the game"""
+        return self.analysis().moves
+
+    def update_moves(
+        self,
+        moves: Iterable[FrozenSet[Tuple[int]]],
+        cards: Iterable[Tuple[int]],
+        removed: Iterable[Tuple[int]],
+        added: Iterable[Tuple[int]],
+    ):
+        """
+        Returns the valid selections within cards, from the moves of the cards before the removed cards were taken
+        and the added cards were dealt. By default the moves are computed again.
+        """
+        return self.moves(cards)
+
     @abstractmethod
     def is_game_end(self):
         """Check if the game has ended. Each game has a different game end condition"""
@@ -1,8 +1,9 @@
-from typing import Tuple, Iterable
-from random import sample
+from typing import FrozenSet, Tuple, Iterable
 from itertools import combinations
 
 from .set_deck import SETDeck
+from .card_set import CardSet
+from . import refill as rf
 from .game_settings import *
 
 
@@ -10,12 +11,36 @@ class SETGame(SETDeck):
     """
     SETGame implements the logic for a solitary game of SET.
     - set_score: The score gained per SET found.
+    - refill_policy: How the table is dealt and refilled (with packed cards). With t cards on the table, d in the
+        deck, k = refill_sets and r = (m^n - 1) / (m - 1) lines through each card, the worst case cost of a deal is:
+        - REFILL_UNIFORM: Uniformly random cards, SETs are not guaranteed. O(k) draws.
+        - REFILL_AT_LEAST: At least k SETs on the table if the deck allows it, the rest uniformly random.
+            O(k * t * r) bitmask operations, plus O(d + r) per deck card tried (at most 64) when no line goes
+            through the table.
+        - REFILL_EXACTLY: As REFILL_AT_LEAST, but the lines placed complete no other SET with the table, and the
+            rest of the cards are drawn so they do not complete more SETs, if the deck allows it. The table then
+            holds max(k, SETs left after the play) SETs. Adds O(m * r) per line checked and O(d * t).
+    - refill_sets: Number of SETs, k, of the refill policy.
     """
+
+    deal_structure = SETS_GRADE
+
     def __init__(
-        self, n_attributes: int, n_attribute_values: int, set_score: int = 300
+        self,
+        n_attributes: int,
+        n_attribute_values: int,
+        set_score: int = 300,
+        packed: bool = True,
+        seed: int = None,
+        refill_policy: str = REFILL_AT_LEAST,
+        refill_sets: int = 1,
     ):
-        super().__init__(n_attributes, n_attribute_values)
+        super().__init__(n_attributes, n_attribute_values, packed, seed)
+        if refill_policy not in REFILL_POLICIES:
+            raise ValueError(f"Invalid refill policy: {refill_policy}")
         self.set_score = set_score
+        self.refill_policy = refill_policy
+        self.refill_sets = refill_sets
 
     @property
     def max_score(self):
@@ -26,65 +51,154 @@ class SETGame(SETDeck):
 
     def start_game(self):
         """Start the game of SET"""
-        # Include at least a SET in the random selection
-        rand_set = self.random_set()
-        remaining = self.deck_cards.copy() - rand_set
-        rest_table = sample(tuple(remaining), self.table_size - len(rand_set))
-        self.table_cards = rand_set.union(rest_table)
-        self.rem_cards = remaining - self.table_cards
-        if self.score:
-            self.score.set(0)
+        self.deck.reset(self.deck_cards)
+        if not self._deal_from_pool():
+            self._deal_table()
+        self.update_score(0)
         self.modify_game_state()
 
+    def _deal_table(self):
+        """Deal the starting table from the deck"""
+        if self.lines:
+            # Deal the table with the refill policy
+            self.table_cards = frozenset()
+            self._refill_table()
+        else:
+            # Include at least a SET in the random selection
+            rand_set = self.random_set()
+            self.deck.remove(rand_set)
+            rest_table = self.deck.draw(self.table_size - len(rand_set))
+            self.table_cards = rand_set.union(rest_table)
+
     def table_sets(self):
         """Function to return the SETs on the table"""
+        if self.table_lines is not None:
+            return tuple(
+                self.encoding.decode_all(line) for line in self.table_lines.sets()
+            )
         return self.all_sets(self.table_cards)
 
     def check_table(self):
         """Checks if the table has at least one SET"""
-        return any(True for _ in self.table_sets())
+        return self.table_has_set()
 
     def _refill_table(self):
         """
-        Refill the cards in the table from the remaining cards in the deck. Checks if the cards in the table have
-        at least one SET. If not, tries to complete at least one SET in the refill of the table.
+        Refill the cards in the table from the remaining cards in the deck, following the refill policy.
         """
         to_refill = self.table_size - len(self.table_cards)
         if to_refill == 0:
             return frozenset()
-        if len(self.rem_cards) <= to_refill:  # If there are not enough remaining cards
-            refill_cards = self.rem_cards
-            self.rem_cards = frozenset()
+        if len(self.deck) <= to_refill:  # If there are not enough remaining cards
+            refill_cards = frozenset(self.deck.draw(len(self.deck)))
             self.table_cards = self.table_cards | refill_cards
             return refill_cards
+        if not self.lines:
+            return self._refill_unpacked(to_refill)
+        placed = ()
+        if self.refill_policy != REFILL_UNIFORM:
+            placed = self._place_sets(to_refill)
+        if self.refill_policy == REFILL_EXACTLY:
+            drawn = self._draw_without_sets(to_refill - len(placed))
+        else:
+            drawn = self.deck.draw(to_refill - len(placed))
+        self.table_cards = self.table_cards.union(drawn)
+        return frozenset(placed).union(drawn)
+
+    def _place_sets(self, to_refill: int):
+        """
+        Moves the cards that complete SETs from the deck to the table, until there are refill_sets SETs. Under
+        REFILL_EXACTLY every line placed completes a single SET, the line itself.
+        """
+        decode_all = self.encoding.decode_all
+        deck_mask = None
+        placed = []
+        exclusive = self.refill_policy == REFILL_EXACTLY
+        while self.table_set_count() < self.refill_sets:
+            if deck_mask is None:
+                # O(deck), only once a placement is needed
+                deck_mask = self.card_set(self.deck).mask
+            free_slots = to_refill - len(placed)
+            table_mask = self.table_set.mask
+            line = rf.find_completing_line(
+                self.lines, table_mask, deck_mask, free_slots, self.rng, exclusive=exclusive
+            )
+            if line is None and free_slots >= self.n_attribute_values:
+                line = rf.find_deck_line(
+                    self.lines, deck_mask, self.rng, table_mask=table_mask if exclusive else None
+                )
+            if line is None:
+                break
+            deck_mask &= ~CardSet.from_ids(line).mask
+            cards = decode_all(line)
+            self.deck.remove(cards)
+            self.table_cards = self.table_cards.union(cards)
+            placed.extend(cards)
+        return placed
+
+    def _draw_without_sets(self, n_cards: int):
+        """
+        Draws n_cards random cards that do not complete a new SET on the table. If the deck does not have enough
+        of them, the rest are drawn uniformly.
+        """
+        encode = self.encoding.encode
+        drawn = []
+        for card in self.deck.sample(len(self.deck)):
+            if len(drawn) == n_cards:
+                break
+            if not rf.creates_set(self.lines, self.table_lines, encode(card)):
+                self.deck.remove((card,))
+                self.table_cards = self.table_cards.union((card,))
+                drawn.append(card)
+        return tuple(drawn) + self.deck.draw(n_cards - len(drawn))
+
+    def _refill_unpacked(self, to_refill: int):
+        """
+        Refill of the table without packed cards. Checks if the cards in the table have at least one SET.
+        If not, tries to complete at least one SET in the refill of the table.
+        """
         if self.check_table():  # If there is a SET already in the table
-            refill_cards = frozenset(sample(tuple(self.rem_cards), to_refill))
-            self.rem_cards = self.rem_cards - refill_cards
+            refill_cards = frozenset(self.deck.draw(to_refill))
             self.table_cards = self.table_cards | refill_cards
             return refill_cards
         # If there are no SETs in the table
-        available_cards = self.rem_cards | self.table_cards
-        for c1, c2 in combinations(available_cards, 2):
-            pos_set = self.complete_set(c1, c2).union((c1, c2))
-            if pos_set <= available_cards:
-                refill_cards = self.rem_cards & pos_set
-                self.rem_cards = self.rem_cards - refill_cards
-                break
+        refill_cards = frozenset()
+        if self.streaming:
+            refill_cards = self._streaming_completion(to_refill)
+        else:
+            available_cards = self.rem_cards | self.table_cards
+            for c1, c2 in combinations(available_cards, 2):
+                pos_set = self.complete_set(c1, c2).union((c1, c2))
+                if pos_set <= available_cards:
+                    refill_cards = self.rem_cards & pos_set
+                    break
+        self.deck.remove(refill_cards)
         # Add rest of the draw
         refill_cards = refill_cards.union(
-            sample(tuple(self.rem_cards), to_refill - len(refill_cards))
+            self.deck.draw(to_refill - len(refill_cards))
         )
-        self.rem_cards = self.rem_cards - refill_cards
         self.table_cards = self.table_cards | refill_cards
         return refill_cards
 
+    def _streaming_completion(self, to_refill: int, n_samples: int = 8):
+        """
+        Cards of the deck that complete a SET with the table, without materializing the deck. The SETs are
+        searched through the pairs of table cards and of n_samples cards of the deck, O((t + n_samples)^2 * m).
+        """
+        candidates = tuple(self.table_cards) + tuple(self.deck.sample(n_samples))
+        for c1, c2 in combinations(candidates, 2):
+            missing = self.complete_set(c1, c2).union((c1, c2)) - self.table_cards
+            if len(missing) <= to_refill and all(card in self.deck for card in missing):
+                return missing
+        return frozenset()
+
     def play_round(self, cards: Iterable[Tuple[int]]):
         """
         Check if the selected cards are a SET and in the table. Returns the newly drawn cards.
         Returns None if the passed cards are not a SET
         """
         cards = frozenset(cards)
-        if not self.is_set(cards) or not (cards <= self.table_cards):
+        if not self.is_set(cards) or not self.on_table(cards):
             self.modify_game_state(message=NOT_SET)
             self.add_score(-int(self.set_score / 2))
             return None
@@ -94,5 +208,23 @@ class SETGame(SETDeck):
         self.modify_game_state(message=IS_SET)
         return refill_cards
 
+    def moves(self, cards: Iterable[Tuple[int]]):
+        return tuple(frozenset(card_set) for card_set in self.all_sets(cards))
+
+    def table_moves(self):
+        return tuple(frozenset(cards) for cards in self.table_sets())
+
+    def update_moves(
+        self,
+        moves: Iterable[FrozenSet[Tuple[int]]],
+        cards: Iterable[Tuple[int]],
+        removed: Iterable[Tuple[int]],
+        added: Iterable[Tuple[int]],
+    ):
+        """The SETs without removed cards are kept, so only the SETs with an added card are searched"""
+        removed = frozenset(removed)
+        kept = tuple(card_set for card_set in moves if card_set.isdisjoint(removed))
+        return kept + self.sets_with(cards, added)
+
     def is_game_end(self):
-        return len(self.rem_cards) == 0 and not self.check_table()
+        return len(self.deck) == 0 and not self.check_table()
@@ -1,11 +1,11 @@
-from random import sample
-from typing import Tuple
-from tkinter import StringVar
+from typing import Iterable, Tuple
 from .set_deck import SETDeck
 from .game_settings import *
 
 
 class SETPlanetComet(SETDeck):
+    deal_structure = PLANETS_GRADE
+
     def __init__(
         self,
         n_attributes: int,
@@ -13,12 +13,13 @@ class SETPlanetComet(SETDeck):
         set_score: int = 300,
         planet_score: int = 400,
         comet_score: int = 600,
+        packed: bool = True,
+        seed: int = None,
     ):
-        super().__init__(n_attributes, n_attribute_values)
+        super().__init__(n_attributes, n_attribute_values, packed, seed)
         self.set_score = set_score
         self.comet_score = comet_score
         self.planet_score = planet_score
-        self.spc_button = None
 
     @property
     def max_score(self):
@@ -40,30 +41,29 @@ class SETPlanetComet(SETDeck):
         is_set = num_cards == self.n_attribute_values
         is_planet = num_cards == 2 * (self.n_attribute_values - 1)
         is_comet = num_cards == len(self.table_cards)
-        if self.spc_button:
-            self.spc_button.configure(
-                text=COMET if is_comet else PLANET if is_planet else SET
-            )
+        self.publish(
+            SELECTION_EVENT, COMET if is_comet else PLANET if is_planet else SET
+        )
         return is_set or is_planet or is_comet
 
-    def set_spc_button(self, spc_button: StringVar):
-        self.spc_button = spc_button
-
     def start_game(self):
-        self.table_cards = frozenset(sample(tuple(self.deck_cards), self.table_size))
-        self.rem_cards = self.deck_cards - self.table_cards
-        if self.score:
-            self.score.set(0)
+        self.deck.reset(self.deck_cards)
+        if not self._deal_from_pool():
+            self.table_cards = self.deck.draw(self.table_size)
+        self.update_score(0)
         self.modify_game_state()
 
     def play_round(self, cards: Tuple[int]):
         cards = frozenset(cards)
-        if not (cards <= self.table_cards):
+        if not self.on_table(cards):
             self.add_score(-int(self.set_score / 2))
             return None
-        is_set = self.is_set(cards)
-        is_planet = self.is_planet(cards)
-        is_comet = self.is_comet(cards)
+        # One classification of the selection instead of the three checks
+        kind = self.classify(cards).kind
+        is_set = kind == LINE_STRUCTURE
+        n_planet = 2 * (self.n_attribute_values - 1)
+        is_planet = kind == PLANE_SUBSET and len(cards) == n_planet
+        is_comet = kind == PLANE_STRUCTURE and len(cards) == self.table_size
         if not (is_set or is_planet or is_comet):
             self.add_score(-int(self.set_score / 2))
             return None
@@ -72,14 +72,24 @@ class SETPlanetComet(SETDeck):
             if is_set
             else self.comet_score if is_comet else self.planet_score
         )
-        refill_cards = min(len(self.rem_cards), len(cards))
-        draw_cards = frozenset(sample(tuple(self.rem_cards), refill_cards))
+        draw_cards = frozenset(self.deck.draw(len(cards)))
         self.table_cards = (self.table_cards - cards) | draw_cards
-        self.rem_cards = self.rem_cards - draw_cards
         self.modify_game_state(
             IS_SET if is_set else IS_COMET if is_comet else IS_PLANET
         )
         return frozenset(draw_cards)
 
+    def moves(self, cards: Iterable[Tuple[int]]):
+        """The SETs, the planets (one per plane) and the comet within cards"""
+        cards = frozenset(cards)
+        n_planet = 2 * (self.n_attribute_values - 1)
+        sets = tuple(frozenset(card_set) for card_set in self.all_sets(cards))
+        planets = tuple(
+            frozenset(sorted(plane_cards)[0:n_planet])
+            for plane_cards in self.all_planets(cards)
+        )
+        comet = (cards,) if self.is_comet(cards) else ()
+        return sets + planets + comet
+
     def is_game_end(self):
-        return len(self.rem_cards) == 0 and len(self.table_cards) == 0
+        return len(self.deck) == 0 and len(self.table_cards) == 0
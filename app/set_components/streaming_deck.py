@@ -0,0 +1,157 @@
+"""
+    Module for the decks of large affine spaces AG(n, m), which are never materialized.
+    The cards are numbered by their packed id (little-endian base m) and computed on demand, the deal order is a
+    pseudo random permutation of the ids and the dealt cards are tracked in a bitmap of m^n bits.
+"""
+from collections.abc import Sequence
+from random import Random
+from typing import Hashable, Iterable, Tuple
+
+_FEISTEL_ROUNDS = 4
+
+
+class CardSpace(Sequence):
+    """
+    CardSpace is the lazy sequence of every card of AG(n, m), in packed id order.
+        - n_attributes: Number of attributes of each card.
+        - n_attribute_values: Number of values of each attribute.
+    """
+
+    def __init__(self, n_attributes: int, n_attribute_values: int):
+        self.n_attributes = n_attributes
+        self.n_attribute_values = n_attribute_values
+        self.size = n_attribute_values**n_attributes
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, card_id: int):
+        if not 0 <= card_id < self.size:
+            raise IndexError(f"Card id {card_id} out of range")
+        return self.unpack(card_id)
+
+    def __contains__(self, card: Tuple[int]):
+        return len(card) == self.n_attributes and all(
+            0 <= value < self.n_attribute_values for value in card
+        )
+
+    def __iter__(self):
+        return (self.unpack(card_id) for card_id in range(self.size))
+
+    def pack(self, card: Tuple[int]):
+        """Packed id of a card, sum of c[i] * m^i"""
+        card_id = 0
+        for value in reversed(card):
+            card_id = card_id * self.n_attribute_values + value
+        return card_id
+
+    def unpack(self, card_id: int):
+        m = self.n_attribute_values
+        card = []
+        for _ in range(self.n_attributes):
+            card_id, value = divmod(card_id, m)
+            card.append(value)
+        return tuple(card)
+
+
+class StreamingDeck:
+    """
+    StreamingDeck is the CardDeck of a CardSpace. The deal order is a Feistel network permutation of the card ids,
+    restricted to [0, m^n) by cycle walking and keyed from the rng on every reset, and the cards dealt (drawn or
+    removed) are marked in a bitmap, so the memory is m^n / 8 bytes and a draw costs O(1) expected permutations.
+        - space: The CardSpace of the deck.
+        - rng: Random generator used for the keys of the permutation.
+    """
+
+    def __init__(self, space: CardSpace, rng: Random = None):
+        self.space = space
+        self.rng = rng if rng is not None else Random()
+        half_bits = max(1, (max(space.size - 1, 1).bit_length() + 1) // 2)
+        self._half_bits = half_bits
+        self._half_mask = (1 << half_bits) - 1
+        self.reset()
+
+    def reset(self, cards: Iterable[Hashable] = None):
+        """Refill the deck with every card of the space, with a new deal order"""
+        self._keys = tuple(self.rng.getrandbits(32) for _ in range(_FEISTEL_ROUNDS))
+        self._next = 0
+        self._dealt = bytearray((self.space.size + 7) // 8)
+        self._n_dealt = 0
+
+    def copy(self, rng: Random = None):
+        """Copy of the deck, drawing with the rng passed (or with the same rng)"""
+        deck = StreamingDeck.__new__(StreamingDeck)
+        deck.__dict__.update(self.__dict__)
+        deck.rng = rng if rng is not None else self.rng
+        deck._dealt = self._dealt[:]
+        return deck
+
+    def _round(self, x: int, key: int):
+        x = ((x ^ key) * 0x45D9F3B) & 0xFFFFFFFF
+        x ^= x >> 16
+        x = (x * 0x45D9F3B) & 0xFFFFFFFF
+        return (x ^ (x >> 16)) & self._half_mask
+
+    def _permute(self, idx: int):
+        """Position idx of the deal order, cycle walking the Feistel network until it is a card id"""
+        half_bits, half_mask = self._half_bits, self._half_mask
+        while True:
+            left, right = idx >> half_bits, idx & half_mask
+            for key in self._keys:
+                left, right = right, left ^ self._round(right, key)
+            idx = (left << half_bits) | right
+            if idx < self.space.size:
+                return idx
+
+    def _is_dealt(self, card_id: int):
+        return (self._dealt[card_id >> 3] >> (card_id & 7)) & 1 == 1
+
+    def _deal(self, card_id: int):
+        self._dealt[card_id >> 3] |= 1 << (card_id & 7)
+        self._n_dealt += 1
+
+    def _undealt_ids(self):
+        """Card ids remaining in the deck, in deal order"""
+        for idx in range(self._next, self.space.size):
+            card_id = self._permute(idx)
+            if not self._is_dealt(card_id):
+                yield card_id
+
+    def __len__(self):
+        return self.space.size - self._n_dealt
+
+    def __contains__(self, card: Tuple[int]):
+        return card in self.space and not self._is_dealt(self.space.pack(card))
+
+    def __iter__(self):
+        return (self.space.unpack(card_id) for card_id in self._undealt_ids())
+
+    def draw(self, k: int):
+        """Draw the next k cards of the deal order (or every remaining card if there are less than k)"""
+        drawn = []
+        while len(drawn) < k and self._n_dealt < self.space.size:
+            card_id = self._permute(self._next)
+            self._next += 1
+            if not self._is_dealt(card_id):
+                self._deal(card_id)
+                drawn.append(self.space.unpack(card_id))
+        return tuple(drawn)
+
+    def sample(self, k: int):
+        """The next k cards of the deal order, without removing them"""
+        cards = []
+        for card_id in self._undealt_ids():
+            if len(cards) == k:
+                break
+            cards.append(self.space.unpack(card_id))
+        return cards
+
+    def remove(self, cards: Iterable[Hashable]):
+        """Remove the cards passed that are in the deck"""
+        for card in cards:
+            if card in self:
+                self._deal(self.space.pack(card))
+
+    def cards(self):
+        """Frozenset of the remaining cards. Materializes the deck, O(m^n)"""
+        return frozenset(self)
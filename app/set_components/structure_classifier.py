@@ -0,0 +1,86 @@
+"""
+    Module for the classification of a selection of cards by its affine span.
+    The span of the selection is p0 + W, with W spanned by the differences to the base point p0, so a single pass
+    over the cards with a ModEchelonBasis gives its rank k. The span has m^k cards, so the selection is the whole
+    flat exactly when it has m^k distinct cards.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Tuple
+
+from . import mod_vector as mv
+from .game_settings import (
+    NO_STRUCTURE,
+    LINE_STRUCTURE,
+    PLANE_SUBSET,
+    PLANE_STRUCTURE,
+    FLAT_STRUCTURE,
+)
+
+
+@dataclass(frozen=True)
+class Structure:
+    """
+    Structure of a selection of cards.
+        - kind: NO_STRUCTURE, LINE_STRUCTURE (a SET), PLANE_SUBSET (part of a plane, not in a line),
+            PLANE_STRUCTURE (a whole plane) or FLAT_STRUCTURE (a whole flat of dimension 3 or more).
+        - rank: Dimension of the affine span of the cards.
+        - n_cards: Number of distinct cards.
+        - p0: Base point of the span.
+        - base: Base vectors of the span, as differences of cards to p0.
+    """
+
+    kind: str
+    rank: int
+    n_cards: int
+    p0: Tuple[int]
+    base: Tuple[Tuple[int]]
+
+
+class StructureClassifier:
+    """
+    StructureClassifier classifies selections of cards of AG(n, m), caching the result by the frozenset of the
+    cards so repeated validations of the same selection are free.
+        - n_attributes: Number of attributes of each card.
+        - n_attribute_values: Number of values of each attribute.
+    """
+
+    def __init__(
+        self, n_attributes: int, n_attribute_values: int, cache_size: int = 1 << 16
+    ):
+        self.n_attributes = n_attributes
+        self.n_attribute_values = n_attribute_values
+        self._classify = lru_cache(maxsize=cache_size)(self._classify_key)
+
+    def span(self, cards: Iterable[Tuple[int]]):
+        """
+        Base point and base of the affine span of the cards, in the order of the cards: p0 is the first card
+        and the base is formed by the differences to p0 that increase the rank.
+        """
+        return mv.affine_to_cartesian(tuple(cards), self.n_attribute_values)
+
+    def _classify_key(self, key: FrozenSet[Tuple[int]]):
+        if not key:
+            return Structure(NO_STRUCTURE, 0, 0, None, ())
+        p0, base = self.span(sorted(key))
+        rank, n_cards = len(base), len(key)
+        full = n_cards == self.n_attribute_values**rank
+        if rank == 1 and full:
+            kind = LINE_STRUCTURE
+        elif rank == 2:
+            kind = PLANE_STRUCTURE if full else PLANE_SUBSET
+        elif rank > 2 and full:
+            kind = FLAT_STRUCTURE
+        else:
+            kind = NO_STRUCTURE
+        return Structure(kind, rank, n_cards, p0, tuple(base))
+
+    def classify(self, cards: Iterable[Tuple[int]]):
+        """Structure of the selection of cards"""
+        return self._classify(frozenset(cards))
+
+
+@lru_cache(maxsize=None)
+def structure_classifier(n_attributes: int, n_attribute_values: int):
+    """Shared StructureClassifier for AG(n, m)"""
+    return StructureClassifier(n_attributes, n_attribute_values)
@@ -0,0 +1,132 @@
+"""
+    Module for the analysis of the structures of a table, computed once per table state and shared by every
+    consumer of the process (interface, hint engine, bots, simulations) through a bounded LRU cache.
+    Tables are keyed by their Zobrist hash, the xor of a 64 bit key per card, which the games update incrementally
+    on every change of the table.
+"""
+from collections import OrderedDict
+from functools import cached_property
+from threading import Lock
+from typing import FrozenSet, Tuple
+
+from .game_settings import PLANE_STRUCTURE
+
+_MASK_64 = (1 << 64) - 1
+
+
+def card_key(card: Tuple[int], m: int):
+    """Zobrist key of a card, the splitmix64 mix of its packed id"""
+    card_id = 0
+    for value in reversed(card):
+        card_id = card_id * m + value
+    z = (card_id + 0x9E3779B97F4A7C15) & _MASK_64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK_64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK_64
+    return z ^ (z >> 31)
+
+
+def table_hash(cards: FrozenSet[Tuple[int]], m: int):
+    """Zobrist hash of a set of cards"""
+    key = 0
+    for card in cards:
+        key ^= card_key(card, m)
+    return key
+
+
+class TableAnalysis:
+    """
+    TableAnalysis exposes every structure of a table, each one computed on first use.
+        - game: Game whose methods compute the structures (any game of the same mode and geometry).
+        - cards: Cards of the table.
+        - table_hash: Zobrist hash of the cards.
+    """
+
+    def __init__(self, game, cards: FrozenSet[Tuple[int]], table_hash: int):
+        self.game = game
+        self.cards = cards
+        self.table_hash = table_hash
+
+    @cached_property
+    def sets(self):
+        return tuple(frozenset(card_set) for card_set in self.game.all_sets(self.cards))
+
+    @property
+    def n_sets(self):
+        return len(self.sets)
+
+    @cached_property
+    def intersets(self):
+        return self.game.all_intersets(self.cards)
+
+    @cached_property
+    def planes(self):
+        """Cards of every plane with at least 3 cards on the table"""
+        return tuple(self.game.all_planes(self.cards, 3))
+
+    @cached_property
+    def planets(self):
+        """Cards of every plane with at least 2 * (m - 1) cards on the table"""
+        return tuple(self.game.all_planets(self.cards))
+
+    @cached_property
+    def structure(self):
+        return self.game.classify(self.cards)
+
+    @property
+    def is_comet(self):
+        return self.structure.kind == PLANE_STRUCTURE
+
+    @cached_property
+    def moves(self):
+        """Valid moves of the game mode on the table"""
+        return self.game.moves(self.cards)
+
+    def moves_from(self, previous: "TableAnalysis"):
+        """Valid moves, updated from the moves of a previous table if they are not computed yet"""
+        if "moves" not in self.__dict__:
+            self.__dict__["moves"] = self.game.update_moves(
+                previous.moves,
+                self.cards,
+                previous.cards - self.cards,
+                self.cards - previous.cards,
+            )
+        return self.moves
+
+
+class AnalysisCache:
+    """
+    AnalysisCache is a thread safe LRU of TableAnalysis, keyed by the game mode, the geometry and the table hash.
+    The cards are compared on every hit, so hash collisions are never shared.
+        - maxsize: Max number of analyses kept.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = maxsize
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, game, cards: FrozenSet[Tuple[int]], cards_hash: int):
+        key = (type(game), game.n_attributes, game.n_attribute_values, cards_hash)
+        with self._lock:
+            analysis = self._entries.get(key)
+            if analysis is not None and analysis.cards == cards:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return analysis
+            self.misses += 1
+            analysis = TableAnalysis(game, cards, cards_hash)
+            self._entries[key] = analysis
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return analysis
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared by every game of the process
+analysis_cache = AnalysisCache()
@@ -0,0 +1,93 @@
+"""
+    Module for the incremental tracking of the lines (SETs) formed by the cards on the table.
+"""
+from math import isqrt
+from typing import Dict, Iterable, Set
+
+from .line_index import LineIndex
+
+
+class TableLines:
+    """
+    TableLines keeps the live count of the SETs on the table. For every line with at least two cards on the table
+    it stores the number of pairs of table cards on the line, so adding or removing k cards from a table of t cards
+    costs O(k * t) lookups in the LineIndex.
+        - lines: The shared LineIndex of the game.
+        - cards: Card ids on the table.
+        - line_pairs: Number of pairs of table cards on each line.
+        - full_lines: Line ids of the SETs on the table.
+    """
+
+    def __init__(self, lines: LineIndex):
+        self.lines = lines
+        m = lines.n_attribute_values
+        self.full_pairs = m * (m - 1) // 2
+        self.cards: Set[int] = set()
+        self.line_pairs: Dict[int, int] = {}
+        self.full_lines: Set[int] = set()
+
+    def copy(self):
+        table = TableLines.__new__(TableLines)
+        table.lines, table.full_pairs = self.lines, self.full_pairs
+        table.cards = self.cards.copy()
+        table.line_pairs = self.line_pairs.copy()
+        table.full_lines = self.full_lines.copy()
+        return table
+
+    @property
+    def n_sets(self):
+        """Number of SETs on the table"""
+        return len(self.full_lines)
+
+    def has_set(self):
+        return bool(self.full_lines)
+
+    def sets(self):
+        """Card ids of every SET on the table"""
+        return tuple(self.lines.cards_of(line_id) for line_id in self.full_lines)
+
+    def cards_on_line(self, line_id: int):
+        """Number of table cards on a line, obtained from its number of pairs, k * (k - 1) / 2"""
+        pairs = self.line_pairs.get(line_id, 0)
+        return (1 + isqrt(1 + 8 * pairs)) // 2 if pairs else 0
+
+    def add(self, card_id: int):
+        if card_id in self.cards:
+            return
+        pair_lines, size = self.lines.pair_lines, self.lines.size
+        line_pairs = self.line_pairs
+        for other_id in self.cards:
+            line_id = pair_lines[card_id * size + other_id]
+            pairs = line_pairs.get(line_id, 0) + 1
+            line_pairs[line_id] = pairs
+            if pairs == self.full_pairs:
+                self.full_lines.add(line_id)
+        self.cards.add(card_id)
+
+    def remove(self, card_id: int):
+        if card_id not in self.cards:
+            return
+        self.cards.discard(card_id)
+        pair_lines, size = self.lines.pair_lines, self.lines.size
+        line_pairs = self.line_pairs
+        for other_id in self.cards:
+            line_id = pair_lines[card_id * size + other_id]
+            pairs = line_pairs[line_id]
+            if pairs == self.full_pairs:
+                self.full_lines.discard(line_id)
+            if pairs == 1:
+                del line_pairs[line_id]
+            else:
+                line_pairs[line_id] = pairs - 1
+
+    def update(self, added: Iterable[int] = (), removed: Iterable[int] = ()):
+        """Updates the table with the cards that leave and the cards that enter it"""
+        for card_id in removed:
+            self.remove(card_id)
+        for card_id in added:
+            self.add(card_id)
+
+    def clear(self):
+        self.cards.clear()
+        self.line_pairs.clear()
+        self.full_lines.clear()
@@ -29,6 +29,10 @@ RESET = "Reset"
 DOWNLOAD = "Download"
 RESTART = "Restart Game"
 OPTIONS = "Options"
+HINT = "Hint"
+THINKING = "Thinking..."
+# Milliseconds between the checks of a hint that is being analysed
+HINT_POLL_MS = 100
 
 # Main content buttons
 SET = "SET!"
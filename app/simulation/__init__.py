@@ -0,0 +1,23 @@
+from .simulator import SimulationResult, play_game, simulate_games, simulate
+from .policies import first_move, random_move, largest_move
+from .solver import SolveResult, SETSolver, GameSolver, deal_order, solve
+from .cap_search import KNOWN_MAX_CAPS, CapResult, CapSearch, search_caps
+
+__all__ = [
+    "SimulationResult",
+    "play_game",
+    "simulate_games",
+    "simulate",
+    "first_move",
+    "random_move",
+    "largest_move",
+    "SolveResult",
+    "SETSolver",
+    "GameSolver",
+    "deal_order",
+    "solve",
+    "KNOWN_MAX_CAPS",
+    "CapResult",
+    "CapSearch",
+    "search_caps",
+]
@@ -0,0 +1,289 @@
+"""
+    Search of large cap sets of AG(n, m): collections of cards without a full line (a SET of m cards), which are
+    the SET-free tables of the game.
+    The affine group maps any affinely independent cards to the frame 0, e_1, ..., e_n, and every cap larger than
+    the caps of a hyperplane spans the whole space, so the search only explores the caps that contain the frame.
+    Beyond the frame the cards are added in increasing id order, the cards that would complete a line are removed
+    from the candidates as bitmasks, and the branches are bounded by the parallel classes of lines of the frame.
+    The search is split in tasks by the first card added to the frame, run over a pool of processes and
+    checkpointed to a JSON file after every task.
+"""
+import json
+import os
+from multiprocessing import Event
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from time import time
+from typing import Dict, List, Tuple
+
+from set_components import SETGame
+
+# Largest caps without a full line, (n, m) -> size
+KNOWN_MAX_CAPS = {(2, 3): 4, (3, 3): 9, (4, 3): 20, (2, 5): 16}
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+@dataclass
+class CapResult:
+    """
+    Result of a cap search.
+        - cards: Cards of the largest cap found.
+        - exact: If every task was exhausted, so no larger cap contains the frame.
+        - nodes: Number of caps expanded.
+        - tasks_done: Number of exhausted tasks, out of n_tasks.
+        - n_tasks: Number of tasks of the search.
+        - elapsed: Seconds spent in the search (in this run, without the checkpointed runs).
+    """
+
+    cards: Tuple[Tuple[int]] = ()
+    exact: bool = False
+    nodes: int = 0
+    tasks_done: int = 0
+    n_tasks: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def size(self):
+        return len(self.cards)
+
+
+class CapSearch:
+    """
+    CapSearch is a depth first branch and bound search of the largest caps of a game that contain the frame.
+    Caps and candidates are bitmasks of the packed card ids.
+        - game: The game (with packed cards) that gives the geometry and its LineIndex.
+        - target: Size at which the search stops, by default the known maximum of the geometry.
+        - stop: Event that stops the search when it is set (by another process of the pool, for example).
+    """
+
+    def __init__(self, game: SETGame, target: int = None, stop: Event = None):
+        if game.lines is None:
+            raise ValueError("The cap search needs a game with packed cards")
+        self.game = game
+        self.lines = game.lines
+        n, m = game.n_attributes, game.n_attribute_values
+        self.target = target if target is not None else KNOWN_MAX_CAPS.get((n, m))
+        self.frame = tuple(
+            game.encoding.ids[tuple(int(i == k) for i in range(n))]
+            for k in range(-1, n)
+        )
+        self.parallel_classes = tuple(self._parallel_class(k) for k in range(n))
+        self._best = 0
+        self._best_cap = 0
+        self._nodes = 0
+        self._deadline = None
+        self.stop = stop
+
+    def _parallel_class(self, k: int):
+        """Bitmasks of the lines with the direction e_k, which partition the deck"""
+        lines, frame = self.lines, self.frame
+        line_masks = lines.line_masks
+        found = {}
+        for card_id in range(lines.size):
+            other = self.game.encoding.add_table[card_id * lines.size + frame[k + 1]]
+            line_id = lines.line_of(card_id, other)
+            found[line_id] = line_masks[line_id]
+        return tuple(found.values())
+
+    def _add(self, cap: int, candidates: int, card_id: int):
+        """Candidates left after the card is added to the cap (cap includes the card)"""
+        line_masks, m = self.lines.line_masks, self.lines.n_attribute_values
+        for line_id in self.lines.lines_through(card_id):
+            line_mask = line_masks[line_id]
+            if (line_mask & cap).bit_count() == m - 1:
+                candidates &= ~line_mask
+        return candidates
+
+    def _bound(self, cap: int, candidates: int):
+        """Largest cap reachable, as each line of a parallel class holds at most m - 1 cards of a cap"""
+        reachable, m = cap | candidates, self.lines.n_attribute_values
+        return min(
+            sum(min((reachable & line).bit_count(), m - 1) for line in lines)
+            for lines in self.parallel_classes
+        )
+
+    def _record(self, cap: int, size: int):
+        if size > self._best:
+            self._best, self._best_cap = size, cap
+
+    def _search(self, cap: int, candidates: int, size: int):
+        self._nodes += 1
+        if self._nodes & 0xFF == 0:
+            if self._deadline is not None and time() > self._deadline:
+                raise _OutOfTime()
+            if self.stop is not None and self.stop.is_set():
+                raise _OutOfTime()
+        self._record(cap, size)
+        if self.target is not None and self._best >= self.target:
+            return
+        while candidates:
+            if size + candidates.bit_count() <= self._best:
+                return
+            if self._bound(cap, candidates) <= self._best:
+                return
+            bit = candidates & -candidates
+            candidates ^= bit
+            new_cap = cap | bit
+            self._search(
+                new_cap, self._add(new_cap, candidates, bit.bit_length() - 1), size + 1
+            )
+            if self.target is not None and self._best >= self.target:
+                return
+
+    def root(self):
+        """Cap of the frame and its candidates"""
+        cap, candidates = 0, (1 << self.lines.size) - 1
+        for card_id in self.frame:
+            cap |= 1 << card_id
+            candidates = self._add(cap, candidates & ~(1 << card_id), card_id)
+        return cap, candidates
+
+    def tasks(self):
+        """First card added to the frame of every task, in search order"""
+        _, candidates = self.root()
+        tasks = []
+        while candidates:
+            bit = candidates & -candidates
+            candidates ^= bit
+            tasks.append(bit.bit_length() - 1)
+        return tasks
+
+    def run_task(self, task: int, best: int = 0, deadline: float = None):
+        """
+        Searches the caps whose first card after the frame is task, above the best size passed, until the deadline
+        (a time() timestamp). Result: (best size, best cap mask, nodes, if the task was exhausted).
+        """
+        self._best, self._best_cap, self._nodes = best, 0, 0
+        self._deadline = deadline
+        cap, candidates = self.root()
+        bit = 1 << task
+        # Cards before the task card belong to previous tasks
+        candidates &= ~((bit << 1) - 1)
+        cap |= bit
+        try:
+            self._search(cap, self._add(cap, candidates, task), cap.bit_count())
+        except _OutOfTime:
+            return self._best, self._best_cap, self._nodes, False
+        return self._best, self._best_cap, self._nodes, True
+
+    def decode(self, cap: int):
+        card_ids = (card_id for card_id in range(self.lines.size) if cap >> card_id & 1)
+        return tuple(self.game.encoding.decode_all(card_ids))
+
+
+# Stop event of the worker processes, set when the target is reached
+_stop: Event = None
+
+
+def _init_worker(stop: Event):
+    global _stop
+    _stop = stop
+
+
+def _run_task(args):
+    n_attributes, n_attribute_values, target, task, best, deadline = args
+    searcher = CapSearch(SETGame(n_attributes, n_attribute_values), target, _stop)
+    return (task, *searcher.run_task(task, best, deadline))
+
+
+def _load_checkpoint(path: str, n_attributes: int, n_attribute_values: int):
+    """Best cap ids and done tasks of a checkpoint of the same geometry, or empty ones"""
+    if path is None or not os.path.exists(path):
+        return [], []
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if (checkpoint["n"], checkpoint["m"]) != (n_attributes, n_attribute_values):
+        raise ValueError(f"Checkpoint {path} is from another geometry")
+    return checkpoint["best"], checkpoint["done"]
+
+
+def _save_checkpoint(path: str, checkpoint: Dict):
+    """Writes the checkpoint atomically, so an interrupted run never leaves it corrupted"""
+    if path is None:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def search_caps(
+    n_attributes: int,
+    n_attribute_values: int,
+    time_budget: float = None,
+    workers: int = None,
+    checkpoint: str = None,
+    target: int = None,
+):
+    """
+    Searches the largest cap of AG(n, m) for up to time_budget seconds over a pool of processes, resuming from
+    the checkpoint file if it exists. The tasks are submitted as the workers get free, each one with the best
+    size found so far as its bound, and the search stops at the target (by default the known maximum).
+    workers is the number of processes (by default one per CPU), 1 to search in the current process.
+    """
+    start = time()
+    deadline = start + time_budget if time_budget is not None else None
+    game = SETGame(n_attributes, n_attribute_values)
+    searcher = CapSearch(game, target)
+    target = searcher.target
+    best_ids, done = _load_checkpoint(checkpoint, n_attributes, n_attribute_values)
+    best_cap = sum(1 << card_id for card_id in best_ids)
+    if not best_cap:
+        best_cap = searcher.root()[0]
+    all_tasks = searcher.tasks()
+    done = set(done)
+    pending: List[int] = [task for task in all_tasks if task not in done]
+    result = CapResult(n_tasks=len(all_tasks))
+
+    def reached():
+        return target is not None and best_cap.bit_count() >= target
+
+    def update(task: int, size: int, cap: int, nodes: int, exhausted: bool):
+        nonlocal best_cap
+        result.nodes += nodes
+        if size > best_cap.bit_count():
+            best_cap = cap
+        if exhausted:
+            done.add(task)
+        _save_checkpoint(
+            checkpoint,
+            {
+                "n": n_attributes,
+                "m": n_attribute_values,
+                "best": [i for i in range(game.lines.size) if best_cap >> i & 1],
+                "done": sorted(done),
+            },
+        )
+
+    if workers == 1:
+        for task in pending:
+            if reached() or (deadline is not None and time() > deadline):
+                break
+            update(task, *searcher.run_task(task, best_cap.bit_count(), deadline))
+    else:
+        stop = Event()
+        n_workers = workers if workers is not None else os.cpu_count() or 1
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(stop,)
+        ) as executor:
+            running = set()
+            while (pending or running) and not reached():
+                while pending and len(running) < n_workers:
+                    args = (n_attributes, n_attribute_values, target, pending.pop(0))
+                    running.add(
+                        executor.submit(_run_task, (*args, best_cap.bit_count(), deadline))
+                    )
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    update(*future.result())
+                if deadline is not None and time() > deadline:
+                    pending = []
+            stop.set()
+    result.cards = searcher.decode(best_cap)
+    result.tasks_done = len(done)
+    result.exact = len(done) == len(all_tasks)
+    result.elapsed = time() - start
+    return result
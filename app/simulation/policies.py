@@ -0,0 +1,23 @@
+"""
+    Move policies for the simulation of games. A policy receives the game and its valid moves on the table
+    (game.table_moves()) and returns the selection of cards to play, or None to stop playing.
+    Policies must be module level functions so they can be sent to worker processes.
+"""
+from typing import Tuple, FrozenSet
+
+from set_components import SETDeck
+
+
+def first_move(game: SETDeck, moves: Tuple[FrozenSet[Tuple[int]]]):
+    """Plays the first valid move found"""
+    return moves[0] if moves else None
+
+
+def random_move(game: SETDeck, moves: Tuple[FrozenSet[Tuple[int]]]):
+    """Plays a random valid move, drawn with the random generator of the game"""
+    return game.rng.choice(moves) if moves else None
+
+
+def largest_move(game: SETDeck, moves: Tuple[FrozenSet[Tuple[int]]]):
+    """Plays the valid move with the most cards (comets over planets over SETs, triple intersets...)"""
+    return max(moves, key=len) if moves else None
@@ -0,0 +1,138 @@
+"""
+    Monte Carlo simulation of complete games of any mode of set_components, run over a pool of processes.
+"""
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Dict, Type
+
+from set_components import SETDeck, EndGame
+from .policies import first_move
+
+
+@dataclass
+class SimulationResult:
+    """
+    Merged statistics of a group of simulated games.
+        - games: Number of games played.
+        - scores: Distribution of the final scores.
+        - rounds: Distribution of the successful rounds per game.
+        - refills: Number of successful rounds, each followed by a refill of the table.
+        - set_free_tables: Number of refills after which the table had no valid move while the deck had cards left.
+        - invalid_moves: Number of moves rejected by the game.
+    """
+
+    games: int = 0
+    scores: Counter = field(default_factory=Counter)
+    rounds: Counter = field(default_factory=Counter)
+    refills: int = 0
+    set_free_tables: int = 0
+    invalid_moves: int = 0
+
+    def merge(self, other: "SimulationResult"):
+        self.games += other.games
+        self.scores.update(other.scores)
+        self.rounds.update(other.rounds)
+        self.refills += other.refills
+        self.set_free_tables += other.set_free_tables
+        self.invalid_moves += other.invalid_moves
+        return self
+
+    @property
+    def mean_score(self):
+        return sum(s * c for s, c in self.scores.items()) / max(self.games, 1)
+
+    @property
+    def mean_rounds(self):
+        return sum(r * c for r, c in self.rounds.items()) / max(self.games, 1)
+
+    @property
+    def set_free_frequency(self):
+        """Frequency of tables without a valid move after a refill"""
+        return self.set_free_tables / max(self.refills, 1)
+
+
+def play_game(
+    game: SETDeck,
+    policy: Callable = first_move,
+    max_rounds: int = 10_000,
+    on_round: Callable[[float], None] = None,
+):
+    """
+    Plays a complete game with the policy passed and returns its statistics. on_round, if passed, is called with
+    the seconds of every successful round, from the search of the valid moves to the end of the round.
+    """
+    result = SimulationResult(games=1)
+    game.start_game()
+    n_rounds = 0
+    while n_rounds < max_rounds:
+        round_start = perf_counter() if on_round is not None else 0.0
+        moves = game.table_moves()
+        if n_rounds and not moves and len(game.deck):
+            result.set_free_tables += 1
+        selection = policy(game, moves)
+        if selection is None:
+            break
+        if game.play_round(selection) is None:
+            result.invalid_moves += 1
+            break
+        if on_round is not None:
+            on_round(perf_counter() - round_start)
+        n_rounds += 1
+    if isinstance(game, EndGame) and game.hold_card_remaining() and game.is_game_end():
+        game.guess_hold_card(game.deduce_hold_card())
+    result.refills = n_rounds
+    result.scores[game.score] += 1
+    result.rounds[n_rounds] += 1
+    return result
+
+
+def simulate_games(
+    game_class: Type[SETDeck],
+    n_games: int,
+    policy: Callable = first_move,
+    game_kwargs: Dict = None,
+    seed: int = None,
+):
+    """Plays n_games games in the current process, with the random generator of the game seeded by seed"""
+    game_kwargs = game_kwargs or {}
+    game = game_class(**game_kwargs, seed=seed)
+    result = SimulationResult()
+    for _ in range(n_games):
+        result.merge(play_game(game, policy))
+    return result
+
+
+def _simulate_chunk(args):
+    return simulate_games(*args)
+
+
+def simulate(
+    game_class: Type[SETDeck],
+    n_games: int,
+    policy: Callable = first_move,
+    game_kwargs: Dict = None,
+    seed: int = 0,
+    workers: int = None,
+    chunk_size: int = 1_000,
+):
+    """
+    Plays n_games complete games of game_class over a pool of processes and merges their statistics.
+    The games are split in chunks of chunk_size games, each one seeded with seed + chunk index, so the result
+    only depends on the seed and the chunk size, and not on the number of workers.
+    """
+    game_kwargs = game_kwargs or {}
+    chunks = [
+        (game_class, min(chunk_size, n_games - start), policy, game_kwargs, seed + idx)
+        for idx, start in enumerate(range(0, n_games, chunk_size))
+    ]
+    result = SimulationResult()
+    if workers == 1:
+        for chunk in chunks:
+            result.merge(_simulate_chunk(chunk))
+        return result
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_result in executor.map(_simulate_chunk, chunks):
+            result.merge(chunk_result)
+    return result
@@ -0,0 +1,314 @@
+"""
+    Exact solvers for the optimal play of a solitary game of SET (SETGame).
+    - SETSolver plays a fixed deal order with the rules of the physical game: the table is refilled with the next
+        cards of the deal order after every SET, and when the table has no SET the next m cards are added to it.
+        A state of the game is then the bitmask of the table and the position in the deal order, and the search is
+        memoized by that key. Its deal order is not the one of a seeded SETGame.
+    - GameSolver plays the engine itself: every branch is a clone of a started SETGame after play_round, so the
+        draws come from the seeded random generator and the refill policy of the game, and its optimum can be
+        compared with the score of a player or a bot on the same seeded game.
+"""
+from dataclasses import dataclass, field
+from random import Random
+from time import perf_counter
+from typing import Iterable, List, Sequence, Tuple
+
+from set_components import SETGame
+from set_components.card_set import CardSet
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+# Memoized move of the states without SETs, where the next m cards are added to the table
+_EXTEND = -1
+
+
+@dataclass
+class SolveResult:
+    """
+    Result of the solver.
+        - score: Best score found, set_score per SET.
+        - sets: Cards of each SET played to obtain the score, in order.
+        - exact: If the score is the optimal one, False when the time budget ran out first.
+        - nodes: Number of states expanded.
+        - elapsed: Seconds spent in the search.
+    """
+
+    score: int = 0
+    sets: List[Tuple[Tuple[int]]] = field(default_factory=list)
+    exact: bool = True
+    nodes: int = 0
+    elapsed: float = 0.0
+
+
+def deal_order(game: SETGame, seed: int = None):
+    """Deal order of a SETSolver, the card ids of the deck shuffled with the seed (not the draws of a seeded SETGame)"""
+    order = list(range(len(game.deck_cards)))
+    Random(seed).shuffle(order)
+    return tuple(order)
+
+
+class SETSolver:
+    """
+    SETSolver computes the maximum number of SETs of a deal with a depth first search over the table states,
+    with a transposition table of the exact values and a branch and bound on the cards left.
+        - game: The SETGame (with packed cards) that gives the geometry, the table size and the SET score.
+        - order: Card ids in the order of the deal.
+        - memo: Transposition table, (table mask, deal position) -> (SETs left to find, best line id or _EXTEND).
+    """
+
+    def __init__(self, game: SETGame, order: Sequence[int]):
+        if game.lines is None:
+            raise ValueError("The solver needs a game with packed cards")
+        self.game = game
+        self.lines = game.lines
+        self.order = tuple(order)
+        self.masks = tuple(1 << card_id for card_id in self.order)
+        self.memo = {}
+        self._best = -1
+        self._best_path = []
+        self._path = []
+        self._pruned = 0
+        self._nodes = 0
+        self._deadline = None
+
+    def _refill(self, table: int, pos: int, to_refill: int = None):
+        """Fills the table with the next cards of the deal order (or adds to_refill cards)"""
+        if to_refill is None:
+            to_refill = self.game.table_size - table.bit_count()
+        end = min(pos + max(to_refill, 0), len(self.order))
+        for mask in self.masks[pos:end]:
+            table |= mask
+        return table, end
+
+    def _table_lines(self, table: int):
+        """Line ids of the SETs on the table"""
+        return self._new_lines(table, (), CardSet(table))
+
+    def _new_lines(
+        self, table: int, table_lines: Sequence[int], card_ids: Iterable[int]
+    ):
+        """Line ids of the SETs on the table, from the ones of the table before the cards passed were added"""
+        line_masks = self.lines.line_masks
+        found = set(table_lines)
+        for card_id in card_ids:
+            for line_id in self.lines.lines_through(card_id):
+                if line_id not in found and line_masks[line_id] & ~table == 0:
+                    found.add(line_id)
+        return tuple(sorted(found))
+
+    def _child(self, table: int, pos: int, table_lines: Sequence[int], line_id: int):
+        """State after the SET line_id is played (or after the extension of the table, with _EXTEND)"""
+        line_masks = self.lines.line_masks
+        if line_id == _EXTEND:
+            new_table, end = self._refill(table, pos, self.lines.n_attribute_values)
+        else:
+            line_mask = line_masks[line_id]
+            table_lines = [l for l in table_lines if line_masks[l] & line_mask == 0]
+            new_table, end = self._refill(table & ~line_mask, pos)
+        return new_table, end, self._new_lines(new_table, table_lines, self.order[pos:end])
+
+    def _memo_path(self, key: Tuple[int, int]):
+        """Line ids of the best play from a memoized state"""
+        path = []
+        line_masks = self.lines.line_masks
+        while key in self.memo and self.memo[key][1] is not None:
+            line_id = self.memo[key][1]
+            if line_id == _EXTEND:
+                key = self._refill(*key, self.lines.n_attribute_values)
+                continue
+            path.append(line_id)
+            key = self._refill(key[0] & ~line_masks[line_id], key[1])
+        return path
+
+    def _record(self, total: int, key: Tuple[int, int]):
+        if total > self._best:
+            self._best = total
+            self._best_path = self._path + self._memo_path(key)
+
+    def _search(self, table: int, pos: int, table_lines: Sequence[int]):
+        """Maximum number of SETs from the state, exact if no branch was pruned below it"""
+        key = (table, pos)
+        found = len(self._path)
+        if key in self.memo:
+            self._record(found + self.memo[key][0], key)
+            return self.memo[key][0]
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 0x3F == 0:
+            if perf_counter() > self._deadline:
+                raise _OutOfTime()
+        m = self.lines.n_attribute_values
+        upper = (table.bit_count() + len(self.order) - pos) // m
+        if found + upper <= self._best:
+            self._pruned += 1
+            return 0
+        pruned = self._pruned
+        best_value, best_line = 0, None
+        if not table_lines and pos < len(self.order):
+            best_value = self._search(*self._child(table, pos, table_lines, _EXTEND))
+            if pruned == self._pruned or best_value == upper:
+                self.memo[key] = (best_value, _EXTEND)
+            return best_value
+        for line_id in table_lines:
+            self._path.append(line_id)
+            value = 1 + self._search(*self._child(table, pos, table_lines, line_id))
+            self._path.pop()
+            if value > best_value:
+                best_value, best_line = value, line_id
+            if best_value == upper:
+                break
+        if best_line is None:
+            self._record(found, key)
+        if pruned == self._pruned or best_value == upper:
+            self.memo[key] = (best_value, best_line)
+        return best_value
+
+    def solve(self, time_budget: float = None):
+        """
+        Searches the best play of the deal, for up to time_budget seconds.
+        Result: The SolveResult, with the best play found if the budget ran out.
+        """
+        start = perf_counter()
+        self._deadline = start + time_budget if time_budget is not None else None
+        self._nodes = 0
+        exact = True
+        try:
+            table, pos = self._refill(0, 0)
+            self._search(table, pos, self._table_lines(table))
+        except _OutOfTime:
+            exact = False
+            self._path = []
+        decode_all = self.game.encoding.decode_all
+        return SolveResult(
+            score=max(self._best, 0) * self.game.set_score,
+            sets=[
+                tuple(decode_all(self.lines.cards_of(line_id)))
+                for line_id in self._best_path
+            ],
+            exact=exact,
+            nodes=self._nodes,
+            elapsed=perf_counter() - start,
+        )
+
+
+class GameSolver:
+    """
+    GameSolver computes the maximum number of SETs of a started SETGame (with packed cards) with a depth first
+    search over clones of the game, branching on play_round with every SET of the table. The draws of the engine
+    depend on the state of the random generator and on the order of the deck, which both depend on the whole
+    play so far, so a state is keyed by the table, the deck (in draw order) and the state of the random generator.
+    Two different plays almost never reach the same key: the memo does not work as a transposition table, and
+    the cost of solve() is the one of the full search tree, cut only by the bound on the cards left. Use
+    SETSolver, keyed by the table and the deal position, for a search with an effective transposition table.
+        - game: The started SETGame. It is not modified.
+        - memo: Exact values of the states searched, state key -> (SETs left to find, best SET or None), used to
+            rebuild the best play and by later calls of solve().
+    """
+
+    def __init__(self, game: SETGame):
+        if game.lines is None:
+            raise ValueError("The solver needs a game with packed cards")
+        self.game = game
+        self.memo = {}
+        self._best = -1
+        self._best_path = []
+        self._path = []
+        self._nodes = 0
+        self._deadline = None
+
+    def _key(self, game: SETGame):
+        """State key of the game, everything the next draws of the engine depend on"""
+        ids = game.encoding.ids
+        return (
+            game.table_set.mask,
+            tuple(ids[card] for card in game.deck),
+            game.rng.getstate(),
+        )
+
+    def _memo_path(self, game: SETGame):
+        """SETs of the best play from a memoized state of the game"""
+        path = []
+        key = self._key(game)
+        while key in self.memo and self.memo[key][1] is not None:
+            move = self.memo[key][1]
+            path.append(tuple(sorted(move)))
+            game = game.clone()
+            game.play_round(move)
+            key = self._key(game)
+        return path
+
+    def _record(self, total: int, game: SETGame):
+        if total > self._best:
+            self._best = total
+            self._best_path = self._path + self._memo_path(game)
+
+    def _search(self, game: SETGame):
+        """Maximum number of SETs from the state of the game, and if it is exact (no branch was pruned below it)"""
+        found = len(self._path)
+        key = self._key(game)
+        if key in self.memo:
+            self._record(found + self.memo[key][0], game)
+            return self.memo[key][0], True
+        self._nodes += 1
+        if self._deadline is not None and self._nodes & 0x3F == 0:
+            if perf_counter() > self._deadline:
+                raise _OutOfTime()
+        upper = (len(game.table_cards) + len(game.deck)) // game.n_attribute_values
+        if found + upper <= self._best:
+            return 0, False
+        best_value, best_move, exact = 0, None, True
+        for move in sorted(game.table_moves(), key=sorted):
+            child = game.clone()
+            child.play_round(move)
+            self._path.append(tuple(sorted(move)))
+            value, child_exact = self._search(child)
+            self._path.pop()
+            exact = exact and child_exact
+            if value + 1 > best_value:
+                best_value, best_move = value + 1, move
+            if best_value == upper:
+                exact = True
+                break
+        if best_move is None:
+            self._record(found, game)
+        if exact:
+            self.memo[key] = (best_value, best_move)
+        return best_value, exact
+
+    def solve(self, time_budget: float = None):
+        """
+        Searches the best play of the game, for up to time_budget seconds. There is no effective transposition
+        table (see the class), so the search is exponential in the number of SETs of the game.
+        Result: The SolveResult, with the best play found if the budget ran out.
+        """
+        start = perf_counter()
+        self._deadline = start + time_budget if time_budget is not None else None
+        self._nodes = 0
+        exact = True
+        try:
+            self._search(self.game.clone())
+        except _OutOfTime:
+            exact = False
+            self._path = []
+        return SolveResult(
+            score=max(self._best, 0) * self.game.set_score,
+            sets=list(self._best_path),
+            exact=exact,
+            nodes=self._nodes,
+            elapsed=perf_counter() - start,
+        )
+
+
+def solve(
+    n_attributes: int,
+    n_attribute_values: int,
+    seed: int = None,
+    set_score: int = 300,
+    time_budget: float = None,
+):
+    """Best score of the seeded SETGame, played with its own draws and refill policy (GameSolver)"""
+    game = SETGame(n_attributes, n_attribute_values, set_score=set_score, seed=seed)
+    game.start_game()
+    return GameSolver(game).solve(time_budget)
@@ -1,14 +1,11 @@
 from set_components import SETGame, EndGame, SETDeck
 from card_draw.set_structure_draw import SETStructureDraw
 from settings import *
+from bots import run_bot, greedy_score
 
 
-def auto_play(set_game: SETDeck):
-    print(list(set_game.all_intersets(set_game.table_cards)))
-    while set_game.check_table():
-        print(f"SETs in the deck: {list(set_game.table_sets())}")
-        print(f"Drawn cards: {set_game.play_round(next(set_game.table_sets()))}")
-        print()
+def auto_play(set_game: SETDeck, strategy=greedy_score):
+    print(run_bot(set_game, strategy).summary())
 
 def linearize(elems):
     elem_out = []
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The packages of the app are imported from the app folder, as when the app is run
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "app"))
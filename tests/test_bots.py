@@ -0,0 +1,16 @@
+import pytest
+
+from bots import run_bot, greedy_score
+from set_components import SETGame, EndGame, IntersetGame
+from simulation import play_game, first_move, random_move
+
+
+@pytest.mark.parametrize("game_class", [SETGame, EndGame, IntersetGame])
+@pytest.mark.parametrize("strategy", [first_move, random_move, greedy_score])
+def test_run_bot_plays_the_games_of_play_game(game_class, strategy):
+    report = run_bot(game_class(3, 3, seed=5), strategy, n_games=3)
+    game = game_class(3, 3, seed=5)
+    results = [play_game(game, strategy) for _ in range(3)]
+    assert report.games == 3
+    assert report.moves == len(report.latencies) == sum(result.refills for result in results)
+    assert report.scores == [next(iter(result.scores)) for result in results]
@@ -0,0 +1,12 @@
+import pytest
+
+from set_components import SETGame
+from simulation import KNOWN_MAX_CAPS, search_caps
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("n, m", [(2, 3), (3, 3)])
+def test_search_caps_finds_a_set_free_cap_of_the_known_size(n, m, workers):
+    result = search_caps(n, m, workers=workers)
+    assert result.size == KNOWN_MAX_CAPS[(n, m)]
+    assert not SETGame(n, m).has_set(result.cards)
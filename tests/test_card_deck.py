@@ -0,0 +1,41 @@
+from random import Random
+
+from set_components.card_deck import CardDeck
+
+CARDS = [(a, b) for a in range(5) for b in range(5)]
+
+
+def test_draw_remove_keep_every_card_once():
+    deck = CardDeck(CARDS, rng=Random(1))
+    drawn = list(deck.draw(7))
+    deck.remove([CARDS[0], CARDS[1], CARDS[0]])
+    left = list(deck)
+    assert len(deck) == len(left) == len(CARDS) - len(set(drawn) | {CARDS[0], CARDS[1]})
+    assert set(drawn) | set(left) | {CARDS[0], CARDS[1]} == set(CARDS)
+    assert not set(drawn) & set(left)
+    assert deck.cards() == frozenset(left)
+    assert all(card in deck for card in left) and CARDS[0] not in deck
+
+
+def test_draw_more_than_left():
+    deck = CardDeck(CARDS[:3], rng=Random(0))
+    assert len(deck.draw(10)) == 3 and len(deck) == 0 and deck.draw(1) == ()
+
+
+def test_draws_are_reproducible_from_the_seed():
+    first, second = CardDeck(CARDS, rng=Random(7)), CardDeck(CARDS, rng=Random(7))
+    assert first.draw(10) == second.draw(10)
+
+
+def test_copy_is_independent():
+    deck = CardDeck(CARDS, rng=Random(3))
+    copied = deck.copy(Random(3))
+    copied.draw(5)
+    assert len(deck) == len(CARDS) and len(copied) == len(CARDS) - 5
+
+
+def test_sample_does_not_remove():
+    deck = CardDeck(CARDS, rng=Random(2))
+    sample = deck.sample(4)
+    assert len(sample) == 4 and len(deck) == len(CARDS)
+    assert set(sample) <= deck.cards()
@@ -0,0 +1,45 @@
+from itertools import product
+
+import pytest
+
+from set_components import mod_vector as mv
+from set_components.card_encoding import card_encoding
+
+GEOMETRIES = [(2, 3), (3, 3), (4, 3), (2, 5), (3, 5)]
+
+
+@pytest.mark.parametrize("n, m", GEOMETRIES)
+def test_encode_decode_round_trip(n, m):
+    encoding = card_encoding(n, m)
+    assert encoding.size == m**n
+    assert set(encoding.cards) == set(mv.simple_affine_space_gen(n, m))
+    for card_id, card in enumerate(encoding.cards):
+        assert encoding.encode(card) == card_id
+        assert encoding.decode(card_id) == card
+        # Packed ids are little-endian base m
+        assert card_id == sum(value * m**i for i, value in enumerate(card))
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (2, 5), (3, 3)])
+def test_arithmetic_matches_mod_vector(n, m):
+    encoding = card_encoding(n, m)
+    cards = encoding.cards
+    for a, b in product(range(encoding.size), repeat=2):
+        assert cards[encoding.add(a, b)] == mv.mod_addition(cards[a], cards[b], m)
+        assert cards[encoding.sub(a, b)] == mv.mod_substraction(cards[a], cards[b], m)
+    for a in range(encoding.size):
+        for k in range(m):
+            assert cards[encoding.mul(a, k)] == mv.mod_product(cards[a], k, m)
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (3, 3), (2, 5)])
+def test_complete_line_is_a_line(n, m):
+    encoding = card_encoding(n, m)
+    for a in range(encoding.size):
+        for b in range(a + 1, encoding.size):
+            line = (a, b, *encoding.complete_line(a, b))
+            assert len(set(line)) == m
+            assert encoding.is_line(line)
+            assert mv.is_zero(mv.mod_mult_addition(encoding.decode_all(line), m))
+    assert not encoding.is_line((0,) * m)
+    assert not encoding.is_line((0, 1))
@@ -0,0 +1,29 @@
+from random import Random
+
+from set_components.card_set import CardSet
+
+
+def test_operations_match_frozenset():
+    rng = Random(0)
+    for _ in range(100):
+        a = frozenset(rng.sample(range(200), rng.randrange(30)))
+        b = frozenset(rng.sample(range(200), rng.randrange(30)))
+        sa, sb = CardSet.from_ids(a), CardSet.from_ids(b)
+        assert set(sa | sb) == a | b
+        assert set(sa & sb) == a & b
+        assert set(sa - sb) == a - b
+        assert set(sa ^ sb) == a ^ b
+        assert (sa <= sb) == (a <= b) and (sa < sb) == (a < b)
+        assert (sa >= sb) == (a >= b) and (sa > sb) == (a > b)
+        assert sa.isdisjoint(sb) == a.isdisjoint(b)
+        assert len(sa) == len(a) and bool(sa) == bool(a)
+        assert list(sa) == sorted(a)
+        assert all(card_id in sa for card_id in a)
+
+
+def test_immutable_add_discard_and_hash():
+    empty = CardSet()
+    one = empty.add(5)
+    assert 5 in one and 5 not in empty
+    assert one.discard(5) == empty
+    assert hash(CardSet.from_ids((1, 2))) == hash(CardSet.from_ids((2, 1)))
@@ -0,0 +1,49 @@
+import time
+
+import pytest
+
+from set_components import DealPool, SETGame
+
+
+class BrokenGame(SETGame):
+    """Game mode whose deals can never be graded"""
+
+    def all_sets(self, cards):
+        raise RuntimeError("broken mode")
+
+
+def wait_for(condition, timeout=10.0):
+    end = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > end:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_failed_batches_are_recorded_and_the_pool_keeps_filling(workers):
+    pool = DealPool(capacity=2, batch_size=1, workers=workers, seed=0)
+    try:
+        broken_key = pool.reserve(BrokenGame(3, 3), 1)
+        key = pool.reserve(SETGame(3, 3), 1)
+        assert wait_for(lambda: len(pool.buckets[key]) == pool.capacity)
+        assert wait_for(lambda: pool.stats[broken_key].failures >= 1)
+        assert "broken mode" in pool.stats[broken_key].last_error
+        assert not pool.buckets[broken_key]
+        assert "failed batches" in pool.report()
+    finally:
+        pool.close()
+
+
+def test_an_expensive_bucket_does_not_starve_the_cheap_ones():
+    pool = DealPool(capacity=4, batch_size=1, seed=0)
+    try:
+        game = SETGame(4, 3)
+        # No table of 12 cards holds 60 SETs, so its searches always run every step
+        impossible = pool.reserve(game, 60)
+        key = pool.reserve(game, 1)
+        assert wait_for(lambda: len(pool.buckets[key]) == pool.capacity, timeout=1.5)
+        assert pool.stats[impossible].generated == 0
+    finally:
+        pool.close()
@@ -0,0 +1,33 @@
+from set_components import EndGame
+
+
+def play_to_end(game):
+    game.start_game()
+    while not game.is_game_end():
+        moves = game.table_moves()
+        assert moves, "SET-free table with cards left in the deck"
+        game.play_round(tuple(min(moves, key=sorted)))
+
+
+def test_wrong_guesses_can_be_retried_until_correct():
+    game = EndGame(3, 3, seed=4)
+    play_to_end(game)
+    hold_card = game.hold_card
+    assert game.deduce_hold_card() == hold_card
+    wrong = next(card for card in game.deck_cards if card != hold_card)
+    score = game.score
+    assert not game.guess_hold_card(wrong)
+    assert game.hold_card_remaining() and game.score < score
+    score = game.score
+    assert game.guess_hold_card(hold_card)
+    assert not game.hold_card_remaining() and hold_card in game.table_cards
+    assert game.score == score + game.end_guess_score
+
+
+def test_reveal_places_the_card_without_scoring():
+    game = EndGame(3, 3, seed=5)
+    play_to_end(game)
+    hold_card, score = game.hold_card, game.score
+    assert game.reveal_hold_card() == hold_card
+    assert not game.hold_card_remaining() and hold_card in game.table_cards
+    assert game.score == score
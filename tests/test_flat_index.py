@@ -0,0 +1,66 @@
+from itertools import combinations
+from random import Random
+
+import pytest
+
+from set_components import SETPlanetComet
+from set_components import mod_vector as mv
+from set_components import flat_index as fx
+from set_components.card_encoding import card_encoding
+
+
+@pytest.mark.parametrize("n, m, k", [(2, 3, 1), (3, 3, 2), (4, 3, 2), (3, 5, 2), (3, 3, 1)])
+def test_flats_are_a_partition_per_direction(n, m, k):
+    index = fx.flat_index(n, m, k)
+    assert index.n_flats == fx.count_flats(n, m, k)
+    assert index.n_flats == len(index.directions) * index.n_cosets
+    flats = set()
+    for flat_id in range(index.n_flats):
+        cards = index.cards_of(flat_id)
+        assert len(cards) == m**k
+        assert index.flat_of(sorted(cards)) == flat_id
+        flats.add(cards)
+    assert len(flats) == index.n_flats
+    n_through = fx.count_flats_through_point(n, m, k)
+    assert sum(0 in cards for cards in flats) == n_through
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (2, 5)])
+def test_planes_match_generated_affine_spaces(n, m):
+    index = fx.flat_index(n, m, 2)
+    encoding = card_encoding(n, m)
+    for a, b, c in list(combinations(range(encoding.size), 3))[:300]:
+        p0, p1, p2 = encoding.decode_all((a, b, c))
+        base = (mv.mod_substraction(p1, p0, m), mv.mod_substraction(p2, p0, m))
+        flat_id = index.flat_of((a, b, c))
+        if not mv.is_linear_indepent(base, m):
+            assert flat_id is None
+            continue
+        plane = frozenset(mv.generate_mod_affine_space(p0, base, m))
+        assert index.cards_of(flat_id) == frozenset(encoding.encode_all(plane))
+
+
+def test_flats_meeting_covers_every_flat_through_the_cards():
+    n, m = 3, 3
+    index = fx.flat_index(n, m, 2)
+    card_ids = (0, 5, 13)
+    met = dict(index.flats_meeting(card_ids))
+    for flat_id in range(index.n_flats):
+        meeting = index.cards_of(flat_id) & set(card_ids)
+        assert (flat_id in met) == bool(meeting)
+        if meeting:
+            assert set(met[flat_id]) == meeting
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5), (3, 5)])
+@pytest.mark.parametrize("n_cards", [5, 9, 12, 16])
+def test_planets_match_the_planes_of_every_direction(n, m, n_cards):
+    game = SETPlanetComet(n, m)
+    rng = Random(n_cards)
+    deck = sorted(game.deck_cards)
+    n_planet = 2 * (m - 1)
+    for _ in range(20):
+        cards = frozenset(rng.sample(deck, min(n_cards, len(deck))))
+        planets = list(game.all_planets(cards))
+        assert len(planets) == len(set(planets))
+        assert set(planets) == set(game.all_planes(cards, n_planet))
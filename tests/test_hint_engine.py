@@ -0,0 +1,26 @@
+import pytest
+
+from set_components import SETGame, IntersetGame, SETPlanetComet, HintEngine
+
+
+@pytest.mark.parametrize(
+    "game", [SETGame(4, 3, seed=1), IntersetGame(4, 3, seed=2), SETPlanetComet(3, 3, seed=3)]
+)
+def test_hints_follow_the_table(game):
+    game.start_game()
+    engine = HintEngine(game)
+    try:
+        for _ in range(6):
+            engine.refresh()
+            moves = engine.moves(timeout=10)
+            assert engine.ready()
+            assert set(moves) == set(game.moves(game.table_cards))
+            hint = engine.hint(timeout=0)
+            if hint is None:
+                break
+            assert hint in moves
+            selected = sorted(hint)[:1]
+            assert set(selected) <= engine.hint(selected, timeout=0)
+            game.play_round(tuple(hint))
+    finally:
+        engine.shutdown()
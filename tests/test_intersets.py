@@ -0,0 +1,34 @@
+from itertools import combinations
+from random import Random
+
+import pytest
+
+from set_components import SETGame
+
+
+def canonical(intersets):
+    return {(frozenset(int_card), frozenset(map(frozenset, sets))) for int_card, sets in intersets}
+
+
+def test_a_partial_set_of_a_5_valued_deck_is_not_an_interset():
+    game = SETGame(3, 5, packed=False)
+    line = sorted(game.complete_set((0, 0, 0), (1, 0, 0)).union({(0, 0, 0), (1, 0, 0)}))
+    partial = frozenset(line[:4])
+    # Before the dedup of the lines, each of the 6 pairs of the partial SET yielded it again
+    assert len(list(combinations(partial, 2))) == 6
+    possible = list(game._possible_intersets(partial))
+    assert possible == [(frozenset(line[4:]), partial)]
+    assert game.all_intersets(partial) == ()
+    assert not game.has_interset(partial)
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5), (3, 5)])
+def test_unpacked_intersets_match_the_interset_engine(n, m):
+    packed, unpacked = SETGame(n, m), SETGame(n, m, packed=False)
+    rng = Random(m)
+    deck = sorted(packed.deck_cards)
+    for _ in range(20):
+        cards = rng.sample(deck, min(len(deck), 3 * m))
+        possible = list(unpacked._possible_intersets(cards))
+        assert len(possible) == len(set(possible))
+        assert canonical(unpacked.all_intersets(cards)) == canonical(packed.all_intersets(cards))
@@ -0,0 +1,72 @@
+from random import Random
+
+import pytest
+
+from set_components import SETGame
+from set_components.line_index import line_index
+from set_components.table_lines import TableLines
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (3, 3), (4, 3), (2, 5), (3, 5)])
+def test_line_index_counts_and_lookup(n, m):
+    lines = line_index(n, m)
+    size = m**n
+    assert lines.lines_per_card == (size - 1) // (m - 1)
+    assert lines.n_lines == size * lines.lines_per_card // m
+    seen = set()
+    for line_id in range(lines.n_lines):
+        cards = lines.cards_of(line_id)
+        assert list(cards) == sorted(cards) and len(set(cards)) == m
+        assert lines.is_line(cards)
+        for a in cards:
+            assert line_id in lines.lines_through(a)
+            for b in cards:
+                if a != b:
+                    assert lines.line_of(a, b) == line_id
+        seen.add(cards)
+    assert len(seen) == lines.n_lines
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5)])
+def test_line_masks(n, m):
+    lines = line_index(n, m)
+    for line_id in range(lines.n_lines):
+        mask = lines.line_masks[line_id]
+        assert [c for c in range(lines.size) if mask >> c & 1] == list(
+            lines.cards_of(line_id)
+        )
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5)])
+def test_table_lines_match_unpacked_sets(n, m):
+    lines = line_index(n, m)
+    unpacked = SETGame(n, m, packed=False)
+    decode_all = lines.encoding.decode_all
+    rng = Random(n * m)
+    table = TableLines(lines)
+    cards = set()
+    for _ in range(200):
+        added = set(rng.sample(range(lines.size), 3)) - cards
+        removed = set(rng.sample(sorted(cards), min(2, len(cards))))
+        table.update(added=added, removed=removed)
+        cards = (cards - removed) | added
+        expected = {frozenset(s) for s in unpacked.all_sets(decode_all(cards))}
+        found = {frozenset(decode_all(s)) for s in table.sets()}
+        assert found == expected
+        assert table.n_sets == len(expected)
+        for line_id, pairs in table.line_pairs.items():
+            on_line = len(cards & set(lines.cards_of(line_id)))
+            assert table.cards_on_line(line_id) == on_line
+            assert pairs == on_line * (on_line - 1) // 2
+        if len(cards) > 3 * m:
+            table.update(removed=set(cards))
+            cards = set()
+            assert not table.line_pairs and not table.full_lines
+
+
+def test_table_lines_copy_is_independent():
+    table = TableLines(line_index(3, 3))
+    table.update(added=(0, 1, 2))
+    copied = table.copy()
+    copied.update(removed=(0,))
+    assert table.n_sets == 1 and copied.n_sets == 0
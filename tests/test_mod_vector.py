@@ -0,0 +1,44 @@
+from itertools import product
+from random import Random
+
+import pytest
+
+from set_components import mod_vector as mv
+
+
+def span(vectors, n, m):
+    """Brute force span of the vectors"""
+    points = {(0,) * n}
+    for v in vectors:
+        points = {
+            mv.mod_addition(p, mv.mod_product(v, k, m), m) for p in points for k in range(m)
+        }
+    return points
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (3, 5)])
+def test_echelon_basis_rank_and_membership(n, m):
+    rng = Random(n * m)
+    for _ in range(30):
+        vectors = [tuple(rng.randrange(m) for _ in range(n)) for _ in range(rng.randrange(1, n + 2))]
+        basis = mv.ModEchelonBasis(n, m)
+        added = [v for v in vectors if basis.add(v)]
+        spanned = span(vectors, n, m)
+        assert len(spanned) == m**basis.rank
+        assert span(added, n, m) == spanned
+        for v in product(range(m), repeat=n):
+            assert basis.contains(v) == (v in spanned)
+        assert mv.is_linear_indepent(added, m)
+        for row, pivot in zip(basis.rows, basis.pivots):
+            assert row[pivot] == 1
+            assert all(other[pivot] == 0 for other in basis.rows if other is not row)
+
+
+def test_reduced_basis_is_canonical():
+    m = 3
+    first, second = mv.ModEchelonBasis(3, m), mv.ModEchelonBasis(3, m)
+    for v in ((1, 1, 0), (0, 1, 2)):
+        first.add(v)
+    for v in ((1, 2, 2), (1, 0, 1)):
+        second.add(v)
+    assert first.reduced_basis() == second.reduced_basis()
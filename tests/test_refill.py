@@ -0,0 +1,62 @@
+import pytest
+
+from set_components import SETGame
+from set_components.game_settings import REFILL_UNIFORM, REFILL_AT_LEAST, REFILL_EXACTLY
+
+
+def play_rounds(game):
+    """Plays the first SET of the table until the game ends, yielding the SETs left before every refill"""
+    game.start_game()
+    yield 0
+    while game.table_moves():
+        card_set = sorted(game.table_moves(), key=sorted)[0]
+        left = sum(1 for s in game.table_moves() if s.isdisjoint(card_set))
+        game.play_round(card_set)
+        yield left
+
+
+def deck_allows_it(game):
+    # Near the end of the deck the policies fall back to the cards that are left
+    return len(game.deck) >= 2 * game.table_size
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5)])
+@pytest.mark.parametrize("refill_sets", [1, 2])
+@pytest.mark.parametrize("seed", range(5))
+def test_refill_exactly(n, m, refill_sets, seed):
+    game = SETGame(n, m, seed=seed, refill_policy=REFILL_EXACTLY, refill_sets=refill_sets)
+    for left in play_rounds(game):
+        assert game.table_set_count() == len(game.all_sets(game.table_cards))
+        if deck_allows_it(game):
+            assert game.table_set_count() == max(refill_sets, left)
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (2, 5)])
+@pytest.mark.parametrize("refill_sets", [1, 2])
+@pytest.mark.parametrize("seed", range(5))
+def test_refill_at_least(n, m, refill_sets, seed):
+    game = SETGame(n, m, seed=seed, refill_policy=REFILL_AT_LEAST, refill_sets=refill_sets)
+    for _ in play_rounds(game):
+        assert game.table_set_count() == len(game.all_sets(game.table_cards))
+        if deck_allows_it(game):
+            assert game.table_set_count() >= refill_sets
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3)])
+@pytest.mark.parametrize("seed", range(5))
+def test_refill_uniform(n, m, seed):
+    game = SETGame(n, m, seed=seed, refill_policy=REFILL_UNIFORM)
+    for _ in play_rounds(game):
+        assert game.table_set_count() == len(game.all_sets(game.table_cards))
+        assert len(game.table_cards) == min(game.table_size, len(game.table_cards) + len(game.deck))
+
+
+def test_place_sets_skips_the_deck_mask_when_the_table_has_enough_sets(monkeypatch):
+    game = SETGame(4, 3, seed=0, refill_policy=REFILL_AT_LEAST, refill_sets=1)
+    game.start_game()
+    assert game.table_set_count() >= 1
+    masked = []
+    card_set = game.card_set
+    monkeypatch.setattr(game, "card_set", lambda cards: masked.append(cards) or card_set(cards))
+    assert game._place_sets(3) == []
+    assert masked == []
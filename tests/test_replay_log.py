@@ -0,0 +1,65 @@
+import io
+
+from set_components import SETGame, IntersetGame, GameRecorder, read_games
+from set_components.game_settings import TABLE_EVENT
+from set_components.replay_log import (
+    read_ids,
+    read_varint,
+    unzigzag,
+    write_ids,
+    write_varint,
+    zigzag,
+)
+
+
+def test_varint_zigzag_and_ids_round_trip():
+    out = bytearray()
+    values = [0, 1, 127, 128, 300, 2**40]
+    for value in values:
+        write_varint(out, value)
+    pos = 0
+    for value in values:
+        read, pos = read_varint(out, pos)
+        assert read == value
+    for value in (-(2**20), -1, 0, 1, 2**20):
+        assert unzigzag(zigzag(value)) == value
+    out = bytearray()
+    write_ids(out, [9, 3, 600, 4])
+    assert read_ids(out, 0) == ([3, 4, 9, 600], len(out))
+
+
+def play(game, recorder, tables):
+    recorder.begin()
+    tables.append(game.table_cards)
+    game.subscribe(TABLE_EVENT, lambda change: tables.append(game.table_cards))
+    for _ in range(40):
+        moves = game.table_moves()
+        if not moves:
+            break
+        game.play_round(tuple(min(moves, key=sorted)))
+    recorder.end()
+    game.clear_listeners(TABLE_EVENT)
+
+
+def test_replay_rebuilds_every_table():
+    stream = io.BytesIO()
+    games = [SETGame(4, 3, seed=1), IntersetGame(3, 3, seed=2), SETGame(3, 5, packed=False, seed=3)]
+    all_tables = []
+    for game in games:
+        game.start_game()
+        tables = []
+        play(game, GameRecorder(game, stream, {"k": 1}, snapshot_every=4), tables)
+        all_tables.append(tables)
+    replays = list(read_games(stream.getvalue()))
+    assert len(replays) == len(games)
+    for replay, game, tables in zip(replays, games, all_tables):
+        assert (replay.n_attributes, replay.n_attribute_values) == (
+            game.n_attributes,
+            game.n_attribute_values,
+        )
+        assert replay.seed == game.seed and replay.packed == game.packed
+        assert replay.options == {"mode": type(game).__name__, "k": 1}
+        assert replay.n_steps + 1 == len(tables)
+        for step, table in enumerate(tables):
+            assert replay.table_at(step) == table
+        assert len(replay.step_times) == replay.n_steps
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from server.game_server import GameServer
+from server.load_test import Connection
+from server.protocol import *
+from server.rooms import RoomShard
+from set_components.replay_log import pack_card
+
+
+def over_the_wire(shard, request):
+    """Response of the shard to the request, both sent through the encoding of the protocol"""
+    request = decode_message(encode_message(request))
+    return decode_message(encode_message(shard.handle(request)))
+
+
+def a_set(game):
+    m = game.n_attribute_values
+    return [pack_card(card, m) for card in sorted(game.table_moves()[0])]
+
+
+def test_create_play_guess_close_round_trip():
+    shard = RoomShard()
+    create = {"op": CREATE, "room": 7, "mode": "end_game", "n": 2, "m": 3, "seed": 1, "id": 0}
+    state = over_the_wire(shard, create)
+    assert state["op"] == STATE and state["id"] == 0 and (state["n"], state["m"]) == (2, 3)
+    game = shard.rooms[7].game
+    table = set(state["table"])
+    while game.table_moves():
+        delta = over_the_wire(shard, {"op": PLAY, "room": 7, "cards": a_set(game)})
+        assert delta["op"] == DELTA and delta["valid"]
+        table = (table - set(delta["removed"])) | set(delta["added"])
+        assert table == {pack_card(card, 3) for card in game.table_cards}
+    invalid = over_the_wire(shard, {"op": PLAY, "room": 7, "cards": sorted(table)[:3]})
+    assert not invalid["valid"] and not invalid["removed"] and not invalid["added"]
+    hold_card = pack_card(game.deduce_hold_card(), 3)
+    delta = over_the_wire(shard, {"op": GUESS, "room": 7, "card": hold_card})
+    assert delta["valid"] and delta["added"] == [hold_card]
+    assert over_the_wire(shard, {"op": CLOSE, "room": 7}) == {"op": CLOSED, "room": 7}
+    assert over_the_wire(shard, {"op": JOIN, "room": 7})["op"] == ERROR
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        {"op": "dance"},
+        {"op": ["create"]},
+        {"op": CREATE, "room": 0, "mode": "poker"},
+        {"op": CREATE, "room": 0, "n": 9},
+        {"op": CREATE, "room": 0, "n": 3.0},
+        {"op": CREATE, "room": 0, "m": 4},
+        {"op": CREATE, "room": 0, "options": {"packed": False}},
+        {"op": CREATE, "room": 0, "options": {"__class__": 1}},
+        {"op": CREATE, "room": 0, "options": [1, 2]},
+        {"op": CREATE, "room": 0, "options": {"refill_policy": "never"}},
+        {"op": CREATE, "room": 0, "seed": [1]},
+        {"op": CREATE},
+        {"op": PLAY, "room": 0, "cards": "abc"},
+        {"op": PLAY, "room": 0, "cards": [None, {}]},
+        {"op": PLAY, "room": 0, "cards": [0, 1, 9]},
+        {"op": PLAY, "room": 0, "cards": [-1, 0, 1]},
+        {"op": PLAY, "room": 0, "cards": [0, 1, 2.0]},
+        {"op": GUESS, "room": 0, "card": 4},
+        {"op": GUESS, "room": 0},
+        {"op": CLOSE, "room": {}},
+    ],
+)
+def test_malformed_requests_are_answered_with_an_error(request_):
+    shard = RoomShard()
+    shard.handle({"op": CREATE, "room": 0, "n": 2, "m": 3, "seed": 0})
+    response = shard.handle({**request_, "id": 3})
+    assert response["op"] == ERROR and response["id"] == 3
+    # The shard keeps serving its rooms
+    assert shard.handle({"op": JOIN, "room": 0})["op"] == STATE
+
+
+def test_malformed_messages_are_rejected():
+    for line in (b"[1, 2]\n", b'{"room": 1}\n', b"{not json\n"):
+        with pytest.raises(ValueError):
+            decode_message(line)
+
+
+def test_server_round_trip():
+    async def run():
+        server = await GameServer().start()
+        try:
+            player = await Connection.open(server.host, server.port)
+            watcher = await Connection.open(server.host, server.port)
+            create = {"op": CREATE, "mode": "set_game", "n": 2, "m": 3, "seed": 2}
+            state = await player.request(create)
+            joined = await watcher.request({"op": JOIN, "room": state["room"]})
+            assert joined["table"] == state["table"]
+            game = server._local_shard.rooms[state["room"]].game
+            delta = await player.request({"op": PLAY, "room": state["room"], "cards": a_set(game)})
+            assert delta["valid"]
+            event = await asyncio.wait_for(watcher.events.get(), 5)
+            assert event == {k: v for k, v in delta.items() if k != "id"}
+            error = await player.request({"op": CREATE, "options": {"packed": False}})
+            assert error["op"] == ERROR
+            closed = await player.request({"op": CLOSE, "room": state["room"]})
+            assert closed["op"] == CLOSED
+            await player.close()
+            await watcher.close()
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+def test_a_shard_recovers_from_the_death_of_its_process():
+    async def run():
+        server = await GameServer(shards=1).start()
+        try:
+            player = await Connection.open(server.host, server.port)
+            create = {"op": CREATE, "mode": "set_game", "n": 2, "m": 3, "seed": 2}
+            state = await player.request(dict(create))
+            for process in list(server._executors[0]._processes.values()):
+                process.kill()
+                process.join()
+            lost = await asyncio.wait_for(player.request({"op": JOIN, "room": state["room"]}), 10)
+            assert lost["op"] == ERROR
+            # The shard is served by a new process, without the rooms of the dead one
+            assert (await asyncio.wait_for(player.request(dict(create)), 10))["op"] == STATE
+            await player.close()
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
@@ -0,0 +1,48 @@
+from collections import Counter
+from functools import partial
+
+import pytest
+
+from set_components import SETGame, EndGame, IntersetGame
+from simulation import SimulationResult, play_game, simulate, simulate_games, random_move
+
+
+def test_simulate_games_without_game_kwargs():
+    result = simulate_games(partial(SETGame, 3, 3), 4, seed=1)
+    assert result.games == 4
+
+
+@pytest.mark.parametrize("game_class", [SETGame, EndGame, IntersetGame])
+def test_simulate_does_not_depend_on_the_workers(game_class):
+    game_kwargs = {"n_attributes": 3, "n_attribute_values": 3}
+    kwargs = dict(n_games=30, policy=random_move, game_kwargs=game_kwargs)
+    in_process = simulate(game_class, workers=1, chunk_size=7, seed=4, **kwargs)
+    pooled = simulate(game_class, workers=3, chunk_size=7, seed=4, **kwargs)
+    assert in_process == pooled
+    assert in_process.games == 30
+
+
+def test_chunks_are_seeded_by_their_index():
+    kwargs = {"n_attributes": 3, "n_attribute_values": 3}
+    result = simulate(SETGame, 25, random_move, kwargs, seed=10, workers=1, chunk_size=10)
+    expected = SimulationResult()
+    for idx, n_games in enumerate((10, 10, 5)):
+        expected.merge(simulate_games(SETGame, n_games, random_move, kwargs, seed=10 + idx))
+    assert result == expected
+
+
+def test_merged_stats_add_up():
+    game = SETGame(3, 3, seed=2)
+    games = [play_game(game) for _ in range(6)]
+    merged = SimulationResult()
+    for result in games:
+        merged.merge(result)
+    assert merged.games == 6
+    assert merged.scores == sum((result.scores for result in games), Counter())
+    assert merged.rounds == sum((result.rounds for result in games), Counter())
+    assert merged.refills == sum(result.refills for result in games) == sum(
+        rounds * count for rounds, count in merged.rounds.items()
+    )
+    assert merged.set_free_tables == sum(result.set_free_tables for result in games)
+    assert merged.invalid_moves == sum(result.invalid_moves for result in games)
+    assert merged.mean_score == sum(s * c for s, c in merged.scores.items()) / 6
@@ -0,0 +1,69 @@
+import pytest
+
+from set_components import SETGame
+from set_components.game_settings import REFILL_POLICIES
+from simulation import GameSolver, SETSolver, deal_order, solve
+
+
+def brute_force_game(game):
+    """Maximum number of SETs of the game, trying every SET of every table on a clone"""
+    best = 0
+    for move in game.table_moves():
+        child = game.clone()
+        child.play_round(move)
+        best = max(best, 1 + brute_force_game(child))
+    return best
+
+
+def brute_force_order(game, order, table=frozenset(), pos=0):
+    """Maximum number of SETs of the deal order, refilling the table and adding m cards when it has no SET"""
+    m, cards = game.n_attribute_values, game.encoding.decode_all(order)
+    to_refill = max(game.table_size - len(table), 0)
+    table, pos = table.union(cards[pos : pos + to_refill]), min(pos + to_refill, len(order))
+    sets = game.all_sets(table)
+    if not sets:
+        if pos == len(order):
+            return 0
+        return brute_force_order(game, order, table.union(cards[pos : pos + m]), pos + m)
+    return max(1 + brute_force_order(game, order, table - frozenset(s), pos) for s in sets)
+
+
+@pytest.mark.parametrize("policy", REFILL_POLICIES)
+@pytest.mark.parametrize("seed", range(4))
+def test_game_solver_matches_brute_force(policy, seed):
+    game = SETGame(2, 3, seed=seed, refill_policy=policy)
+    game.start_game()
+    result = GameSolver(game).solve()
+    assert result.exact
+    assert result.score == brute_force_game(game) * game.set_score
+    assert len(result.sets) * game.set_score == result.score
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_game_solver_sets_replay_on_the_game(seed):
+    game = SETGame(3, 3, seed=seed)
+    game.start_game()
+    result = GameSolver(game).solve(time_budget=5)
+    for card_set in result.sets:
+        assert game.play_round(card_set) is not None
+    assert game.score == result.score
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (2, 5)])
+@pytest.mark.parametrize("seed", range(3))
+def test_set_solver_matches_brute_force(n, m, seed):
+    game = SETGame(n, m)
+    order = deal_order(game, seed)
+    result = SETSolver(game, order).solve()
+    assert result.exact
+    assert result.score == brute_force_order(game, order) * game.set_score
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_solve_bounds_a_greedy_player_of_the_same_seed(seed):
+    game = SETGame(3, 3, seed=seed)
+    game.start_game()
+    while game.table_moves():
+        game.play_round(sorted(game.table_moves(), key=sorted)[0])
+    result = solve(3, 3, seed=seed, time_budget=5)
+    assert game.score <= result.score <= game.max_score
@@ -0,0 +1,77 @@
+import time
+from random import Random
+
+import pytest
+
+from set_components import SETPlanetComet
+from set_components import mod_vector as mv
+from set_components.streaming_deck import CardSpace, StreamingDeck
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (3, 5), (2, 7)])
+def test_card_space_pack_unpack(n, m):
+    space = CardSpace(n, m)
+    assert len(space) == m**n
+    for card_id, card in enumerate(space):
+        assert space.pack(card) == card_id and space[card_id] == card
+        assert card in space
+    assert (m,) * n not in space
+    with pytest.raises(IndexError):
+        space[m**n]
+
+
+@pytest.mark.parametrize("n, m", [(2, 3), (3, 5), (4, 3)])
+def test_deal_order_is_a_permutation(n, m):
+    deck = StreamingDeck(CardSpace(n, m), rng=Random(n + m))
+    drawn = deck.draw(m**n + 5)
+    assert len(drawn) == len(set(drawn)) == m**n
+    assert len(deck) == 0 and deck.draw(1) == ()
+
+
+def test_draw_remove_sample_and_reset():
+    space = CardSpace(3, 5)
+    deck = StreamingDeck(space, rng=Random(1))
+    removed = [space[0], space[7]]
+    deck.remove(removed)
+    sample = deck.sample(10)
+    drawn = deck.draw(10)
+    assert list(drawn) == sample
+    assert not set(drawn) & set(removed)
+    assert len(deck) == len(space) - 12
+    left = deck.cards()
+    assert len(left) == len(deck) and not left & (set(drawn) | set(removed))
+    assert all(card in deck for card in left) and space[0] not in deck
+    deck.reset()
+    assert len(deck) == len(space) and space[0] in deck
+
+
+def test_copy_is_independent():
+    deck = StreamingDeck(CardSpace(3, 3), rng=Random(4))
+    copied = deck.copy(Random(4))
+    copied.draw(5)
+    assert len(deck) == 27 and len(copied) == 22
+
+
+@pytest.mark.parametrize("n, m", [(5, 7), (6, 7)])
+def test_set_planet_comet_plays_on_a_streaming_geometry(n, m):
+    game = SETPlanetComet(n, m, seed=3)
+    start = time.perf_counter()
+    game.start_game()
+    assert game.streaming
+    # A planet: 2 * (m - 1) cards of the plane of the first table card and the directions e_0, e_1
+    p0 = min(game.table_cards)
+    base = [tuple(int(i == k) for i in range(n)) for k in (0, 1)]
+    plane = sorted(frozenset(mv.generate_mod_affine_space(p0, base, m)) - game.table_cards)
+    planet = frozenset(plane[: 2 * (m - 1) - 1]) | {p0}
+    game.deck.remove(planet - {p0})
+    game.table_cards = game.table_cards | planet
+    moves = game.table_moves()
+    assert planet in moves
+    assert game.play_round(planet) is not None
+    assert game.score == game.planet_score
+    for _ in range(3):
+        moves = game.table_moves()
+        if not moves:
+            break
+        assert game.play_round(moves[0]) is not None
+    assert time.perf_counter() - start < 10
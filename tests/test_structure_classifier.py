@@ -0,0 +1,85 @@
+from random import Random
+
+import pytest
+
+from set_components import mod_vector as mv
+from set_components.game_settings import (
+    NO_STRUCTURE,
+    LINE_STRUCTURE,
+    PLANE_SUBSET,
+    PLANE_STRUCTURE,
+    FLAT_STRUCTURE,
+)
+from set_components.structure_classifier import StructureClassifier
+
+
+def brute_force_span(cards, m):
+    """Affine closure of the cards: the lines through every two points of the span are added until it is stable"""
+    span = set(cards)
+    while True:
+        closure = set(span)
+        for a in span:
+            for b in span:
+                v = mv.mod_substraction(b, a, m)
+                closure.update(mv.mod_addition(a, mv.mod_product(v, k, m), m) for k in range(m))
+        if closure == span:
+            return span
+        span = closure
+
+
+def expected_structure(cards, m):
+    span = brute_force_span(cards, m)
+    rank = next(k for k in range(len(cards)) if m**k == len(span))
+    full = len(set(cards)) == len(span)
+    if rank == 1 and full:
+        return LINE_STRUCTURE, rank
+    if rank == 2:
+        return (PLANE_STRUCTURE if full else PLANE_SUBSET), rank
+    if rank > 2 and full:
+        return FLAT_STRUCTURE, rank
+    return NO_STRUCTURE, rank
+
+
+def random_flat(rng, n, m, k):
+    """Cards of a random k-flat of AG(n, m)"""
+    basis = mv.ModEchelonBasis(n, m)
+    base = []
+    while len(base) < k:
+        v = tuple(rng.randrange(m) for _ in range(n))
+        if basis.add(v):
+            base.append(v)
+    p0 = tuple(rng.randrange(m) for _ in range(n))
+    return mv.generate_mod_affine_space(p0, base, m)
+
+
+@pytest.mark.parametrize("n, m", [(3, 3), (4, 3), (3, 5)])
+def test_classify_matches_the_brute_force_span(n, m):
+    classifier = StructureClassifier(n, m)
+    rng = Random(n * m)
+    selections = []
+    for _ in range(4):
+        selections.append(random_flat(rng, n, m, 1))
+        plane = random_flat(rng, n, m, 2)
+        selections.append(plane)
+        selections.append(rng.sample(plane, 2 * (m - 1)))
+        selections.append(random_flat(rng, n, m, 3))
+        selections.append(random_flat(rng, n, m, 1)[:-1])
+        deck = mv.simple_affine_space_gen(n, m)
+        selections.append(rng.sample(deck, rng.randrange(3, 2 * m)))
+    kinds = set()
+    for cards in selections:
+        structure = classifier.classify(cards)
+        assert (structure.kind, structure.rank) == expected_structure(cards, m)
+        assert structure.n_cards == len(set(cards))
+        kinds.add(structure.kind)
+    assert kinds == {NO_STRUCTURE, LINE_STRUCTURE, PLANE_SUBSET, PLANE_STRUCTURE, FLAT_STRUCTURE}
+
+
+def test_classify_is_cached_by_the_selection():
+    classifier = StructureClassifier(3, 3)
+    cards = [(0, 0, 0), (1, 0, 0), (0, 1, 0), (2, 2, 0)]
+    first = classifier.classify(cards)
+    hits = classifier._classify.cache_info().hits
+    assert classifier.classify(reversed(cards)) is first
+    assert classifier.classify(cards + cards[:1]) is first
+    assert classifier._classify.cache_info().hits == hits + 2
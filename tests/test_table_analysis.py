@@ -0,0 +1,63 @@
+import pytest
+
+from set_components import SETGame, IntersetGame, SETPlanetComet
+from set_components.table_analysis import AnalysisCache, TableAnalysis, analysis_cache, table_hash
+
+
+def test_a_repeated_table_hits_the_cache():
+    game = SETGame(4, 3, seed=1)
+    game.start_game()
+    table = game.table_cards
+    analysis = game.analysis()
+    hits = analysis_cache.hits
+    card = next(iter(table))
+    game.table_cards = table - {card}
+    assert game.table_hash != table_hash(table, 3)
+    game.table_cards = table
+    assert game.table_hash == table_hash(table, 3)
+    assert game.analysis() is analysis
+    assert analysis_cache.hits == hits + 1
+
+
+def test_a_hash_collision_misses():
+    cache = AnalysisCache()
+    game = SETGame(3, 3)
+    cards = sorted(game.deck_cards)
+    first, other = frozenset(cards[:5]), frozenset(cards[5:10])
+    analysis = cache.get(game, first, 42)
+    assert cache.get(game, other, 42) is not analysis
+    assert cache.get(game, other, 42).cards == other
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = AnalysisCache(maxsize=3)
+    game = SETGame(3, 3)
+    tables = [frozenset(sorted(game.deck_cards)[k : k + 4]) for k in range(4)]
+    analyses = [cache.get(game, cards, table_hash(cards, 3)) for cards in tables[:3]]
+    # The first table is used again, so the second one is the least recently used
+    assert cache.get(game, tables[0], table_hash(tables[0], 3)) is analyses[0]
+    cache.get(game, tables[3], table_hash(tables[3], 3))
+    assert len(cache._entries) == 3
+    misses = cache.misses
+    assert cache.get(game, tables[0], table_hash(tables[0], 3)) is analyses[0]
+    assert cache.get(game, tables[2], table_hash(tables[2], 3)) is analyses[2]
+    assert cache.misses == misses
+    assert cache.get(game, tables[1], table_hash(tables[1], 3)) is not analyses[1]
+    assert cache.misses == misses + 1
+
+
+@pytest.mark.parametrize("game_class", [SETGame, IntersetGame, SETPlanetComet])
+def test_moves_from_matches_a_fresh_analysis(game_class):
+    game = game_class(3, 3, seed=7)
+    game.start_game()
+    for _ in range(8):
+        moves = game.table_moves()
+        if not moves:
+            break
+        previous = TableAnalysis(game, game.table_cards, game.table_hash)
+        previous.moves  # computed before the play, as the interface does
+        game.play_round(moves[0])
+        updated = TableAnalysis(game, game.table_cards, game.table_hash)
+        expected = set(game.moves(game.table_cards))
+        assert set(updated.moves_from(previous)) == expected